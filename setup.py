@@ -35,7 +35,10 @@ DEPENDENCIES = [
     "click>=8.0.0",
     "python-dotenv>=0.19.0",
     "pathspec>=0.10.0",
-    "typing-extensions>=4.0.0"
+    "numpy>=1.20.0",
+    "typing-extensions>=4.0.0",
+    "pyyaml>=6.0.0",
+    "networkx>=2.6"
 ]
 
 class PostInstallCommand(_install):
@@ -128,6 +131,7 @@ setup(
     entry_points={
         "console_scripts": [
             "projectprompt=src.cli:main",
+            "projectprompt-client=src.client:main",
         ],
     },
     cmdclass={
@@ -8,21 +8,34 @@ __version__ = "2.0.0"
 __author__ = "ProjectPrompt Team"
 __description__ = "AI-powered project analysis and improvement suggestions"
 
-# Core exports
-from .core.analyzer import ProjectAnalyzer
-from .core.scanner import ProjectScanner
-from .core.detector import FunctionalityDetector
+# Exports are imported on first access, so light entry points (such as the
+# daemon client in src/client.py) do not pay for numpy and the AI SDKs
+_EXPORTS = {
+    # Core exports
+    'ProjectAnalyzer': '.core.analyzer',
+    'ProjectScanner': '.core.scanner',
+    'FunctionalityDetector': '.core.detector',
+    
+    'SuggestionGenerator': '.generators.suggestions',
+    
+    'ProjectAnalysis': '.models.project',
+    'SuggestionReport': '.models.project',
+    'ProjectType': '.models.project',
+    'AnalysisStatus': '.models.project',
+    
+    'Config': '.utils.config',
+}
 
-from .generators.suggestions import SuggestionGenerator
 
-from .models.project import (
-    ProjectAnalysis,
-    SuggestionReport,
-    ProjectType,
-    AnalysisStatus
-)
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
 
-from .utils.config import Config
 
 __all__ = [
     # Core classes
@@ -10,6 +10,7 @@ Phase 4: Simplified CLI with only 2 main commands
 
 import click
 import os
+import sys
 from pathlib import Path
 from typing import Optional
 import json
@@ -17,8 +18,11 @@ import shutil
 from datetime import datetime
 
 from .core.analyzer import ProjectAnalyzer
+from .core.snapshot import AnalysisSnapshot
+from .core.analysis_store import AnalysisStore
 from .generators.suggestions import SuggestionGenerator
 from .utils.config import Config
+from .utils.filenames import sanitize_filename
 
 # Global configuration
 config = Config()
@@ -51,7 +55,34 @@ def cli(verbose: bool):
 @click.option('--exclude', '-e', 
               multiple=True,
               help='Patterns to exclude (can be used multiple times)')
-def analyze(path: str, output: Optional[str], max_files: Optional[int], exclude: tuple):
+@click.option('--rules', '-r',
+              multiple=True,
+              type=click.Path(exists=True, dir_okay=False),
+              help='Additional detector rule pack (YAML, can be used multiple times)')
+@click.option('--content-budget', '-b',
+              default=None,
+              type=float,
+              help='Maximum MB of file content read for functionality detection (default: unlimited)')
+@click.option('--quick', '-q',
+              is_flag=True,
+              help='Stop reading file content once every functionality is confidently detected')
+@click.option('--skip-dependencies',
+              is_flag=True,
+              help='Skip the import dependency pass (detection falls back to content scanning)')
+@click.option('--no-cache',
+              is_flag=True,
+              help='Rescan file contents and re-parse imports instead of reusing cached results')
+@click.option('--sharded',
+              is_flag=True,
+              help='Split a monorepo at package boundaries (pyproject.toml, package.json, go.mod) '
+                   'and analyze the packages in parallel')
+@click.option('--workers', '-w',
+              default=None,
+              type=int,
+              help='Worker processes for --sharded (default: CPU count)')
+def analyze(path: str, output: Optional[str], max_files: Optional[int], exclude: tuple, rules: tuple,
+            content_budget: Optional[float], quick: bool, skip_dependencies: bool, no_cache: bool,
+            sharded: bool, workers: Optional[int]):
     """
     Analyze project structure and create functional groups.
     
@@ -62,6 +93,9 @@ def analyze(path: str, output: Optional[str], max_files: Optional[int], exclude:
       projectprompt analyze .
       projectprompt analyze /path/to/project --output ./project-prompt-output
       projectprompt analyze . --max-files 500 --exclude "*.log" --exclude "node_modules"
+      projectprompt analyze . --rules team-rules.yaml
+      projectprompt analyze . --content-budget 50 --quick
+      projectprompt analyze ./monorepo --sharded --workers 8
     """
     
     # Configure parameters with defaults
@@ -81,22 +115,32 @@ def analyze(path: str, output: Optional[str], max_files: Optional[int], exclude:
         click.echo(f"🚫 Excluding patterns: {', '.join(exclude)}")
     
     try:
-        # Perform analysis
-        with click.progressbar(length=100, label='Analyzing project') as bar:
-            bar.update(30)
-            
-            # Create scan config with limits
-            from .models.project import ScanConfig
-            scan_config = ScanConfig(max_files=max_files_limit)
-            
-            # Analyze project (includes scanning, grouping and validation)
-            analyzer = ProjectAnalyzer(scan_config=scan_config)
-            output_path = Path(output_dir)
-            analysis = analyzer.analyze_project(Path(path), output_dir=output_path)
-            bar.update(70)
+        # Create scan config with limits
+        from .models.project import ScanConfig
+        scan_config = ScanConfig(max_files=max_files_limit,
+                                 content_run_budget_mb=content_budget,
+                                 stop_when_saturated=quick,
+                                 analyze_dependencies=not skip_dependencies,
+                                 use_detection_cache=not no_cache,
+                                 use_import_cache=not no_cache)
+        
+        # Analyze project (includes scanning, grouping and validation), reporting each stage
+        rule_files = list(rules) or config.detector_rule_files
+        if sharded:
+            from .core.sharding import ShardedAnalyzer
+            analyzer = ShardedAnalyzer(scan_config=scan_config, rule_files=rule_files, max_workers=workers)
+        else:
+            analyzer = ProjectAnalyzer(scan_config=scan_config, rule_files=rule_files)
+        output_path = Path(output_dir)
+        analysis = analyzer.analyze_project(Path(path), output_dir=output_path,
+                                            progress_callback=_ProgressLine())
         
         # Show results
         click.echo(f"✅ Analysis complete! Results saved to: {output_path}")
+        output_stats = analysis.get('output_stats', {})
+        if output_stats.get('unchanged'):
+            click.echo(f"📝 {output_stats['written']} files written, {output_stats['unchanged']} unchanged")
+        _display_detection_stats(analysis.get('detection_stats', {}))
         click.echo(f"📊 Found {len(analysis.get('functional_groups', {}))} functional groups:")
         
         # Groups table
@@ -114,6 +158,198 @@ def analyze(path: str, output: Optional[str], max_files: Optional[int], exclude:
         click.echo(f"❌ Error during analysis: {str(e)}", err=True)
         raise click.ClickException(f"Analysis failed: {str(e)}")
 
+@cli.command(name='analyze-many')
+@click.argument('paths', nargs=-1, type=click.Path(file_okay=False))
+@click.option('--from-file', '-f',
+              default=None,
+              type=click.Path(exists=True, dir_okay=False),
+              help='File listing repository paths, one per line (# starts a comment)')
+@click.option('--output-root', '-o',
+              default=None,
+              help='Write each repository\'s outputs to OUTPUT_ROOT/<name> (default: <repo>/project-prompt-output)')
+@click.option('--workers', '-w',
+              default=None,
+              type=int,
+              help='Worker processes (default: CPU count)')
+@click.option('--report',
+              default='project-prompt-batch.json',
+              help='Aggregated JSON report path')
+@click.option('--max-files', '-m',
+              default=None,
+              type=int,
+              help='Maximum files to analyze per repository (default: 100, or MAX_FILES_TO_ANALYZE if lower)')
+@click.option('--rules', '-r',
+              multiple=True,
+              type=click.Path(exists=True, dir_okay=False),
+              help='Additional detector rule pack (YAML, can be used multiple times)')
+@click.option('--content-budget', '-b',
+              default=None,
+              type=float,
+              help='Maximum MB of file content read per repository for functionality detection')
+@click.option('--quick', '-q',
+              is_flag=True,
+              help='Stop reading file content once every functionality is confidently detected')
+def analyze_many(paths: tuple, from_file: Optional[str], output_root: Optional[str], workers: Optional[int],
+                 report: str, max_files: Optional[int], rules: tuple, content_budget: Optional[float], quick: bool):
+    """
+    Analyze many repositories concurrently.
+    
+    Repositories are analyzed in a pool of worker processes that stay warm
+    for the whole batch. Results are shown as each repository finishes, and a
+    failing repository does not stop the others.
+    
+    Examples:
+      projectprompt analyze-many services/*
+      projectprompt analyze-many --from-file repos.txt --output-root ./batch-output --workers 8
+    """
+    repo_paths = list(paths)
+    if from_file:
+        with open(from_file, encoding='utf-8') as f:
+            for line in f:
+                line = line.split('#', 1)[0].strip()
+                if line:
+                    repo_paths.append(line)
+    if not repo_paths:
+        raise click.UsageError("No repositories given (pass paths or --from-file)")
+    
+    from .models.project import ScanConfig
+    from .core.batch import BatchAnalyzer, BatchResult, summarize_batch
+    scan_config = ScanConfig(max_files=max_files or min(config.max_files_to_analyze, 100),
+                             content_run_budget_mb=content_budget,
+                             stop_when_saturated=quick)
+    batch = BatchAnalyzer(scan_config=scan_config,
+                          rule_files=list(rules) or config.detector_rule_files,
+                          max_workers=workers)
+    
+    valid_paths = []
+    results = []
+    for repo_path in repo_paths:
+        if os.path.isdir(repo_path):
+            valid_paths.append(repo_path)
+        else:
+            results.append(BatchResult(repo_path, None, error="Not a directory"))
+            click.echo(f"❌ {repo_path}: not a directory", err=True)
+    
+    click.echo(f"🔍 Analyzing {len(valid_paths)} repositories with up to {batch.max_workers} workers")
+    for result in batch.run(valid_paths, Path(output_root) if output_root else None):
+        results.append(result)
+        progress = f"[{len(results)}/{len(repo_paths)}]"
+        if result.ok:
+            analysis = result.analysis
+            click.echo(f"✅ {progress} {result.path}: {analysis.project_type.value}, {analysis.main_language}, "
+                       f"{analysis.file_count} files, {len(analysis.groups)} groups "
+                       f"({analysis.analysis_duration or 0:.1f}s)")
+        else:
+            click.echo(f"❌ {progress} {result.path}: {result.error}", err=True)
+    
+    summary = summarize_batch(results)
+    Path(report).parent.mkdir(parents=True, exist_ok=True)
+    with open(report, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2)
+    
+    totals = summary['totals']
+    click.echo(f"\n📊 {summary['succeeded']} succeeded, {summary['failed']} failed; "
+               f"{totals['file_count']} files in total")
+    if summary['functionality_repositories']:
+        click.echo("🔍 Functionalities (repositories):")
+        for name, count in list(summary['functionality_repositories'].items())[:10]:
+            click.echo(f"   • {name}: {count}")
+    click.echo(f"📄 Report saved to: {report}")
+    if summary['failed']:
+        raise SystemExit(1)
+
+def _shard_scan_config(max_files: Optional[int], content_budget: Optional[float], quick: bool):
+    """Scan configuration shared by analyze-shard and merge-shards."""
+    from .models.project import ScanConfig
+    return ScanConfig(max_files=max_files or min(config.max_files_to_analyze, 100),
+                      content_run_budget_mb=content_budget,
+                      stop_when_saturated=quick)
+
+@cli.command(name='analyze-shard')
+@click.argument('path', type=click.Path(exists=True, file_okay=False), default='.')
+@click.argument('shard', required=False)
+@click.option('--shard-dir', '-d',
+              default=None,
+              help='Directory collecting shard results, possibly shared between machines')
+@click.option('--max-files', '-m',
+              default=None,
+              type=int,
+              help='Maximum files to analyze per shard (default: 100, or MAX_FILES_TO_ANALYZE if lower)')
+@click.option('--rules', '-r',
+              multiple=True,
+              type=click.Path(exists=True, dir_okay=False),
+              help='Additional detector rule pack (YAML, can be used multiple times)')
+@click.option('--content-budget', '-b',
+              default=None,
+              type=float,
+              help='Maximum MB of file content read per shard for functionality detection')
+@click.option('--quick', '-q',
+              is_flag=True,
+              help='Stop reading file content once every functionality is confidently detected')
+def analyze_shard(path: str, shard: Optional[str], shard_dir: Optional[str], max_files: Optional[int],
+                  rules: tuple, content_budget: Optional[float], quick: bool):
+    """
+    Analyze one shard of a monorepo for a distributed analysis.
+    
+    Without SHARD, lists the shards of the project (one per line, '.' is the
+    root). With SHARD, analyzes it and writes its partial result to
+    --shard-dir; once every shard is there, `merge-shards` builds the
+    complete analysis. Every shard must be analyzed with the same rules.
+    
+    Examples:
+      projectprompt analyze-shard ./monorepo
+      projectprompt analyze-shard ./monorepo packages/api --shard-dir /shared/run-42
+    """
+    from .core.sharding import find_shards, analyze_shard as run_shard, write_shard
+    scan_config = _shard_scan_config(max_files, content_budget, quick)
+    try:
+        layout = find_shards(path, scan_config)
+        if shard is None:
+            for name in layout:
+                click.echo(name)
+            return
+        if not shard_dir:
+            raise click.UsageError("--shard-dir is required to analyze a shard")
+        
+        analyzer = ProjectAnalyzer(scan_config=scan_config, rule_files=list(rules) or config.detector_rule_files)
+        result = run_shard(analyzer, path, os.path.normpath(shard), layout)
+        shard_file = write_shard(result, shard_dir)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    click.echo(f"✅ Shard {result.shard}: {result.analysis.file_count} files "
+               f"({result.analysis.analysis_duration or 0:.1f}s) -> {shard_file}")
+
+@cli.command(name='merge-shards')
+@click.argument('shard_dir', type=click.Path(exists=True, file_okay=False))
+@click.option('--output', '-o',
+              default='./project-prompt-output',
+              help='Output directory (default: ./project-prompt-output)')
+@click.option('--rules', '-r',
+              multiple=True,
+              type=click.Path(exists=True, dir_okay=False),
+              help='Detector rule packs the shards were analyzed with')
+def merge_shards(shard_dir: str, output: str, rules: tuple):
+    """
+    Merge the shard results written by analyze-shard into one analysis.
+    
+    Examples:
+      projectprompt merge-shards /shared/run-42 --output ./project-prompt-output
+    """
+    from .core.sharding import load_shards, merge_shards as merge
+    analyzer = ProjectAnalyzer(scan_config=_shard_scan_config(None, None, False),
+                               rule_files=list(rules) or config.detector_rule_files)
+    try:
+        results = load_shards(shard_dir)
+        analysis = merge(results, analyzer)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    output_stats = analyzer.save_analysis(analysis, Path(output))
+    
+    click.echo(f"✅ Merged {len(results)} shards: {analysis.file_count} files. Results saved to: {output}")
+    _display_detection_stats(analysis.detection_stats)
+    click.echo(f"📊 Found {len(analysis.groups)} functional groups:")
+    _display_groups_table(analysis.groups)
+
 @cli.command()
 @click.argument('group_name')
 @click.option('--analysis-dir', '-a', 
@@ -178,34 +414,36 @@ def suggest(group_name: str, analysis_dir: Optional[str], api: Optional[str],
         click.echo("🧪 Running in test mode - no API calls will be made")
     
     try:
-        with click.progressbar(length=100, label='Generating suggestions') as bar:
-            bar.update(20)
-            
-            # Load group context
-            group_context = generator.load_group_context(group_name, analysis_path)
-            bar.update(30)
-            
-            # Generate contextualized prompt
-            prompt = generator.create_contextual_prompt(group_context, detail_level)
-            bar.update(20)
-            
-            # Generate suggestions with AI
-            suggestions = generator.generate_suggestions(prompt, group_context)
-            bar.update(20)
-            
-            # Save results
-            suggestions_file = analysis_path / "suggestions" / f"{_sanitize_filename(group_name)}-suggestions.md"
-            suggestions_file.parent.mkdir(parents=True, exist_ok=True)
-            suggestions_file.write_text(suggestions, encoding='utf-8')
-            
-            # Save prompt if requested
-            if save_prompt:
-                prompt_file = analysis_path / "prompts" / f"{_sanitize_filename(group_name)}-prompt.md"
-                prompt_file.parent.mkdir(parents=True, exist_ok=True)
-                prompt_file.write_text(prompt, encoding='utf-8')
-                click.echo(f"💾 Prompt saved to: {prompt_file}")
-            
-            bar.update(10)
+        from .core.progress import ProgressTracker
+        progress = ProgressTracker(_ProgressLine())
+        
+        # Load group context
+        progress.stage('context', unit='steps')
+        group_context = generator.load_group_context(group_name, analysis_path)
+        
+        # Generate contextualized prompt
+        progress.stage('prompt', unit='steps')
+        prompt = generator.create_contextual_prompt(group_context, detail_level)
+        
+        # Generate suggestions with AI
+        progress.stage('suggest', unit='steps')
+        suggestions = generator.generate_suggestions(prompt, group_context)
+        
+        # Save results
+        progress.stage('save', unit='steps')
+        suggestions_file = analysis_path / "suggestions" / f"{sanitize_filename(group_name)}-suggestions.md"
+        suggestions_file.parent.mkdir(parents=True, exist_ok=True)
+        suggestions_file.write_text(suggestions, encoding='utf-8')
+        
+        # Save prompt if requested
+        prompt_file = None
+        if save_prompt:
+            prompt_file = analysis_path / "prompts" / f"{sanitize_filename(group_name)}-prompt.md"
+            prompt_file.parent.mkdir(parents=True, exist_ok=True)
+            prompt_file.write_text(prompt, encoding='utf-8')
+        progress.finish()
+        if prompt_file is not None:
+            click.echo(f"💾 Prompt saved to: {prompt_file}")
         
         # Show results
         click.echo(f"✅ Suggestions created: {suggestions_file}")
@@ -241,10 +479,31 @@ def status(analysis_dir: Optional[str]):
     click.echo(f"📊 Analysis Status for: {analysis_path}")
     click.echo("=" * 50)
     
-    # Available groups
+    # Project summary from the analysis snapshot
+    snapshot = AnalysisSnapshot.load(analysis_path)
+    if snapshot is not None:
+        with snapshot:
+            meta = snapshot.meta
+            click.echo(f"📦 Project: {meta['project_name']} ({meta['project_type']}, {meta['main_language']})")
+            click.echo(f"📄 Files: {meta['file_count']}   🕒 Analyzed: {meta['analysis_date']}")
+            if meta['detected_functionalities']:
+                click.echo(f"🔍 Functionalities: {', '.join(meta['detected_functionalities'])}")
+        click.echo()
+    
+    # Available groups, largest first when the analysis store is available
     click.echo(f"📁 Available groups ({len(available_groups)}):")
-    for group in available_groups:
-        click.echo(f"   • {group}")
+    store = AnalysisStore.load(analysis_path)
+    if store is not None:
+        with store:
+            group_sizes = store.largest_groups(limit=len(available_groups))
+    else:
+        group_sizes = []
+    if group_sizes:
+        for group, file_count in group_sizes:
+            click.echo(f"   • {group} ({file_count} files)")
+    else:
+        for group in available_groups:
+            click.echo(f"   • {group}")
     
     # Generated suggestions
     if suggestions_dir.exists():
@@ -262,6 +521,220 @@ def status(analysis_dir: Optional[str]):
         for group in available_groups[:3]:  # Show only first 3
             click.echo(f"   • projectprompt suggest \"{group}\"")
 
+@cli.command()
+@click.option('--socket', 'socket_path',
+              default=None,
+              help='UNIX socket to listen on (default: ~/.project-prompt/daemon.sock)')
+def serve(socket_path: Optional[str]):
+    """
+    Run the warm analysis daemon.
+    
+    Keeps rules, analyzers, AI clients and previous results in memory and
+    answers requests from `projectprompt-client` over a UNIX socket. Repeated
+    analyses of an unchanged project are answered without rescanning.
+    
+    Examples:
+      projectprompt serve &
+      projectprompt-client analyze .
+      projectprompt-client status
+    """
+    from .core.daemon import AnalysisDaemon
+    daemon = AnalysisDaemon(socket_path=socket_path, config=config)
+    click.echo(f"🟢 Serving on {daemon.socket_path} (stop with Ctrl+C or 'projectprompt-client shutdown')")
+    _stop_on_sigterm()
+    try:
+        daemon.serve_forever()
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    except KeyboardInterrupt:
+        pass
+    click.echo("🛑 Daemon stopped")
+
+@cli.command(name='job-server')
+@click.option('--host', default='127.0.0.1', help='Interface to bind (default: 127.0.0.1)')
+@click.option('--port', default=8765, type=int, help='TCP port (default: 8765)')
+@click.option('--workers', '-w', default=2, type=int, help='Worker processes running jobs')
+@click.option('--max-pending', default=100, type=int,
+              help='Queued jobs accepted before submissions are refused with HTTP 429')
+@click.option('--retention-hours', default=168.0, type=float,
+              help='Hours finished jobs are kept (default: one week)')
+@click.option('--db', 'db_path', default=None, help='Job database (default: ~/.project-prompt/jobs.db)')
+@click.option('--output-root', default=None,
+              help='Directory holding job output directories (default: ~/.project-prompt/job-outputs)')
+@click.option('--allow-rules', multiple=True, type=click.Path(exists=True, dir_okay=False),
+              help='Rule pack jobs may request (can be repeated)')
+def job_server(host: str, port: int, workers: int, max_pending: int, retention_hours: float,
+               db_path: Optional[str], output_root: Optional[str], allow_rules: tuple):
+    """
+    Run the analysis job queue with its HTTP front end.
+    
+    Jobs are stored in SQLite and run by a fixed pool of worker processes.
+    Jobs write their outputs under --output-root and may only use the rule
+    packs given with --allow-rules.
+    
+    Examples:
+      projectprompt job-server --workers 4
+      curl -X POST localhost:8765/jobs -d '{"path": "/srv/repos/api"}'
+      curl localhost:8765/jobs/<id>/result
+    """
+    from .core.job_queue import JobQueue
+    from .core.job_server import JobServer
+    queue = JobQueue(db_path, max_pending=max_pending)
+    server = JobServer(host, port, queue, workers=workers, retention_seconds=retention_hours * 3600,
+                       output_root=output_root, rule_files=allow_rules)
+    click.echo(f"🟢 Job server on http://{host}:{port} with {workers} workers (database: {queue.db_path})")
+    _stop_on_sigterm()
+    try:
+        server.run()
+    except KeyboardInterrupt:
+        pass
+    click.echo("🛑 Job server stopped")
+
+@cli.command()
+@click.option('--analysis-dir', '-a',
+              default=None,
+              help='Analysis directory to query')
+@click.option('--run', '-r', 'run_id',
+              type=int,
+              default=None,
+              help='Analysis run to query (default: latest)')
+@click.option('--file', '-f', 'file_path',
+              default=None,
+              help='Show the groups and dependents of a file')
+@click.option('--language', '-l',
+              default=None,
+              help='List the files written in a language')
+@click.option('--largest-groups', '-g',
+              type=int,
+              default=None,
+              help='List the N largest functional groups')
+@click.option('--runs', 'list_runs',
+              is_flag=True,
+              help='List the stored analysis runs')
+def query(analysis_dir: Optional[str], run_id: Optional[int], file_path: Optional[str],
+          language: Optional[str], largest_groups: Optional[int], list_runs: bool):
+    """
+    Query the analysis database without loading the whole analysis.
+    
+    Examples:
+      projectprompt query --file src/cli.py
+      projectprompt query --language python
+      projectprompt query --largest-groups 5
+      projectprompt query --runs
+    """
+    analysis_path = Path(analysis_dir) if analysis_dir else Path('./project-prompt-output')
+    store = AnalysisStore.load(analysis_path)
+    if store is None:
+        click.echo("📭 No analysis database found. Run 'projectprompt analyze' first.")
+        return
+    
+    with store:
+        if list_runs:
+            click.echo("🗂️  Stored runs:")
+            for run in store.runs():
+                click.echo(f"   #{run['id']} {run['analysis_date']} {run['project_name']} "
+                           f"({run['project_type']}, {run['file_count']} files)")
+        
+        if run_id is None:
+            run_id = store.latest_run()
+        if run_id is None:
+            return
+        
+        if file_path:
+            groups = store.groups_of_file(file_path, run_id)
+            click.echo(f"📁 Groups of {file_path}: {', '.join(groups) if groups else 'none'}")
+            dependents = store.dependents(file_path, run_id)
+            click.echo(f"🔗 Imported by ({len(dependents)}):")
+            for dependent in dependents:
+                click.echo(f"   • {dependent}")
+        
+        if language:
+            files = store.files_by_language(language, run_id)
+            click.echo(f"📄 {language} files ({len(files)}):")
+            for path in files:
+                click.echo(f"   • {path}")
+        
+        if largest_groups:
+            click.echo("📊 Largest groups:")
+            for group, file_count in store.largest_groups(largest_groups, run_id):
+                click.echo(f"   • {group}: {file_count} files")
+        
+        if not (list_runs or file_path or language or largest_groups):
+            click.echo(f"📊 Run #{run_id} languages:")
+            for name, file_count, total_size in store.languages(run_id):
+                click.echo(f"   • {name}: {file_count} files, {total_size} bytes")
+
+@cli.command()
+@click.argument('before')
+@click.argument('after', default='./project-prompt-output')
+@click.option('--json', 'json_path',
+              default=None,
+              help='Also write the complete report to this JSON file')
+@click.option('--limit', '-n',
+              default=10,
+              type=int,
+              help='Entries shown per list (default: 10)')
+def diff(before: str, after: str, json_path: Optional[str], limit: int):
+    """
+    Compare two analyses without analyzing again.
+    
+    BEFORE and AFTER are output directories, snapshot files or runs of an
+    analysis database (DIR@RUN; @-1 is the run before the latest).
+    
+    Examples:
+      projectprompt diff ./project-prompt-output@-1
+      projectprompt diff release-1.0-output release-2.0-output --json drift.json
+    """
+    from .core.analysis_diff import load_index, diff_analyses
+    try:
+        report = diff_analyses(load_index(before), load_index(after))
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    
+    def show(title: str, items: list, render=str):
+        if not items:
+            return
+        click.echo(f"{title} ({len(items)}):")
+        for item in items[:limit]:
+            click.echo(f"   • {render(item)}")
+        if len(items) > limit:
+            click.echo(f"   … {len(items) - limit} more")
+    
+    click.echo(f"🔀 {report['before']['label']} ({report['before']['file_count']} files) → "
+               f"{report['after']['label']} ({report['after']['file_count']} files)")
+    for key, label in (('project_type', 'Project type'), ('main_language', 'Main language')):
+        if report[key]['before'] != report[key]['after']:
+            click.echo(f"🏷️  {label}: {report[key]['before']} → {report[key]['after']}")
+    
+    files = report['files']
+    show("➕ Added files", files['added'])
+    show("➖ Removed files", files['removed'])
+    show("🚚 Renamed files", files['renamed'], lambda item: f"{item['from']} → {item['to']}")
+    show("📏 Resized files", files['resized'])
+    show("📁 Files moved between groups", report['groups']['moved'],
+         lambda item: f"{item['path']}: {', '.join(item['from']) or '-'} → {', '.join(item['to']) or '-'}")
+    show("📊 Group sizes", list(report['groups']['sizes'].items()),
+         lambda item: f"{item[0]}: {item[1]['before']} → {item[1]['after']}")
+    show("🌐 Language shift", [entry for entry in report['languages'] if entry['change']],
+         lambda item: f"{item['language']}: {item['before']}% → {item['after']}% ({item['change']:+})")
+    
+    functionalities = report['functionalities']
+    show("✨ New functionalities", functionalities['added'])
+    show("🗑️  Removed functionalities", functionalities['removed'])
+    show("🎯 Confidence changes", functionalities['confidence_changes'],
+         lambda item: f"{item['name']}: {item['before']:.2f} → {item['after']:.2f}")
+    
+    dependencies = report['dependencies']
+    click.echo(f"🔗 Dependencies: +{dependencies['edges_added']} / -{dependencies['edges_removed']} edges")
+    show("⚠️  New dependency cycles", dependencies['new_cycles'], lambda cycle: ' ↔ '.join(cycle))
+    show("✅ Resolved dependency cycles", dependencies['resolved_cycles'], lambda cycle: ' ↔ '.join(cycle))
+    
+    if json_path:
+        Path(json_path).parent.mkdir(parents=True, exist_ok=True)
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        click.echo(f"📄 Report saved to: {json_path}")
+
 @cli.command()
 @click.option('--analysis-dir', '-a',
               default=None, 
@@ -944,6 +1417,63 @@ def _display_groups_table(groups: dict):
     
     click.echo("└─────────────────────────────┴───────────┘")
 
+def _display_detection_stats(stats: dict):
+    """Display how much file content functionality detection read"""
+    if not stats or not stats.get('bytes_total'):
+        return
+    
+    read_mb = stats['bytes_read'] / (1024 * 1024)
+    total_mb = stats['bytes_total'] / (1024 * 1024)
+    saved_pct = 100.0 * stats['bytes_saved'] / stats['bytes_total']
+    click.echo(f"📖 Content scan: read {read_mb:.1f} MB of {total_mb:.1f} MB (saved {saved_pct:.0f}%)")
+    if stats.get('files_cached'):
+        click.echo(f"   {stats['files_cached']} unchanged files reused from cache")
+    if stats.get('stop_reason'):
+        click.echo(f"   Stopped early ({stats['stop_reason'].replace('_', ' ')}), "
+                   f"{stats['files_skipped']} files not read")
+
+class _ProgressLine:
+    """Renders analysis progress events as a status line with throughput and ETA."""
+    
+    def __init__(self):
+        self.stream = sys.stderr
+        self.interactive = self.stream.isatty()
+        self.width = 0
+    
+    def __call__(self, event: dict):
+        from .core.progress import STAGE_LABELS
+        label = STAGE_LABELS.get(event['stage'], event['stage'])
+        done, total, unit = event['done'], event['total'], event['unit']
+        parts = [f"{done:,}/{total:,} {unit}" if total else f"{done:,} {unit}" if done else ""]
+        # Rates of stages that finished within a second are noise
+        if event['rate'] and done and (not event['finished'] or event['elapsed'] >= 1):
+            parts.append(f"{event['rate']:,.0f} {unit}/s")
+        if event['byte_rate'] and (not event['finished'] or event['elapsed'] >= 1):
+            parts.append(f"{event['byte_rate'] / (1024 * 1024):.1f} MB/s")
+        if event['finished']:
+            parts.append(f"{event['elapsed']:.1f}s")
+        elif event['eta'] is not None:
+            parts.append(f"ETA {_format_duration(event['eta'])}")
+        line = f"   {label}: " + "  ".join(part for part in parts if part)
+        
+        if self.interactive:
+            padding = " " * max(0, self.width - len(line))
+            self.width = len(line)
+            click.echo(f"\r{line}{padding}", file=self.stream, nl=event['finished'])
+            if event['finished']:
+                self.width = 0
+        elif event['finished']:
+            click.echo(line, file=self.stream)
+
+def _format_duration(seconds: float) -> str:
+    """Format a duration as 42s, 3m05s or 1h02m"""
+    seconds = int(seconds)
+    if seconds < 60:
+        return f"{seconds}s"
+    if seconds < 3600:
+        return f"{seconds // 60}m{seconds % 60:02d}s"
+    return f"{seconds // 3600}h{seconds % 3600 // 60:02d}m"
+
 def _display_suggestions_preview(suggestions: str):
     """Display preview of generated suggestions"""
     lines = suggestions.split('\n')
@@ -961,9 +1491,24 @@ def _display_suggestions_preview(suggestions: str):
         click.echo("...")
         click.echo(f"({len(lines) - 10} more lines in full file)")
 
+def _stop_on_sigterm():
+    """Shut long-running servers down cleanly on SIGTERM, as on Ctrl+C."""
+    import signal
+    
+    def interrupt(signum, frame):
+        raise KeyboardInterrupt
+    
+    signal.signal(signal.SIGTERM, interrupt)
+
 def _load_available_groups(analysis_path: Path) -> list:
     """Load available groups from previous analysis"""
-    # Load from groups.json file (new structure)
+    # Binary snapshot: group names are in its metadata section
+    snapshot = AnalysisSnapshot.load(analysis_path)
+    if snapshot is not None:
+        with snapshot:
+            return snapshot.group_names
+    
+    # Load from groups.json file
     groups_file = analysis_path / "groups.json"
     if groups_file.exists():
         with open(groups_file) as f:
@@ -981,14 +1526,6 @@ def _load_available_groups(analysis_path: Path) -> list:
             return list(groups.keys())
     return []
 
-def _sanitize_filename(name: str) -> str:
-    """Convert group name to valid filename"""
-    import re
-    # Replace spaces and special characters
-    sanitized = re.sub(r'[^\w\s-]', '', name)
-    sanitized = re.sub(r'[-\s]+', '-', sanitized)
-    return sanitized.lower().strip('-')
-
 def main():
     """Main entry point for CLI"""
     try:
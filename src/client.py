@@ -0,0 +1,176 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Thin client for the ProjectPrompt analysis daemon.
+
+Sends analyze, status and suggest requests to `projectprompt serve` over its
+UNIX socket. Only the standard library is imported, so a request costs the
+interpreter startup plus the daemon's answer.
+
+Usage:
+    projectprompt-client analyze [PATH] [--output DIR] [--quick] ...
+    projectprompt-client status [--analysis-dir DIR]
+    projectprompt-client suggest GROUP [--analysis-dir DIR] [--api anthropic|openai]
+    projectprompt-client ping | shutdown
+"""
+
+import os
+import sys
+import json
+import socket
+import argparse
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# Must match src.core.daemon.DEFAULT_SOCKET_PATH
+DEFAULT_SOCKET_PATH = Path.home() / '.project-prompt' / 'daemon.sock'
+
+
+class DaemonError(Exception):
+    """Raised when the daemon is unreachable or reports an error."""
+
+
+def request(command: str, args: Optional[Dict[str, Any]] = None,
+            socket_path: Optional[str] = None, timeout: Optional[float] = None) -> Any:
+    """
+    Send one request to the daemon and return its result.
+
+    Args:
+        command: Daemon command (analyze, status, suggest, ping, shutdown)
+        args: Command arguments
+        socket_path: Daemon socket (default: ~/.project-prompt/daemon.sock)
+        timeout: Seconds to wait for the answer (default: no limit)
+
+    Returns:
+        The command result
+
+    Raises:
+        DaemonError: If the daemon cannot be reached or the command failed
+    """
+    path = str(socket_path or DEFAULT_SOCKET_PATH)
+    payload = json.dumps({'command': command, 'args': args or {}}).encode('utf-8') + b'\n'
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        connection.settimeout(timeout)
+        try:
+            connection.connect(path)
+        except OSError as e:
+            raise DaemonError(f"No daemon listening on {path} ({e}). Start one with 'projectprompt serve'.")
+        connection.sendall(payload)
+        with connection.makefile('rb') as stream:
+            line = stream.readline()
+    finally:
+        connection.close()
+
+    if not line:
+        raise DaemonError("The daemon closed the connection without answering")
+    response = json.loads(line)
+    if not response.get('ok'):
+        raise DaemonError(response.get('error', 'Unknown error'))
+    return response['result']
+
+
+def _print_analysis(result: Dict[str, Any]):
+    source = "cached, project unchanged" if result.get('cached') else "analyzed"
+    print(f"✅ Analysis complete ({source})! Results saved to: {result['output_dir']}")
+    print(f"📦 {result['project_name']}: {result['project_type']}, {result['main_language']}, "
+          f"{result['file_count']} files")
+    groups = result.get('functional_groups', {})
+    print(f"📊 Found {len(groups)} functional groups:")
+    for name, files in groups.items():
+        print(f"   • {name} ({len(files)} files)")
+
+
+def _print_status(result: Dict[str, Any]):
+    print(f"📊 Analysis Status for: {result['analysis_dir']}")
+    print("=" * 50)
+    project = result.get('project')
+    if project:
+        print(f"📦 Project: {project['project_name']} ({project['project_type']}, {project['main_language']})")
+        print(f"📄 Files: {project['file_count']}   🕒 Analyzed: {project['analysis_date']}")
+        print()
+    print(f"📁 Available groups ({len(result['groups'])}):")
+    for name, size in result['groups']:
+        print(f"   • {name} ({size} files)")
+    if result['suggestions']:
+        print(f"\n🤖 Created suggestions ({len(result['suggestions'])}):")
+        for path in result['suggestions']:
+            print(f"   • {path}")
+    else:
+        print("\n🤖 No suggestions created yet.")
+
+
+def _absolute(path: Optional[str]) -> Optional[str]:
+    """Resolve paths on the client side; the daemon runs in another directory."""
+    return os.path.abspath(path) if path else None
+
+
+def main(argv=None) -> int:
+    """Entry point of projectprompt-client."""
+    parser = argparse.ArgumentParser(prog='projectprompt-client',
+                                     description='Send requests to a running `projectprompt serve` daemon.')
+    parser.add_argument('--socket', default=None, help='Daemon socket (default: ~/.project-prompt/daemon.sock)')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    analyze = commands.add_parser('analyze', help='Analyze a project')
+    analyze.add_argument('path', nargs='?', default='.')
+    analyze.add_argument('--output', '-o', default=None)
+    analyze.add_argument('--max-files', '-m', type=int, default=None)
+    analyze.add_argument('--rules', '-r', action='append', default=[])
+    analyze.add_argument('--content-budget', '-b', type=float, default=None)
+    analyze.add_argument('--quick', '-q', action='store_true')
+    analyze.add_argument('--skip-dependencies', action='store_true')
+    analyze.add_argument('--no-cache', action='store_true')
+
+    status = commands.add_parser('status', help='Show analysis status and groups')
+    status.add_argument('--analysis-dir', '-a', default='./project-prompt-output')
+
+    suggest = commands.add_parser('suggest', help='Create suggestions for a group')
+    suggest.add_argument('group_name')
+    suggest.add_argument('--analysis-dir', '-a', default='./project-prompt-output')
+    suggest.add_argument('--api', '-p', choices=['anthropic', 'openai'], default=None)
+    suggest.add_argument('--detail-level', '-d', choices=['basic', 'medium', 'detailed'], default='medium')
+    suggest.add_argument('--test-mode', '-t', action='store_true')
+
+    commands.add_parser('ping', help='Check that the daemon is running')
+    commands.add_parser('shutdown', help='Stop the daemon')
+
+    options = parser.parse_args(argv)
+    try:
+        if options.command == 'analyze':
+            _print_analysis(request('analyze', {
+                'path': _absolute(options.path),
+                'output': _absolute(options.output),
+                'max_files': options.max_files,
+                'rules': [_absolute(path) for path in options.rules],
+                'content_budget': options.content_budget,
+                'quick': options.quick,
+                'skip_dependencies': options.skip_dependencies,
+                'no_cache': options.no_cache,
+            }, options.socket))
+        elif options.command == 'status':
+            _print_status(request('status', {'analysis_dir': _absolute(options.analysis_dir)}, options.socket))
+        elif options.command == 'suggest':
+            result = request('suggest', {
+                'group_name': options.group_name,
+                'analysis_dir': _absolute(options.analysis_dir),
+                'api': options.api,
+                'detail_level': options.detail_level,
+                'test_mode': options.test_mode,
+            }, options.socket)
+            print(f"✅ Suggestions created: {result['suggestions_file']}")
+        elif options.command == 'ping':
+            result = request('ping', socket_path=options.socket, timeout=5.0)
+            print(f"🟢 Daemon running (pid {result['pid']}, {result['projects']} projects in memory)")
+        elif options.command == 'shutdown':
+            request('shutdown', socket_path=options.socket, timeout=5.0)
+            print("🛑 Daemon stopping")
+    except DaemonError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
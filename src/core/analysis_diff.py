@@ -0,0 +1,265 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Comparison of two stored analyses.
+
+`projectprompt diff A B` reports how a project changed between two
+analyses without analyzing it again: files added, removed, renamed or
+resized, files that moved between functional groups, the language mix,
+functionalities that appeared or disappeared, and dependency cycles that
+were introduced or resolved.
+
+Each side is loaded into an AnalysisIndex of hash maps keyed by file path
+(size, language, groups) built straight from the snapshot columns or the
+store tables, and every comparison is a set operation on those maps, so
+analyses with 100k files compare in well under a second. Dependency cycles
+are compared as strongly connected components of the stored edges (Tarjan,
+linear time), which do not depend on how cycles were enumerated.
+
+An analysis is given as:
+
+    DIR              output directory of `analyze` (its snapshot, or the
+                     latest run of its analysis.db)
+    FILE.snapshot    a snapshot file
+    DIR@N, FILE.db@N run N of an analysis store; @-1 is the run before the
+                     latest, @-2 the one before that, and so on
+"""
+
+import logging
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple
+
+from .snapshot import AnalysisSnapshot, SNAPSHOT_FILENAME
+from .analysis_store import AnalysisStore, STORE_FILENAME
+from .graph_algorithms import cyclic_components
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class AnalysisIndex:
+    """Hashed view of one analysis, as compared by diff_analyses."""
+    label: str
+    project_name: str
+    project_type: str
+    main_language: str
+    analysis_date: Optional[str]
+    files: Dict[str, Tuple[int, str]] = field(default_factory=dict)
+    file_groups: Dict[str, Tuple[str, ...]] = field(default_factory=dict)
+    functionalities: Dict[str, float] = field(default_factory=dict)
+    edges: Set[Tuple[str, str]] = field(default_factory=set)
+
+    def cycles(self) -> Set[FrozenSet[str]]:
+        """Strongly connected components with more than one file."""
+        return cyclic_components(self.edges)
+
+
+def _group_map(pairs) -> Dict[str, Tuple[str, ...]]:
+    """Turn (path, group) pairs into path -> sorted groups."""
+    groups: Dict[str, List[str]] = {}
+    for path, group_name in pairs:
+        groups.setdefault(path, []).append(group_name)
+    return {path: tuple(sorted(names)) for path, names in groups.items()}
+
+
+def _index_snapshot(path: Path, label: str) -> AnalysisIndex:
+    """Load a snapshot file into an index."""
+    with AnalysisSnapshot(path) as snapshot:
+        meta = snapshot.meta
+        columns = snapshot.section('files')
+        functionalities = snapshot.section('functionalities')
+        index = AnalysisIndex(
+            label=label,
+            project_name=meta['project_name'],
+            project_type=meta['project_type'],
+            main_language=meta['main_language'],
+            analysis_date=meta['analysis_date'],
+            files=dict(zip(columns['path'], zip(columns['size'], columns['language']))),
+            file_groups=_group_map((file_path, name) for name, paths in snapshot.groups.items()
+                                   for file_path in paths),
+            functionalities=dict(zip(functionalities['name'], functionalities['confidence'])),
+            edges={(source, target) for source, target in snapshot.dependency_analysis.get('edges', [])},
+        )
+    return index
+
+
+def _index_store_run(path: Path, run_id: Optional[int], label: str) -> AnalysisIndex:
+    """Load a run of an analysis store into an index."""
+    with AnalysisStore(path) as store:
+        if run_id is not None and run_id < 0:
+            runs = [run['id'] for run in store.runs()]
+            if len(runs) <= -run_id:
+                raise ValueError(f"{path} holds {len(runs)} runs, cannot go back {-run_id}")
+            run_id = runs[-run_id]
+        run = store.run(run_id)
+        if run is None:
+            raise ValueError(f"No run {run_id} in {path}" if run_id is not None else f"No runs in {path}")
+        run_id = run['id']
+        return AnalysisIndex(
+            label=f"{label} (run {run_id})",
+            project_name=run['project_name'],
+            project_type=run['project_type'],
+            main_language=run['main_language'],
+            analysis_date=run['analysis_date'],
+            files={file_path: (size, language) for file_path, size, language in store.files(run_id)},
+            file_groups=_group_map(store.file_groups(run_id)),
+            functionalities=dict(store.functionalities(run_id)),
+            edges=set(store.edges(run_id)),
+        )
+
+
+def load_index(spec: str) -> AnalysisIndex:
+    """
+    Load one side of a comparison.
+
+    Args:
+        spec: Output directory, snapshot file or store, optionally with @RUN
+            (see the module documentation)
+
+    Returns:
+        AnalysisIndex of the analysis
+
+    Raises:
+        ValueError: If the spec does not point to a readable analysis
+    """
+    location, run_id = spec, None
+    if '@' in spec:
+        location, _, run = spec.rpartition('@')
+        try:
+            run_id = int(run)
+        except ValueError:
+            raise ValueError(f"Invalid run '{run}' in {spec} (expected a run id or -N)")
+
+    path = Path(location)
+    if path.is_dir():
+        if run_id is None and (path / SNAPSHOT_FILENAME).exists():
+            return _index_snapshot(path / SNAPSHOT_FILENAME, spec)
+        path = path / STORE_FILENAME
+    if not path.exists():
+        raise ValueError(f"No analysis found at {location}")
+    if path.suffix == '.db':
+        return _index_store_run(path, run_id, spec)
+    if run_id is not None:
+        raise ValueError(f"{location} is a snapshot; runs (@N) can only be selected from an analysis store")
+    return _index_snapshot(path, spec)
+
+
+def _identity_index(paths, files: Dict[str, Tuple[int, str]]) -> Dict[Tuple[str, int], List[str]]:
+    """Group paths by (file name, size)."""
+    index: Dict[Tuple[str, int], List[str]] = {}
+    for path in paths:
+        index.setdefault((path.replace('\\', '/').rpartition('/')[2], files[path][0]), []).append(path)
+    return index
+
+
+def _language_shares(files: Dict[str, Tuple[int, str]]) -> Dict[str, float]:
+    """Percentage of files per language."""
+    counts = Counter(language for _, language in files.values())
+    total = sum(counts.values()) or 1
+    return {language: 100.0 * count / total for language, count in counts.items()}
+
+
+def diff_analyses(before: AnalysisIndex, after: AnalysisIndex) -> Dict[str, Any]:
+    """
+    Compare two analyses.
+
+    Args:
+        before: Older analysis
+        after: Newer analysis
+
+    Returns:
+        JSON-serializable report; lists are sorted
+    """
+    old_files, new_files = before.files, after.files
+    old_paths, new_paths = old_files.keys(), new_files.keys()
+    added = new_paths - old_paths
+    removed = old_paths - new_paths
+    common = old_paths & new_paths
+
+    # A removed and an added file with the same name and size, unique on both sides, were renamed
+    removed_index = _identity_index(removed, old_files)
+    added_index = _identity_index(added, new_files)
+    renamed = sorted(
+        (old[0], added_index[key][0]) for key, old in removed_index.items()
+        if len(old) == 1 and len(added_index.get(key, ())) == 1
+    )
+    for old_path, new_path in renamed:
+        removed.discard(old_path)
+        added.discard(new_path)
+
+    resized = sorted(path for path in common if old_files[path][0] != new_files[path][0])
+
+    # Group moves, including renamed files that ended up in other groups
+    old_groups, new_groups = before.file_groups, after.file_groups
+    moved = [
+        {'path': path, 'from': list(old_groups.get(path, ())), 'to': list(new_groups.get(path, ()))}
+        for path in sorted(common) if old_groups.get(path, ()) != new_groups.get(path, ())
+    ]
+    moved += [
+        {'path': new_path, 'renamed_from': old_path,
+         'from': list(old_groups.get(old_path, ())), 'to': list(new_groups.get(new_path, ()))}
+        for old_path, new_path in renamed if old_groups.get(old_path, ()) != new_groups.get(new_path, ())
+    ]
+    group_sizes_before = Counter(name for names in old_groups.values() for name in names)
+    group_sizes_after = Counter(name for names in new_groups.values() for name in names)
+
+    # Language mix
+    old_shares, new_shares = _language_shares(old_files), _language_shares(new_files)
+    language_shift = sorted(
+        ({'language': language,
+          'before': round(old_shares.get(language, 0.0), 1),
+          'after': round(new_shares.get(language, 0.0), 1),
+          'change': round(new_shares.get(language, 0.0) - old_shares.get(language, 0.0), 1)}
+         for language in old_shares.keys() | new_shares.keys()),
+        key=lambda entry: (-abs(entry['change']), entry['language'])
+    )
+
+    # Functionalities
+    old_funcs, new_funcs = before.functionalities, after.functionalities
+    confidence_changes = sorted(
+        ({'name': name, 'before': old_funcs[name], 'after': new_funcs[name],
+          'change': round(new_funcs[name] - old_funcs[name], 4)}
+         for name in old_funcs.keys() & new_funcs.keys() if old_funcs[name] != new_funcs[name]),
+        key=lambda entry: (-abs(entry['change']), entry['name'])
+    )
+
+    # Dependencies (cycles can only differ if edges do)
+    old_cycles = new_cycles = set()
+    if before.edges != after.edges:
+        old_cycles, new_cycles = before.cycles(), after.cycles()
+
+    return {
+        'before': {'label': before.label, 'analysis_date': before.analysis_date, 'file_count': len(old_files)},
+        'after': {'label': after.label, 'analysis_date': after.analysis_date, 'file_count': len(new_files)},
+        'project_type': {'before': before.project_type, 'after': after.project_type},
+        'main_language': {'before': before.main_language, 'after': after.main_language},
+        'files': {
+            'added': sorted(added),
+            'removed': sorted(removed),
+            'renamed': [{'from': old_path, 'to': new_path} for old_path, new_path in renamed],
+            'resized': resized,
+        },
+        'groups': {
+            'moved': moved,
+            'sizes': {
+                name: {'before': group_sizes_before.get(name, 0), 'after': group_sizes_after.get(name, 0)}
+                for name in sorted(group_sizes_before.keys() | group_sizes_after.keys())
+                if group_sizes_before.get(name, 0) != group_sizes_after.get(name, 0)
+            },
+        },
+        'languages': language_shift,
+        'functionalities': {
+            'added': sorted(new_funcs.keys() - old_funcs.keys()),
+            'removed': sorted(old_funcs.keys() - new_funcs.keys()),
+            'confidence_changes': confidence_changes,
+        },
+        'dependencies': {
+            'edges_added': len(after.edges - before.edges),
+            'edges_removed': len(before.edges - after.edges),
+            'new_cycles': sorted(sorted(cycle) for cycle in new_cycles - old_cycles),
+            'resolved_cycles': sorted(sorted(cycle) for cycle in old_cycles - new_cycles),
+        },
+    }
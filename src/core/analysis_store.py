@@ -0,0 +1,358 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+SQLite store of analysis results.
+
+Every analysis run is stored as one row in `runs`; files, functional
+groups, the file -> group mapping, language totals, functionalities and
+dependency edges are stored in per-run tables keyed by run id, so several
+runs of the same project can be kept side by side and compared.
+
+Tables are indexed for the questions downstream commands and external
+tools ask ("which group owns this file", "files by language", "largest
+groups"), so these are answered by the database without loading a whole
+analysis into memory. A run is written with bulk inserts in a single
+transaction; readers never see a partially stored run.
+"""
+
+import json
+import sqlite3
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from ..models.project import ProjectAnalysis
+
+logger = logging.getLogger(__name__)
+
+# Store file name inside an analysis output directory
+STORE_FILENAME = 'analysis.db'
+
+# Bump when the schema changes; older stores are rebuilt
+STORE_SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    project_name TEXT NOT NULL,
+    project_path TEXT NOT NULL,
+    project_type TEXT NOT NULL,
+    main_language TEXT,
+    file_count INTEGER NOT NULL,
+    directory_count INTEGER NOT NULL,
+    total_size INTEGER NOT NULL,
+    analysis_date TEXT,
+    status TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_project ON runs (project_path, id);
+
+CREATE TABLE IF NOT EXISTS files (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    path TEXT NOT NULL,
+    name TEXT NOT NULL,
+    extension TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    language TEXT NOT NULL,
+    is_important INTEGER NOT NULL,
+    PRIMARY KEY (run_id, path)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS files_language ON files (run_id, language);
+
+CREATE TABLE IF NOT EXISTS groups (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    file_count INTEGER NOT NULL,
+    PRIMARY KEY (run_id, name)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS groups_size ON groups (run_id, file_count);
+
+CREATE TABLE IF NOT EXISTS file_groups (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    path TEXT NOT NULL,
+    group_name TEXT NOT NULL,
+    PRIMARY KEY (run_id, path, group_name)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS file_groups_group ON file_groups (run_id, group_name);
+
+CREATE TABLE IF NOT EXISTS languages (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    language TEXT NOT NULL,
+    file_count INTEGER NOT NULL,
+    total_size INTEGER NOT NULL,
+    PRIMARY KEY (run_id, language)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS functionalities (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    confidence REAL NOT NULL,
+    description TEXT,
+    evidence_files TEXT NOT NULL,
+    patterns_matched TEXT NOT NULL,
+    PRIMARY KEY (run_id, name)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS dependency_edges (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    source TEXT NOT NULL,
+    target TEXT NOT NULL,
+    PRIMARY KEY (run_id, source, target)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS dependency_edges_target ON dependency_edges (run_id, target);
+"""
+
+_TABLES = ['dependency_edges', 'functionalities', 'languages', 'file_groups', 'groups', 'files', 'runs']
+
+
+class AnalysisStore:
+    """SQLite database holding one or more analysis runs."""
+
+    def __init__(self, db_path: Union[str, Path]):
+        """
+        Open (and create if needed) an analysis store.
+
+        Args:
+            db_path: SQLite database file
+        """
+        self.db_path = Path(db_path)
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        self._init_schema()
+
+    @classmethod
+    def load(cls, analysis_path: Union[str, Path]) -> Optional['AnalysisStore']:
+        """
+        Open the store of an analysis output directory.
+
+        Args:
+            analysis_path: Output directory of `analyze`
+
+        Returns:
+            The store, or None if the directory has no usable store
+        """
+        path = Path(analysis_path) / STORE_FILENAME
+        if not path.exists():
+            return None
+        try:
+            return cls(path)
+        except sqlite3.Error as e:
+            logger.warning(f"Ignoring unreadable analysis store {path}: {e}")
+            return None
+
+    def close(self):
+        """Close the database connection."""
+        self.conn.close()
+
+    def __enter__(self) -> 'AnalysisStore':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _init_schema(self):
+        """Create the schema, rebuilding stores written with another schema version."""
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        with self.conn:
+            if version not in (0, STORE_SCHEMA_VERSION):
+                logger.info(f"Rebuilding analysis store {self.db_path} (schema {version} -> {STORE_SCHEMA_VERSION})")
+                for table in _TABLES:
+                    self.conn.execute(f"DROP TABLE IF EXISTS {table}")
+            self.conn.executescript(_SCHEMA)
+            self.conn.execute(f"PRAGMA user_version = {STORE_SCHEMA_VERSION}")
+
+    def save(self, analysis: ProjectAnalysis) -> int:
+        """
+        Store an analysis as a new run, in a single transaction.
+
+        Args:
+            analysis: Completed project analysis
+
+        Returns:
+            Id of the new run
+        """
+        languages: Dict[str, List[int]] = {}
+        for file_info in analysis.files:
+            totals = languages.setdefault(file_info.language, [0, 0])
+            totals[0] += 1
+            totals[1] += file_info.size
+
+        with self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO runs (project_name, project_path, project_type, main_language, file_count,"
+                " directory_count, total_size, analysis_date, status) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (analysis.project_name, analysis.project_path, analysis.project_type.value,
+                 analysis.main_language, analysis.file_count, analysis.directory_count,
+                 int(analysis.total_size), analysis.analysis_date, analysis.status.value)
+            )
+            run_id = cursor.lastrowid
+
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?)",
+                ((run_id, f.path, f.name, f.extension, f.size, f.language, int(f.is_important))
+                 for f in analysis.files)
+            )
+            self.conn.executemany(
+                "INSERT INTO groups VALUES (?, ?, ?)",
+                ((run_id, name, len(files)) for name, files in analysis.groups.items())
+            )
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO file_groups VALUES (?, ?, ?)",
+                ((run_id, path, name) for name, files in analysis.groups.items() for path in files)
+            )
+            self.conn.executemany(
+                "INSERT INTO languages VALUES (?, ?, ?, ?)",
+                ((run_id, language, count, size) for language, (count, size) in languages.items())
+            )
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO functionalities VALUES (?, ?, ?, ?, ?, ?)",
+                ((run_id, f.name, float(f.confidence), f.description,
+                  json.dumps(f.evidence_files), json.dumps(f.patterns_matched))
+                 for f in analysis.functionality_details)
+            )
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO dependency_edges VALUES (?, ?, ?)",
+                ((run_id, source, target) for source, target in analysis.dependency_analysis.get('edges', []))
+            )
+        return run_id
+
+    def prune(self, keep: int, project_path: Optional[str] = None) -> int:
+        """
+        Delete all but the most recent runs of a project.
+
+        Args:
+            keep: Number of runs to keep
+            project_path: Project whose runs are pruned (default: every project)
+
+        Returns:
+            Number of runs deleted
+        """
+        if project_path is None:
+            paths = [row[0] for row in self.conn.execute("SELECT DISTINCT project_path FROM runs")]
+        else:
+            paths = [project_path]
+
+        deleted = 0
+        with self.conn:
+            for path in paths:
+                stale = self.conn.execute(
+                    "SELECT id FROM runs WHERE project_path = ? ORDER BY id DESC LIMIT -1 OFFSET ?",
+                    (path, max(0, keep))
+                ).fetchall()
+                self.conn.executemany("DELETE FROM runs WHERE id = ?", stale)
+                deleted += len(stale)
+        return deleted
+
+    def delete_run(self, run_id: int):
+        """Delete a run and all of its rows."""
+        with self.conn:
+            self.conn.execute("DELETE FROM runs WHERE id = ?", (run_id,))
+
+    def runs(self, project_path: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        List stored runs, most recent first.
+
+        Args:
+            project_path: Only list runs of this project
+
+        Returns:
+            One dictionary per run with its summary columns
+        """
+        query = "SELECT * FROM runs"
+        params: Tuple = ()
+        if project_path is not None:
+            query += " WHERE project_path = ?"
+            params = (project_path,)
+        cursor = self.conn.execute(query + " ORDER BY id DESC", params)
+        columns = [column[0] for column in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor]
+
+    def latest_run(self, project_path: Optional[str] = None) -> Optional[int]:
+        """Id of the most recent run (of a project), or None if the store is empty."""
+        if project_path is None:
+            row = self.conn.execute("SELECT MAX(id) FROM runs").fetchone()
+        else:
+            row = self.conn.execute("SELECT MAX(id) FROM runs WHERE project_path = ?", (project_path,)).fetchone()
+        return row[0]
+
+    def _run(self, run_id: Optional[int]) -> Optional[int]:
+        """Resolve the default run."""
+        return self.latest_run() if run_id is None else run_id
+
+    def groups_of_file(self, path: str, run_id: Optional[int] = None) -> List[str]:
+        """Functional groups a file belongs to."""
+        return [row[0] for row in self.conn.execute(
+            "SELECT group_name FROM file_groups WHERE run_id = ? AND path = ? ORDER BY group_name",
+            (self._run(run_id), path)
+        )]
+
+    def group_files(self, group_name: str, run_id: Optional[int] = None) -> List[str]:
+        """Files of a functional group."""
+        return [row[0] for row in self.conn.execute(
+            "SELECT path FROM file_groups WHERE run_id = ? AND group_name = ? ORDER BY path",
+            (self._run(run_id), group_name)
+        )]
+
+    def files_by_language(self, language: str, run_id: Optional[int] = None) -> List[str]:
+        """Files written in a language."""
+        return [row[0] for row in self.conn.execute(
+            "SELECT path FROM files WHERE run_id = ? AND language = ? ORDER BY path",
+            (self._run(run_id), language)
+        )]
+
+    def largest_groups(self, limit: int = 10, run_id: Optional[int] = None) -> List[Tuple[str, int]]:
+        """Functional groups with the most files, as (name, file count)."""
+        return self.conn.execute(
+            "SELECT name, file_count FROM groups WHERE run_id = ? ORDER BY file_count DESC, name LIMIT ?",
+            (self._run(run_id), limit)
+        ).fetchall()
+
+    def languages(self, run_id: Optional[int] = None) -> List[Tuple[str, int, int]]:
+        """Languages as (language, file count, total size), most files first."""
+        return self.conn.execute(
+            "SELECT language, file_count, total_size FROM languages WHERE run_id = ?"
+            " ORDER BY file_count DESC, language",
+            (self._run(run_id),)
+        ).fetchall()
+
+    def functionalities(self, run_id: Optional[int] = None) -> List[Tuple[str, float]]:
+        """Detected functionalities as (name, confidence), most confident first."""
+        return self.conn.execute(
+            "SELECT name, confidence FROM functionalities WHERE run_id = ? ORDER BY confidence DESC, name",
+            (self._run(run_id),)
+        ).fetchall()
+
+    def dependents(self, path: str, run_id: Optional[int] = None) -> List[str]:
+        """Files that import a file."""
+        return [row[0] for row in self.conn.execute(
+            "SELECT source FROM dependency_edges WHERE run_id = ? AND target = ? ORDER BY source",
+            (self._run(run_id), path)
+        )]
+
+    def run(self, run_id: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """Summary columns of a run, or None if it does not exist."""
+        cursor = self.conn.execute("SELECT * FROM runs WHERE id = ?", (self._run(run_id),))
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        return dict(zip([column[0] for column in cursor.description], row))
+
+    def files(self, run_id: Optional[int] = None) -> List[Tuple[str, int, str]]:
+        """Every file of a run as (path, size, language)."""
+        return self.conn.execute(
+            "SELECT path, size, language FROM files WHERE run_id = ?", (self._run(run_id),)
+        ).fetchall()
+
+    def file_groups(self, run_id: Optional[int] = None) -> List[Tuple[str, str]]:
+        """Every file -> group assignment of a run as (path, group name)."""
+        return self.conn.execute(
+            "SELECT path, group_name FROM file_groups WHERE run_id = ?", (self._run(run_id),)
+        ).fetchall()
+
+    def edges(self, run_id: Optional[int] = None) -> List[Tuple[str, str]]:
+        """Every dependency edge of a run as (source, target)."""
+        return self.conn.execute(
+            "SELECT source, target FROM dependency_edges WHERE run_id = ?", (self._run(run_id),)
+        ).fetchall()
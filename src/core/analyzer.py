@@ -6,116 +6,292 @@ Simplified ProjectAnalyzer for ProjectPrompt v2.0
 Streamlined analysis focusing on core functionality
 """
 
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterable, List, Optional, Any, Tuple
 from datetime import datetime
 import os
+import time
 from pathlib import Path
 import json
 
 from .scanner import ProjectScanner
 from .detector import FunctionalityDetector  
+from .rule_packs import load_rules
+from .detection_cache import DetectionCache
+from .dependency_analyzer import UnifiedDependencyAnalyzer, IMPORT_EXTRACTOR_VERSION
+from .import_cache import ImportCache
 from .group_manager import GroupManager
+from .pipeline import run_stages
+from .output_writer import OutputWriter
+from .progress import ProgressCallback, ProgressTracker
+from .snapshot import SNAPSHOT_FILENAME, encode_snapshot
+from .analysis_store import AnalysisStore, STORE_FILENAME
 from ..models.project import ScanConfig, ProjectAnalysis, ProjectType, AnalysisStatus
+from ..utils.filenames import sanitize_filename
+
+
+class ProjectTypeSignals:
+    """Accumulates project type signals from file paths, one path at a time."""
+    
+    # Path patterns per project type, in priority order
+    TYPE_PATTERNS = [
+        (ProjectType.API, ['api', 'server', 'backend', 'service', 'endpoint', 'routes']),
+        (ProjectType.WEB_APPLICATION, ['component', 'react', 'vue', 'angular', 'frontend', 'ui', 'views']),
+        (ProjectType.CLI_TOOL, ['cli', 'command', 'main.py', 'console', 'terminal']),
+        (ProjectType.LIBRARY, ['lib', 'library', 'package', 'module', '__init__.py']),
+    ]
+    
+    def __init__(self):
+        """Initialize with no signals seen."""
+        self.found = set()
+        self._pending = list(self.TYPE_PATTERNS)
+    
+    def add(self, file_path: str):
+        """Record the type signals of one file path."""
+        if not self._pending:
+            return
+        lowered = file_path.lower()
+        for entry in self._pending:
+            if any(pattern in lowered for pattern in entry[1]):
+                self.found.add(entry[0])
+        self._pending = [entry for entry in self._pending if entry[0] not in self.found]
+    
+    def project_type(self) -> ProjectType:
+        """Return the highest priority project type seen."""
+        for project_type, _ in self.TYPE_PATTERNS:
+            if project_type in self.found:
+                return project_type
+        return ProjectType.UNKNOWN
 
 
 class ProjectAnalyzer:
     """Simplified project analyzer"""
     
-    def __init__(self, scan_config: Optional[ScanConfig] = None):
-        """Initialize analyzer with optional scan configuration"""
+    def __init__(self, scan_config: Optional[ScanConfig] = None, rule_files: Optional[List[str]] = None):
+        """
+        Initialize analyzer with optional scan configuration.
+        
+        Args:
+            scan_config: Scan configuration
+            rule_files: Additional detector rule packs (YAML)
+        """
         self.scan_config = scan_config or ScanConfig()
-        self.scanner = ProjectScanner()
-        self.detector = FunctionalityDetector()
+        self.scanner = ProjectScanner(self.scan_config)
+        run_budget_mb = self.scan_config.content_run_budget_mb
+        self.rules = load_rules(rule_files)
+        self.detector = FunctionalityDetector(
+            rules=self.rules,
+            file_byte_budget=self.scan_config.content_file_budget_kb * 1024,
+            run_byte_budget=int(run_budget_mb * 1024 * 1024) if run_budget_mb is not None else None,
+            stop_when_saturated=self.scan_config.stop_when_saturated
+        )
         self.group_manager = GroupManager()
+        self.dependency_analyzer = UnifiedDependencyAnalyzer(
+            max_workers=self.scan_config.import_workers,
+            import_cache=ImportCache(IMPORT_EXTRACTOR_VERSION) if self.scan_config.use_import_cache else None
+        )
+        self.output_writer = OutputWriter()
     
-    def analyze_project(self, path: Path, output_dir: Path = None) -> Dict:
+    def analyze_project(self, path: Path, output_dir: Path = None,
+                        progress_callback: Optional[ProgressCallback] = None) -> Dict:
         """
         Analyze project structure and create functional groups.
         
         Args:
             path: Path to project directory
             output_dir: Output directory for analysis files
+            progress_callback: Receives progress events of each stage (see progress.py)
             
         Returns:
             Dictionary with analysis results for CLI compatibility
         """
+        analysis, output_stats = self.build_analysis(path, output_dir, progress_callback=progress_callback)
+        return self.summarize(analysis, output_stats)
+    
+    @staticmethod
+    def summarize(analysis: ProjectAnalysis, output_stats: Dict[str, int]) -> Dict:
+        """Return an analysis in the dictionary format of analyze_project (used by the CLI)."""
+        return {
+            'project_name': analysis.project_name,
+            'project_path': analysis.project_path,
+            'project_type': analysis.project_type.value,
+            'main_language': analysis.main_language,
+            'file_count': analysis.file_count,
+            'analysis_date': analysis.analysis_date,
+            'detected_functionalities': analysis.detected_functionalities,
+            'files': analysis.files,
+            'functional_groups': analysis.groups,
+            'detection_stats': analysis.detection_stats,
+            'output_stats': output_stats,
+            'status': analysis.status.value
+        }
+    
+    def build_analysis(self, path: Path, output_dir: Path = None, subdir: Optional[str] = None,
+                       exclude_dirs: Iterable[str] = (),
+                       progress_callback: Optional[ProgressCallback] = None) -> Tuple[ProjectAnalysis, Dict[str, int]]:
+        """
+        Analyze a project and save its outputs.
+        
+        With subdir and/or exclude_dirs only that part of the project is
+        analyzed (one shard of a monorepo, see sharding.py); file paths stay
+        relative to path.
+        
+        Args:
+            path: Path to project directory
+            output_dir: Output directory for analysis files (None skips saving)
+            subdir: Only analyze this directory (relative to path)
+            exclude_dirs: Directories (relative to path) left out of the analysis
+            progress_callback: Receives progress events of each stage (see progress.py)
+            
+        Returns:
+            Tuple (analysis, output statistics)
+        """
         if not os.path.isdir(path):
             raise ValueError(f"Path is not a valid directory: {path}")
         
-        # Step 1: Scan project files
-        scan_result = self.scanner.scan_project(str(path))
+        started = time.perf_counter()
+        root_path = str(path)
+        progress = ProgressTracker(progress_callback)
+        estimated_files = None
+        if progress_callback is not None:
+            progress.stage('count')
+            estimated_files = self.scanner.estimate_file_count(root_path, subdir, exclude_dirs)
+            progress.advance(estimated_files)
+        detection_cache = None
+        if self.scan_config.use_detection_cache:
+            # Shards of one project keep separate caches so concurrent runs do not overwrite each other
+            detection_cache = DetectionCache(
+                Path(path) / subdir if subdir else path,
+                f"{self.rules.fingerprint}:{self.detector.file_byte_budget}"
+            )
+        detection = self.detector.session(root_path=root_path, cache=detection_cache)
+        collect_imports = self.scan_config.analyze_dependencies
+        self.dependency_analyzer.root_path = root_path
         
-        # Step 2: Extract file paths for functionality detection
-        file_paths = [f.path for f in scan_result.files]
+        # Step 1: Read file signals (imports, then content keywords only where no
+        # imports were found, both in worker processes)
+        def read_imports(file_infos):
+            if not collect_imports:
+                return ((file_info, None) for file_info in file_infos)
+            return self.dependency_analyzer.iter_imports(file_infos, path_of=lambda file_info: file_info.path)
         
-        # Step 3: Detect functionalities
-        functionality_result = self.detector.detect_functionalities(file_paths)
+        def read_signals(items):
+            return detection.iter_match(items, path_of=lambda file_info: file_info.path)
         
-        # Step 4: Create functional groups using file info
-        raw_groups = self.group_manager.create_groups(scan_result.files)
-        groups = self.group_manager.filter_empty_groups(raw_groups)
+        # Step 2: Stream scanned files through detection, grouping and type signals in one pass
+        files = []
+        file_imports = {}
+        raw_groups = self.group_manager.empty_groups()
+        type_signals = ProjectTypeSignals()
+        stream = run_stages(
+            self.scanner.iter_files(root_path, subdir, exclude_dirs), [read_imports, read_signals],
+            threaded=self.scan_config.pipeline_threads,
+            queue_size=self.scan_config.pipeline_queue_size
+        )
+        progress.stage('scan', total=estimated_files)
+        visited = 0
+        for file_info, imports, signals in stream:
+            # Count every visited entry (including skipped binary or oversized files)
+            scanned = self.scanner.stats['total_files']
+            progress.advance(scanned - visited, file_info.size)
+            visited = scanned
+            files.append(file_info)
+            if imports is not None:
+                file_imports[file_info.path] = imports
+            detection.add(file_info.path, signals)
+            raw_groups[self.group_manager.classify(file_info)].append(file_info.path)
+            type_signals.add(file_info.path)
+        progress.advance(self.scanner.stats['total_files'] - visited)
+        scan_result = self.scanner.get_structure(root_path)
+        if collect_imports and self.dependency_analyzer.import_cache is not None:
+            self.dependency_analyzer.import_cache.save()
+        
+        # Step 3: Score functionalities (keyword hits of unchanged files came from the cache)
+        progress.stage('score')
+        functionality_result = detection.finish()
+        if detection_cache is not None:
+            detection_cache.save()
+        
+        # Step 4: Resolve dependencies from the imports collected while streaming
+        dependency_analysis = {}
+        if collect_imports:
+            progress.stage('dependencies', total=len(files))
+            dependency_analysis = self.dependency_summary(self.dependency_analyzer.analyze_dependencies(
+                [f.path for f in files], root_path=root_path, file_imports=file_imports
+            ))
+            progress.advance(len(files))
         
-        # Step 5: Build complete analysis result using proper model
+        # Step 5: Drop empty functional groups
+        progress.stage('grouping', total=len(files))
+        groups = self.group_manager.filter_empty_groups(raw_groups, root_path)
+        progress.advance(len(files))
+        
+        # Step 6: Build complete analysis result using proper model
         analysis = ProjectAnalysis(
             project_name=path.name,
-            project_path=str(path),
-            project_type=self._detect_project_type(file_paths, scan_result.main_language),
+            project_path=root_path,
+            project_type=type_signals.project_type(),
             main_language=scan_result.main_language,
-            file_count=len(scan_result.files),
+            file_count=len(files),
             directory_count=len(scan_result.directories),
             total_size=scan_result.total_size,
             detected_functionalities=[f.name for f in functionality_result],
             functionality_details=functionality_result,
-            files=scan_result.files,
+            files=files,
             groups=groups,
+            dependency_analysis=dependency_analysis,
+            detection_stats=dict(detection.stats),
             analysis_date=datetime.now().isoformat(),
             status=AnalysisStatus.COMPLETED
         )
+        analysis.analysis_duration = time.perf_counter() - started
+        progress.finish()
         
         # Save analysis if output directory specified
-        if output_dir:
-            self._save_analysis_files(analysis, output_dir)
+        output_stats = self.save_analysis(analysis, output_dir, progress_callback) if output_dir else {}
         
-        # Return CLI-compatible format
-        return {
-            'project_name': analysis.project_name,
-            'project_path': analysis.project_path,
-            'project_type': analysis.project_type.value,
-            'main_language': analysis.main_language,
-            'file_count': analysis.file_count,
-            'analysis_date': analysis.analysis_date,
-            'detected_functionalities': analysis.detected_functionalities,
-            'files': analysis.files,
-            'functional_groups': analysis.groups,
-            'status': analysis.status.value
-        }
+        return analysis, output_stats
     
-    def _detect_project_type(self, file_paths: List[str], main_language: str) -> ProjectType:
-        """Automatically detect project type based on file patterns and language"""
-        # API patterns
-        api_patterns = ['api', 'server', 'backend', 'service', 'endpoint', 'routes']
-        if any(pattern in ' '.join(file_paths).lower() for pattern in api_patterns):
-            return ProjectType.API
-            
-        # Frontend patterns  
-        frontend_patterns = ['component', 'react', 'vue', 'angular', 'frontend', 'ui', 'views']
-        if any(pattern in ' '.join(file_paths).lower() for pattern in frontend_patterns):
-            return ProjectType.WEB_APPLICATION
-            
-        # CLI patterns
-        cli_patterns = ['cli', 'command', 'main.py', 'console', 'terminal']
-        if any(pattern in ' '.join(file_paths).lower() for pattern in cli_patterns):
-            return ProjectType.CLI_TOOL
-            
-        # Library patterns
-        lib_patterns = ['lib', 'library', 'package', 'module', '__init__.py']
-        if any(pattern in ' '.join(file_paths).lower() for pattern in lib_patterns):
-            return ProjectType.LIBRARY
+    def save_analysis(self, analysis: ProjectAnalysis, output_dir: Path,
+                      progress_callback: Optional[ProgressCallback] = None) -> Dict[str, int]:
+        """
+        Write the outputs of an analysis and add it to the analysis store.
+        
+        Args:
+            analysis: Completed project analysis
+            output_dir: Output directory for analysis files
+            progress_callback: Receives progress events of the written outputs
             
-        return ProjectType.UNKNOWN
+        Returns:
+            Output statistics (files written and unchanged, stored run id)
+        """
+        output_stats = self._save_analysis_files(analysis, Path(output_dir), progress_callback)
+        if self.scan_config.use_analysis_store:
+            output_stats['run_id'] = self._store_analysis(analysis, Path(output_dir))
+        return output_stats
     
-    def _save_analysis_files(self, analysis: ProjectAnalysis, output_dir: Path):
-        """Save analysis to proper directory structure"""
+    @staticmethod
+    def dependency_summary(dependency_result: Dict[str, Any]) -> Dict[str, Any]:
+        """Keep the serializable part of a UnifiedDependencyAnalyzer result."""
+        return {
+            'edges': [list(edge) for edge in dependency_result['graph'].edges()],
+            'circular_dependencies': dependency_result['circular_dependencies'],
+            'cyclic_components': dependency_result['cyclic_components'],
+            'importance_scores': dependency_result['importance_scores'],
+            'total_connections': dependency_result['total_connections'],
+            'total_nodes': dependency_result['total_nodes'],
+        }
+    
+    def _save_analysis_files(self, analysis: ProjectAnalysis, output_dir: Path,
+                             progress_callback: Optional[ProgressCallback] = None) -> Dict[str, int]:
+        """
+        Save analysis to proper directory structure.
+        
+        Files are rendered in parallel, unchanged files are left untouched and
+        changed files are replaced atomically.
+        
+        Returns:
+            Statistics with the number of files written and left unchanged
+        """
         # Create main structure
         output_dir.mkdir(parents=True, exist_ok=True)
         analysis_dir = output_dir / "analysis"
@@ -123,30 +299,45 @@ class ProjectAnalyzer:
         functional_groups_dir = analysis_dir / "functional-groups"
         functional_groups_dir.mkdir(parents=True, exist_ok=True)
         
-        # Save project structure analysis
-        project_structure_file = analysis_dir / "project-structure.md"
-        project_structure_content = self._generate_project_structure_md(analysis)
-        project_structure_file.write_text(project_structure_content, encoding='utf-8')
-        
-        # Save dependency map
-        dependency_map_file = analysis_dir / "dependency-map.md"
-        dependency_map_content = self._generate_dependency_map_md(analysis)
-        dependency_map_file.write_text(dependency_map_content, encoding='utf-8')
+        outputs = {
+            # Project structure analysis
+            analysis_dir / "project-structure.md": lambda: self._generate_project_structure_md(analysis),
+            # Dependency map
+            analysis_dir / "dependency-map.md": lambda: self._generate_dependency_map_md(analysis),
+        }
         
-        # Save individual group analysis files
+        # Individual group analysis files
         for group_name, files in analysis.groups.items():
-            group_file = functional_groups_dir / f"{self._sanitize_filename(group_name)}-analysis.md"
-            group_content = self._generate_group_analysis_md(group_name, files, analysis)
-            group_file.write_text(group_content, encoding='utf-8')
+            group_file = functional_groups_dir / f"{sanitize_filename(group_name)}-analysis.md"
+            outputs[group_file] = (
+                lambda group_name=group_name, files=files:
+                self._generate_group_analysis_md(group_name, files, analysis)
+            )
         
-        # Save JSON files for compatibility
-        groups_file = output_dir / "groups.json"
+        # JSON files for compatibility
         groups_data = {
             "groups": analysis.groups,
             "total_groups": len(analysis.groups)
         }
-        with open(groups_file, 'w', encoding='utf-8') as f:
-            json.dump(groups_data, f, indent=2)
+        outputs[output_dir / "groups.json"] = lambda: json.dumps(groups_data, indent=2)
+        
+        # Binary snapshot read by suggest, status and generate-prompts
+        outputs[output_dir / SNAPSHOT_FILENAME] = lambda: encode_snapshot(analysis)
+        
+        return self.output_writer.write_all(outputs, progress_callback)
+    
+    def _store_analysis(self, analysis: ProjectAnalysis, output_dir: Path) -> int:
+        """
+        Add the analysis as a new run to the output directory's SQLite store.
+        
+        Returns:
+            Id of the stored run
+        """
+        with AnalysisStore(output_dir / STORE_FILENAME) as store:
+            run_id = store.save(analysis)
+            if self.scan_config.max_stored_runs is not None:
+                store.prune(self.scan_config.max_stored_runs, analysis.project_path)
+        return run_id
     
     def _generate_project_structure_md(self, analysis: ProjectAnalysis) -> str:
         """Generate project structure markdown"""
@@ -231,10 +422,3 @@ class ProjectAnalyzer:
     def _analyze_group_characteristics(self, group_name: str, files: List[str], project_type) -> str:
         """Analyze characteristics of a specific group"""
         return f"This group contains {len(files)} files that are classified as {group_name.lower()}."
-    
-    def _sanitize_filename(self, name: str) -> str:
-        """Convert name to valid filename"""
-        import re
-        sanitized = re.sub(r'[^\w\s-]', '', name)
-        sanitized = re.sub(r'[-\s]+', '-', sanitized)
-        return sanitized.lower().strip('-')
@@ -0,0 +1,247 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Batch analysis of many repositories in a shared worker pool.
+
+Each worker process builds one ProjectAnalyzer (rules loaded and compiled
+once) and reuses it for every repository it is handed, so the interpreter
+startup and imports are paid once per worker instead of once per
+repository. Results are yielded as repositories finish.
+
+Failures are isolated per repository: an exception is reported as a failed
+result, and a worker crash that breaks the pool restarts the pool and
+retries the repositories that were in flight, one at a time. A repository
+that crashes its worker again is reported as failed.
+"""
+
+import os
+import hashlib
+import logging
+from collections import Counter
+from dataclasses import replace
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+from .analyzer import ProjectAnalyzer
+from ..models.project import ScanConfig, ProjectAnalysis, merge_project_analyses
+
+logger = logging.getLogger(__name__)
+
+# Attempts per repository when worker crashes break the pool
+MAX_ATTEMPTS = 2
+
+
+class BatchResult(NamedTuple):
+    """Outcome of analyzing one repository."""
+    path: str
+    output_dir: Optional[str]
+    analysis: Optional[ProjectAnalysis] = None
+    output_stats: Optional[Dict[str, int]] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+_worker_analyzer: Optional[ProjectAnalyzer] = None
+
+
+def _init_batch_worker(scan_config: ScanConfig, rule_files: Optional[List[str]]):
+    """Build the analyzer once per worker process."""
+    global _worker_analyzer
+    # The pool already runs one analysis per process: extract imports in-process
+    _worker_analyzer = ProjectAnalyzer(scan_config=replace(scan_config, import_workers=1), rule_files=rule_files)
+
+
+def _analyze_repository(path: str, output_dir: Optional[str]) -> BatchResult:
+    """Analyze one repository with the worker's analyzer, reporting errors as results."""
+    try:
+        analysis, output_stats = _worker_analyzer.build_analysis(
+            Path(path), Path(output_dir) if output_dir else None
+        )
+    except Exception as e:
+        logger.debug(f"Analysis of {path} failed", exc_info=True)
+        return BatchResult(path, output_dir, error=f"{type(e).__name__}: {e}")
+    # File lists are large and already saved; keep the summary only
+    analysis.files = []
+    return BatchResult(path, output_dir, analysis, output_stats)
+
+
+class BatchAnalyzer:
+    """Analyzes many repositories concurrently with warm worker processes."""
+
+    def __init__(self, scan_config: Optional[ScanConfig] = None, rule_files: Optional[List[str]] = None,
+                 max_workers: Optional[int] = None):
+        """
+        Initialize the batch analyzer.
+
+        Args:
+            scan_config: Scan configuration used for every repository
+            rule_files: Additional detector rule packs (YAML)
+            max_workers: Worker processes (default: CPU count; 1 analyzes in-process)
+        """
+        self.scan_config = scan_config or ScanConfig()
+        self.rule_files = rule_files
+        self.max_workers = max(1, max_workers or os.cpu_count() or 1)
+
+    def output_dirs(self, paths: List[str], output_root: Optional[Path] = None) -> Dict[str, str]:
+        """
+        Choose the output directory of every repository.
+
+        Without an output root, outputs go to <repository>/project-prompt-output
+        like `analyze`. With one, each repository gets a subdirectory named after
+        it, disambiguated with a path hash when names collide.
+
+        Args:
+            paths: Repository paths
+            output_root: Common output directory
+
+        Returns:
+            Dictionary repository path -> output directory
+        """
+        if output_root is None:
+            return {path: str(Path(path) / "project-prompt-output") for path in paths}
+
+        names = Counter(Path(path).resolve().name for path in paths)
+        output_dirs = {}
+        for path in paths:
+            name = Path(path).resolve().name
+            if names[name] > 1:
+                name += '-' + hashlib.sha256(os.path.abspath(path).encode()).hexdigest()[:8]
+            output_dirs[path] = str(output_root / name)
+        return output_dirs
+
+    def run(self, paths: Iterable[str], output_root: Optional[Path] = None) -> Iterator[BatchResult]:
+        """
+        Analyze repositories, yielding each result as soon as it is available.
+
+        Args:
+            paths: Repository paths
+            output_root: Common output directory (see output_dirs)
+
+        Yields:
+            BatchResult per repository, in completion order
+        """
+        paths = list(dict.fromkeys(str(path) for path in paths))
+        output_dirs = self.output_dirs(paths, output_root)
+
+        if self.max_workers > 1 and len(paths) > 1:
+            try:
+                executor = self._new_pool(len(paths))
+            except (OSError, RuntimeError) as e:
+                logger.warning(f"Process pool unavailable, analyzing in-process: {e}")
+            else:
+                yield from self._run_pool(executor, paths, output_dirs)
+                return
+
+        _init_batch_worker(self.scan_config, self.rule_files)
+        for path in paths:
+            yield _analyze_repository(path, output_dirs[path])
+
+    def _new_pool(self, pending: int) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=min(self.max_workers, pending),
+                                   initializer=_init_batch_worker,
+                                   initargs=(self.scan_config, self.rule_files))
+
+    def _run_pool(self, executor: ProcessPoolExecutor, paths: List[str],
+                  output_dirs: Dict[str, str]) -> Iterator[BatchResult]:
+        """Run the batch in a process pool, restarting it after worker crashes."""
+        queue = list(reversed(paths))
+        attempts = Counter()
+        in_flight = {}
+        isolated = False
+        try:
+            while queue or in_flight:
+                # Keep a bounded window of submissions so results stream steadily.
+                # Retries after a crash run alone, so a crashing repository
+                # cannot take the others down with it a second time.
+                while queue and len(in_flight) < self.max_workers * 2:
+                    retry = attempts[queue[-1]] > 0
+                    if in_flight and (retry or isolated):
+                        break
+                    path = queue.pop()
+                    attempts[path] += 1
+                    isolated = retry
+                    in_flight[executor.submit(_analyze_repository, path, output_dirs[path])] = path
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                if any(isinstance(future.exception(), BrokenProcessPool) for future in done):
+                    # The whole pool is gone: settle every in-flight repository, then restart it
+                    logger.warning("A worker process crashed; restarting the pool")
+                    done, _ = wait(in_flight)
+                    executor.shutdown(wait=True)
+                    executor = self._new_pool(len(queue) + len(done))
+
+                for future in done:
+                    path = in_flight.pop(future)
+                    try:
+                        result = future.result()
+                    except BrokenProcessPool:
+                        if attempts[path] < MAX_ATTEMPTS:
+                            queue.append(path)
+                            continue
+                        result = BatchResult(path, output_dirs[path], error="Worker process crashed")
+                    except Exception as e:
+                        # e.g. a result that cannot be sent back from the worker
+                        result = BatchResult(path, output_dirs[path], error=f"{type(e).__name__}: {e}")
+                    yield result
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+def summarize_batch(results: List[BatchResult]) -> Dict[str, Any]:
+    """
+    Aggregate batch results into a report.
+
+    Totals come from merging the successful analyses with
+    merge_project_analyses; functionalities, project types and languages are
+    additionally counted per repository.
+
+    Args:
+        results: Results of BatchAnalyzer.run
+
+    Returns:
+        Report dictionary (JSON serializable)
+    """
+    succeeded = [result for result in results if result.ok]
+    analyses = [result.analysis for result in succeeded]
+
+    totals = {'file_count': 0, 'directory_count': 0, 'total_size': 0, 'detected_functionalities': []}
+    if analyses:
+        # merge_project_analyses accumulates into its first item; merge into a fresh one
+        merged = merge_project_analyses([ProjectAnalysis(project_name='batch', project_path='')] + analyses)
+        totals = {
+            'file_count': merged.file_count,
+            'directory_count': merged.directory_count,
+            'total_size': merged.total_size,
+            'detected_functionalities': sorted(merged.detected_functionalities),
+        }
+
+    functionality_repos = Counter(name for analysis in analyses for name in analysis.detected_functionalities)
+    return {
+        'repositories': len(results),
+        'succeeded': len(succeeded),
+        'failed': len(results) - len(succeeded),
+        'totals': totals,
+        'functionality_repositories': dict(functionality_repos.most_common()),
+        'project_types': dict(Counter(analysis.project_type.value for analysis in analyses).most_common()),
+        'main_languages': dict(Counter(analysis.main_language for analysis in analyses).most_common()),
+        'results': [
+            {
+                'path': result.path,
+                'output_dir': result.output_dir,
+                'status': 'completed' if result.ok else 'failed',
+                'error': result.error,
+                'project_type': result.analysis.project_type.value if result.ok else None,
+                'main_language': result.analysis.main_language if result.ok else None,
+                'file_count': result.analysis.file_count if result.ok else None,
+                'detected_functionalities': result.analysis.detected_functionalities if result.ok else [],
+                'duration': round(result.analysis.analysis_duration or 0.0, 3) if result.ok else None,
+            }
+            for result in results
+        ],
+    }
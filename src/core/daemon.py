@@ -0,0 +1,344 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Warm analysis daemon serving requests over a local UNIX domain socket.
+
+`projectprompt serve` keeps the expensive state of the CLI in memory between
+requests: imported libraries, compiled detector rules, one ProjectAnalyzer
+per configuration, AI clients, and the last analysis of every project
+together with a manifest digest of its files (see
+ProjectScanner.manifest_digest). An `analyze` request for a project whose
+manifest, rules and outputs are unchanged is answered from memory without
+scanning. Analyzers and projects are keyed by the fingerprint of the rule
+packs, so edited rules take effect on the next request, and the least
+recently used ones are dropped beyond a fixed number.
+
+Protocol: the client connects, sends one JSON object terminated by a
+newline ({"command": ..., "args": {...}}) and reads one JSON line back:
+{"ok": true, "result": ...} or {"ok": false, "error": "..."}. The thin
+client in src/client.py only needs the standard library.
+"""
+
+import os
+import json
+import socket
+import logging
+import threading
+import socketserver
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+from .analyzer import ProjectAnalyzer
+from .rule_packs import rule_pack_files, rules_fingerprint
+from .snapshot import AnalysisSnapshot, SNAPSHOT_FILENAME
+from .analysis_store import AnalysisStore
+from ..models.project import ScanConfig
+from ..utils.config import Config
+from ..utils.filenames import sanitize_filename
+
+logger = logging.getLogger(__name__)
+
+# Default socket location
+DEFAULT_SOCKET_PATH = Path.home() / '.project-prompt' / 'daemon.sock'
+
+# Largest accepted request line
+MAX_REQUEST_SIZE = 1024 * 1024
+
+# Warm analyzers (one per configuration and rules) and projects kept in memory
+MAX_ANALYZERS = 8
+MAX_PROJECTS = 128
+
+
+class _ProjectState:
+    """Last analysis of one project/output directory pair."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.manifest: Optional[str] = None
+        self.result: Optional[Dict[str, Any]] = None
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Reads one JSON request line and writes one JSON response line."""
+
+    def handle(self):
+        line = self.rfile.readline(MAX_REQUEST_SIZE + 1)
+        if not line:
+            return
+        try:
+            if len(line) > MAX_REQUEST_SIZE:
+                raise ValueError("Request too large")
+            request = json.loads(line)
+            result = self.server.daemon.dispatch(request.get('command'), request.get('args') or {})
+            response = {'ok': True, 'result': result}
+        except Exception as e:
+            logger.debug("Request failed", exc_info=True)
+            error = str(e) if isinstance(e, ValueError) else f"{type(e).__name__}: {e}"
+            response = {'ok': False, 'error': error}
+        self.wfile.write(json.dumps(response, default=str).encode('utf-8') + b'\n')
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class AnalysisService:
+    """Runs analyze, status and suggest commands against warm in-memory state."""
+
+    def __init__(self, config: Optional[Config] = None, max_analyzers: int = MAX_ANALYZERS,
+                 max_projects: int = MAX_PROJECTS):
+        """
+        Initialize the service.
+
+        Args:
+            config: Configuration (API keys, defaults)
+            max_analyzers: Warm analyzers kept, least recently used dropped first
+            max_projects: Project results kept, least recently used dropped first
+        """
+        self.config = config or Config()
+        self.max_analyzers = max(1, max_analyzers)
+        self.max_projects = max(1, max_projects)
+        self._lock = threading.Lock()
+        self._analyzers: 'OrderedDict[Tuple, Tuple[ProjectAnalyzer, threading.Lock]]' = OrderedDict()
+        self._projects: 'OrderedDict[Tuple, _ProjectState]' = OrderedDict()
+        self._generators: Dict[Tuple[str, bool], Any] = {}
+
+    def analyze(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Analyze a project, reusing the previous result when nothing changed.
+
+        Args (request):
+            path: Project directory
+            output: Output directory (default: <path>/project-prompt-output)
+            max_files, rules, content_budget, quick, skip_dependencies, no_cache:
+                same meaning as the `analyze` command options
+
+        Returns:
+            The analysis summary of analyze_project (without the file list) and
+            'cached': whether it was served from memory
+        """
+        path = os.path.abspath(args.get('path') or '.')
+        if not os.path.isdir(path):
+            raise ValueError(f"Path is not a valid directory: {path}")
+        output_dir = os.path.abspath(args.get('output') or os.path.join(path, 'project-prompt-output'))
+
+        scan_key = (
+            args.get('max_files') or min(self.config.max_files_to_analyze, 100),
+            args.get('content_budget'),
+            bool(args.get('quick')),
+            bool(args.get('skip_dependencies')),
+            bool(args.get('no_cache')),
+        )
+        rule_files = tuple(args.get('rules') or self.config.detector_rule_files)
+        # Edited rule packs change the fingerprint, and with it the analyzer and cached result
+        fingerprint = rules_fingerprint(rule_pack_files(list(rule_files)))
+        analyzer, analyzer_lock = self._analyzer(scan_key, rule_files, fingerprint)
+
+        state = self._project_state((path, output_dir, scan_key, rule_files, fingerprint))
+        with state.lock:
+            manifest = analyzer.scanner.manifest_digest(path)
+            if (state.result is not None and manifest == state.manifest
+                    and os.path.exists(os.path.join(output_dir, SNAPSHOT_FILENAME))):
+                return dict(state.result, cached=True)
+
+            with analyzer_lock:
+                result = analyzer.analyze_project(Path(path), output_dir=Path(output_dir))
+            result.pop('files', None)
+            result['output_dir'] = output_dir
+            state.manifest = manifest
+            state.result = result
+            return dict(result, cached=False)
+
+    def status(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Summarize an analysis output directory.
+
+        Args (request):
+            analysis_dir: Output directory of `analyze`
+
+        Returns:
+            Project metadata, groups with their sizes and created suggestions
+        """
+        analysis_path = Path(args.get('analysis_dir') or './project-prompt-output')
+        if not analysis_path.exists():
+            raise ValueError(f"No analysis found in {analysis_path}")
+
+        status = {'analysis_dir': str(analysis_path), 'project': None, 'groups': [], 'suggestions': []}
+        snapshot = AnalysisSnapshot.load(analysis_path)
+        if snapshot is not None:
+            with snapshot:
+                status['project'] = snapshot.meta
+                status['groups'] = [[name, size] for name, size in snapshot.meta['group_sizes'].items()]
+        store = AnalysisStore.load(analysis_path)
+        if store is not None:
+            with store:
+                largest = store.largest_groups(limit=max(len(status['groups']), 1000))
+            if largest:
+                status['groups'] = [list(group) for group in largest]
+
+        suggestions_dir = analysis_path / "suggestions"
+        if suggestions_dir.exists():
+            status['suggestions'] = sorted(str(path) for path in suggestions_dir.glob("*-suggestions.md"))
+        return status
+
+    def suggest(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Generate suggestions for a functional group with a warm AI client.
+
+        Args (request):
+            group_name: Group to generate suggestions for
+            analysis_dir: Output directory of `analyze`
+            api: AI provider (default: from config)
+            detail_level: basic, medium or detailed
+            test_mode: Do not call the API
+
+        Returns:
+            Path of the suggestions file and the suggestions text
+        """
+        group_name = args.get('group_name')
+        if not group_name:
+            raise ValueError("group_name is required")
+        analysis_path = Path(args.get('analysis_dir') or './project-prompt-output')
+        if not analysis_path.exists():
+            raise ValueError(f"No analysis found in {analysis_path}")
+
+        provider = args.get('api') or self.config.default_api_provider
+        test_mode = bool(args.get('test_mode')) or not self.config.has_any_api_key()
+        generator = self._generator(provider, test_mode)
+
+        context = generator.load_group_context(group_name, analysis_path)
+        if not context['files']:
+            raise ValueError(f"Group '{group_name}' not found or empty")
+        prompt = generator.create_contextual_prompt(context, args.get('detail_level') or 'medium')
+        suggestions = generator.generate_suggestions(prompt, context)
+
+        suggestions_file = analysis_path / "suggestions" / f"{sanitize_filename(group_name)}-suggestions.md"
+        suggestions_file.parent.mkdir(parents=True, exist_ok=True)
+        suggestions_file.write_text(suggestions, encoding='utf-8')
+        return {'suggestions_file': str(suggestions_file), 'suggestions': suggestions, 'test_mode': test_mode}
+
+    def _analyzer(self, scan_key: Tuple, rule_files: Tuple[str, ...],
+                  fingerprint: str) -> Tuple[ProjectAnalyzer, threading.Lock]:
+        """Return the warm analyzer of a configuration and rules version, creating it once."""
+        key = (scan_key, rule_files, fingerprint)
+        with self._lock:
+            entry = self._analyzers.get(key)
+            if entry is not None:
+                self._analyzers.move_to_end(key)
+            else:
+                max_files, content_budget, quick, skip_dependencies, no_cache = scan_key
+                scan_config = ScanConfig(max_files=max_files,
+                                         content_run_budget_mb=content_budget,
+                                         stop_when_saturated=quick,
+                                         analyze_dependencies=not skip_dependencies,
+                                         use_detection_cache=not no_cache,
+                                         use_import_cache=not no_cache)
+                entry = (ProjectAnalyzer(scan_config=scan_config, rule_files=list(rule_files)), threading.Lock())
+                self._analyzers[key] = entry
+                if len(self._analyzers) > self.max_analyzers:
+                    self._analyzers.popitem(last=False)
+            return entry
+
+    def _project_state(self, key: Tuple) -> _ProjectState:
+        """Return the state of a project, keeping the most recently used ones."""
+        with self._lock:
+            state = self._projects.get(key)
+            if state is not None:
+                self._projects.move_to_end(key)
+            else:
+                state = self._projects[key] = _ProjectState()
+                if len(self._projects) > self.max_projects:
+                    self._projects.popitem(last=False)
+            return state
+
+    def _generator(self, provider: str, test_mode: bool):
+        """Return the warm suggestion generator (and API client) of a provider."""
+        with self._lock:
+            generator = self._generators.get((provider, test_mode))
+            if generator is None:
+                from ..generators.suggestions import SuggestionGenerator
+                generator = SuggestionGenerator(api_provider=provider, test_mode=test_mode)
+                self._generators[(provider, test_mode)] = generator
+            return generator
+
+
+class AnalysisDaemon(AnalysisService):
+    """Serves AnalysisService commands over a UNIX socket."""
+
+    def __init__(self, socket_path: Union[str, Path, None] = None, config: Optional[Config] = None):
+        """
+        Initialize the daemon.
+
+        Args:
+            socket_path: UNIX socket to listen on (default: ~/.project-prompt/daemon.sock)
+            config: Configuration (API keys, defaults)
+        """
+        super().__init__(config)
+        self.socket_path = Path(socket_path or DEFAULT_SOCKET_PATH)
+        self._server: Optional[_UnixServer] = None
+        self._commands: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+            'ping': self.ping,
+            'analyze': self.analyze,
+            'status': self.status,
+            'suggest': self.suggest,
+            'shutdown': self.shutdown,
+        }
+
+    def serve_forever(self):
+        """Listen on the socket until a shutdown request or interrupt."""
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        if self.socket_path.exists():
+            if _socket_alive(self.socket_path):
+                raise ValueError(f"A daemon is already listening on {self.socket_path}")
+            # Left behind by a daemon that did not exit cleanly
+            self.socket_path.unlink()
+
+        self._server = _UnixServer(str(self.socket_path), _RequestHandler)
+        self._server.daemon = self
+        os.chmod(self.socket_path, 0o600)
+        logger.info(f"Listening on {self.socket_path}")
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            try:
+                self.socket_path.unlink()
+            except OSError:
+                pass
+
+    def dispatch(self, command: Optional[str], args: Dict[str, Any]) -> Any:
+        """
+        Run one request.
+
+        Raises:
+            ValueError: If the command is unknown
+        """
+        handler = self._commands.get(command)
+        if handler is None:
+            raise ValueError(f"Unknown command: {command}")
+        return handler(args)
+
+    def ping(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        """Report that the daemon is alive."""
+        return {'pid': os.getpid(), 'projects': len(self._projects)}
+
+    def shutdown(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        """Stop serving after this request."""
+        # serve_forever must be stopped from another thread than the one handling the request
+        threading.Thread(target=self._server.shutdown, daemon=True).start()
+        return {'stopping': True}
+
+
+def _socket_alive(socket_path: Path) -> bool:
+    """Check whether a daemon accepts connections on a socket."""
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.settimeout(1.0)
+        probe.connect(str(socket_path))
+        return True
+    except OSError:
+        return False
+    finally:
+        probe.close()
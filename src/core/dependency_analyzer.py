@@ -9,15 +9,46 @@ Resolves: Problem 2 - Multiple conflicting dependency analyzers
 Consolidates: dependency_graph.py, madge_analyzer.py, smart_dependency_analyzer.py, connection_analyzer.py
 """
 
-import networkx as nx
-from typing import Dict, List, Set, Tuple, Optional
-from pathlib import Path
+import numpy as np
+from typing import Callable, Dict, FrozenSet, Iterable, Iterator, List, Set, Tuple, Optional, TypeVar
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
+import os
 import ast
 import re
 import logging
 
+from .module_index import ModuleIndex
+from .js_imports import MINIFIED_SAMPLE_CHARS, extract_js_imports, looks_minified
+from .import_cache import ImportCache
+from .graph_algorithms import IndexedGraph, degree_centrality, pagerank, update_cyclic_components
+
 logger = logging.getLogger(__name__)
 
+T = TypeVar('T')
+
+# Files sent to an import extraction process at a time
+IMPORT_CHUNK_SIZE = 64
+
+# Bump when extract_imports changes its results so cached imports are ignored
+IMPORT_EXTRACTOR_VERSION = 3
+
+_worker_analyzer: Optional['UnifiedDependencyAnalyzer'] = None
+
+
+def _init_import_worker(root_path: Optional[str]):
+    """Build the extractor once per import extraction process."""
+    global _worker_analyzer
+    _worker_analyzer = UnifiedDependencyAnalyzer(max_workers=1)
+    _worker_analyzer.root_path = root_path
+
+
+def _extract_imports_chunk(file_paths: List[str]) -> List[Optional[Set[str]]]:
+    """Extract the imports of a chunk of files in a worker process, preserving input order."""
+    return [_worker_analyzer.extract_imports(file_path) for file_path in file_paths]
+
 
 class UnifiedDependencyAnalyzer:
     """
@@ -27,51 +58,205 @@ class UnifiedDependencyAnalyzer:
     - Detección de circular deps (de smart_dependency_analyzer.py)
     """
     
-    def __init__(self):
-        """Initialize the unified dependency analyzer."""
-        self.graph = nx.DiGraph()
+    def __init__(self, max_workers: Optional[int] = None, chunk_size: int = IMPORT_CHUNK_SIZE,
+                 import_cache: Optional[ImportCache] = None):
+        """
+        Initialize the unified dependency analyzer.
+        
+        Args:
+            max_workers: Import extraction processes (default: CPU count; 1 extracts in-process)
+            chunk_size: Files per extraction task
+            import_cache: Cache of imports by file content (None parses every file)
+        """
+        self.max_workers = max(1, max_workers or os.cpu_count() or 1)
+        self.chunk_size = max(1, chunk_size)
+        self.import_cache = import_cache
+        self.graph = IndexedGraph(())
         self.file_imports = {}
+        self.unresolved_imports = {}
         self.circular_deps = []
+        self.cyclic_components = []
+        self.importance_scores = {}
+        # Report a representative shortest cycle per cyclic component
+        self.find_cycle_examples = True
+        self.root_path = None
         self.logger = logger
+        # Estado reutilizado por update_dependencies
+        self.module_index: Optional[ModuleIndex] = None
+        self._pagerank = None
+        self._cycles: Dict[FrozenSet[str], Optional[List[str]]] = {}
+        self._component_of: Dict[str, FrozenSet[str]] = {}
     
-    def analyze_dependencies(self, files: List[str]) -> Dict:
+    def analyze_dependencies(self, files: List[str], root_path: Optional[str] = None,
+                             file_imports: Optional[Dict[str, Set[str]]] = None) -> Dict:
         """
         Análisis completo de dependencias.
         
         Args:
             files: Lista de rutas de archivos a analizar
+            root_path: Directorio base de las rutas relativas (por defecto: cwd)
+            file_imports: Imports ya extraídos por archivo (p. ej. por el pipeline de análisis);
+                los archivos presentes no se vuelven a leer
             
         Returns:
             Diccionario con análisis completo:
-            - graph: NetworkX DiGraph con dependencias
-            - circular_dependencies: Lista de ciclos detectados
+            - graph: IndexedGraph con dependencias (to_networkx() da una copia networkx)
+            - circular_dependencies: Un ciclo más corto representativo por componente cíclica
+            - cyclic_components: Componentes fuertemente conexas con más de un archivo
             - importance_scores: Scores de importancia por archivo
             - total_connections: Número total de conexiones
+            - file_imports: Módulos importados por archivo
+            - unresolved_imports: Imports que no corresponden a ningún archivo analizado
         """
         self.logger.info(f"Starting dependency analysis for {len(files)} files")
+        self.root_path = root_path
+        self.file_imports = dict(file_imports or {})
+        self.unresolved_imports = {}
         
         # 1. Construir grafo de dependencias
-        self.graph = self._build_dependency_graph(files)
+        result = self.analyze_graph(self._build_dependency_graph(files))
+        result['unresolved_imports'] = self.unresolved_imports
+        
+        self.logger.info(f"✅ Dependency analysis complete: {result['total_connections']} connections, {result['total_nodes']} nodes")
+        
+        return result
+    
+    def analyze_graph(self, graph: IndexedGraph) -> Dict:
+        """
+        Calcula ciclos y métricas de importancia de un grafo ya construido
+        (p. ej. el grafo combinado de varios shards de un monorepo).
+        
+        Args:
+            graph: Grafo de dependencias archivo -> archivo
+            
+        Returns:
+            Diccionario con graph, circular_dependencies, cyclic_components,
+            importance_scores, total_connections, total_nodes y file_imports
+        """
+        self.graph = graph
         
         # 2. Detectar dependencias circulares
         self.circular_deps = self._detect_circular_dependencies()
         
         # 3. Calcular métricas de importancia
-        importance_scores = self._calculate_importance_scores()
+        self.importance_scores = self._calculate_importance_scores()
+        
+        return self._graph_result()
+    
+    def update_dependencies(self, added: Iterable[str] = (), removed: Iterable[str] = (),
+                            modified: Iterable[str] = ()) -> Dict:
+        """
+        Actualiza el último análisis con un conjunto de cambios (modo watch,
+        análisis acotado a un PR) sin reconstruirlo.
+        
+        Solo se leen los archivos añadidos y modificados. Se recalculan las
+        aristas de esos archivos, de los que importaban archivos eliminados y
+        de los que importan un nombre de módulo añadido o eliminado; las
+        componentes cíclicas solo se recalculan alrededor de las aristas
+        cambiadas y PageRank parte de los scores anteriores.
+        
+        Args:
+            added: Archivos nuevos (relativos a root_path, como en analyze_dependencies)
+            removed: Archivos eliminados
+            modified: Archivos cuyo contenido cambió
+            
+        Returns:
+            Diccionario con el mismo formato que analyze_dependencies
+            
+        Raises:
+            ValueError: Si no hay un análisis previo de analyze_dependencies
+        """
+        if self.module_index is None:
+            raise ValueError("update_dependencies requires a previous analyze_dependencies run")
+        graph = self.graph
+        index = self.module_index
+        added = list(dict.fromkeys(added))
+        removed = set(removed)
+        # Un archivo eliminado y añadido en el mismo lote queda según su estado en disco
+        for file_path in removed.intersection(added):
+            if os.path.exists(self._full_path(file_path)):
+                removed.discard(file_path)
+        added_files = [file_path for file_path in added if file_path not in removed]
+        removed.intersection_update(graph)
+        modified = [file_path for file_path in dict.fromkeys(modified)
+                    if file_path in graph and file_path not in removed]
+        modified += [file_path for file_path in added_files if file_path in graph]
+        added_files = [file_path for file_path in added_files if file_path not in graph]
+        self.logger.info(f"Updating dependency analysis: {len(added_files)} added, "
+                         f"{len(removed)} removed, {len(modified)} modified files")
+        previous_scores = dict(zip(graph.names, self._pagerank)) if self._pagerank is not None else {}
+        
+        # 1. Índice de módulos: los imports que nombran un módulo añadido o
+        #    eliminado pueden resolverse ahora a otro archivo
+        module_names = {index.remove(file_path) for file_path in removed}
+        module_names.update(index.add(file_path) for file_path in added_files)
+        module_names.discard(None)
+        rewire = set()
+        for file_path in removed:
+            rewire.update(graph.predecessors(file_path))
+        if module_names:
+            names = '|'.join(re.escape(name) for name in sorted(module_names))
+            affected = re.compile(rf"^[./]*$|(?<![\w$-])(?:{names})(?![\w$-])")
+            rewire.update(file_path for file_path, imports in self.file_imports.items()
+                          if any(affected.search(import_name) for import_name in imports))
+        
+        graph.remove_nodes(removed)
+        for file_path in removed:
+            self.file_imports.pop(file_path, None)
+            self.unresolved_imports.pop(file_path, None)
+        
+        # 2. Releer solo los archivos nuevos y modificados
+        for file_path in added_files:
+            graph.add_node(file_path)
+        changed = set(added_files)
+        for file_path, imports in self.iter_imports([file_path for file_path in added_files + modified
+                                                     if self._is_supported_file(file_path)]):
+            if imports != self.file_imports.get(file_path):
+                changed.add(file_path)
+                if imports is None:
+                    self.file_imports.pop(file_path, None)
+                else:
+                    self.file_imports[file_path] = imports
+        rewire = (rewire | changed) - removed
+        
+        # 3. Rehacer las aristas salientes de los archivos afectados
+        removed_edges, added_edges = [], []
+        for file_path in rewire:
+            old_targets = set(graph.successors(file_path))
+            self.unresolved_imports.pop(file_path, None)
+            self._add_imports_to_graph(graph, file_path, self.file_imports.get(file_path) or (), index)
+            new_targets = set(graph.successors(file_path))
+            removed_edges.extend((file_path, target) for target in old_targets - new_targets)
+            added_edges.extend((file_path, target) for target in new_targets - old_targets)
         
-        result = {
+        # 4. Componentes cíclicas y scores, solo si el grafo cambió
+        if removed or added_files or removed_edges or added_edges:
+            self._update_circular_dependencies(removed, removed_edges, added_edges)
+            start = None
+            if previous_scores:
+                default = 1.0 / len(graph) if len(graph) else 0.0
+                start = np.array([previous_scores.get(name, default) for name in graph.names])
+            self.importance_scores = self._calculate_importance_scores(start)
+        
+        result = self._graph_result()
+        result['unresolved_imports'] = self.unresolved_imports
+        self.logger.info(f"✅ Dependency update complete: {len(rewire)} files re-resolved, "
+                         f"{len(added_edges)} edges added, {len(removed_edges)} removed")
+        return result
+    
+    def _graph_result(self) -> Dict:
+        """Resultado del análisis del grafo actual."""
+        return {
             'graph': self.graph,
             'circular_dependencies': self.circular_deps,
-            'importance_scores': importance_scores,
+            'cyclic_components': self.cyclic_components,
+            'importance_scores': self.importance_scores,
             'total_connections': self.graph.number_of_edges(),
-            'total_nodes': self.graph.number_of_nodes()
+            'total_nodes': self.graph.number_of_nodes(),
+            'file_imports': self.file_imports
         }
-        
-        self.logger.info(f"✅ Dependency analysis complete: {result['total_connections']} connections, {result['total_nodes']} nodes")
-        
-        return result
     
-    def _build_dependency_graph(self, files: List[str]) -> nx.DiGraph:
+    def _build_dependency_graph(self, files: List[str]) -> IndexedGraph:
         """
         Construye grafo de dependencias sin conflictos.
         
@@ -79,23 +264,25 @@ class UnifiedDependencyAnalyzer:
             files: Lista de archivos a analizar
             
         Returns:
-            NetworkX DiGraph con las dependencias
+            IndexedGraph con las dependencias
         """
-        graph = nx.DiGraph()
+        graph = IndexedGraph(())
         
         # Crear mapeo de archivos para resolución de imports
-        file_mapping = self._create_file_mapping(files)
+        file_mapping = self.module_index = self._create_file_mapping(files)
+        
+        # Extraer (en paralelo) los imports que no se recibieron ya extraídos;
+        # se conservan para reutilizarlos (p. ej. detección de funcionalidades)
+        missing = [file_path for file_path in files
+                   if file_path not in self.file_imports and self._is_supported_file(file_path)]
+        for file_path, imports in self.iter_imports(missing):
+            if imports is not None:
+                self.file_imports[file_path] = imports
         
         for file_path in files:
             try:
-                if self._is_python_file(file_path):
-                    imports = self._extract_python_imports(file_path)
-                    self._add_imports_to_graph(graph, file_path, imports, file_mapping)
-                elif self._is_javascript_file(file_path):
-                    imports = self._extract_js_imports(file_path)
-                    self._add_imports_to_graph(graph, file_path, imports, file_mapping)
-                elif self._is_typescript_file(file_path):
-                    imports = self._extract_ts_imports(file_path)
+                imports = self.file_imports.get(file_path)
+                if imports is not None:
                     self._add_imports_to_graph(graph, file_path, imports, file_mapping)
                     
                 # Añadir nodo aunque no tenga dependencias
@@ -110,29 +297,125 @@ class UnifiedDependencyAnalyzer:
         
         return graph
     
-    def _create_file_mapping(self, files: List[str]) -> Dict[str, str]:
+    def extract_imports(self, file_path: str) -> Optional[Set[str]]:
         """
-        Crea mapeo de nombres de módulos a rutas de archivo.
+        Extrae los imports de un archivo según su lenguaje.
         
         Args:
-            files: Lista de archivos
+            file_path: Ruta del archivo (relativa a root_path si se indicó)
             
         Returns:
-            Diccionario módulo -> ruta
+            Set de módulos importados, o None si el lenguaje no está soportado
         """
-        mapping = {}
+        if self._is_python_file(file_path):
+            return self._extract_python_imports(file_path)
+        elif self._is_javascript_file(file_path):
+            return self._extract_js_imports(file_path)
+        elif self._is_typescript_file(file_path):
+            return self._extract_ts_imports(file_path)
+        return None
+    
+    def iter_imports(self, items: Iterable[T],
+                     path_of: Optional[Callable[[T], str]] = None) -> Iterator[Tuple[T, Optional[Set[str]]]]:
+        """
+        Extract the imports of a stream of files across a process pool.
         
-        for file_path in files:
-            # Mapear por nombre de archivo
-            file_name = Path(file_path).stem
-            mapping[file_name] = file_path
+        Files found in the import cache (if any) are not parsed again, and
+        files of unsupported languages are answered directly. The remaining
+        files go to the workers in chunks of chunk_size, with a bounded number
+        of chunks in flight, and results are yielded in input order. The pool
+        is only started once a first chunk is full, so small inputs are
+        extracted in-process; it is not used at all with max_workers=1, inside
+        daemonic processes (which cannot have children) or when it cannot be
+        started.
+        
+        Args:
+            items: Files, or objects describing them (see path_of)
+            path_of: Returns the file path of an item (default: the item is the path)
             
-            # Mapear por ruta relativa
-            if '/' in file_path:
-                module_name = file_path.replace('/', '.').replace('.py', '')
-                mapping[module_name] = file_path
+        Yields:
+            Tuples (item, imports as returned by extract_imports)
+        """
+        path_of = path_of or (lambda item: item)
+        cache = self.import_cache
+        use_pool = self.max_workers > 1 and not multiprocessing.current_process().daemon
+        executor = None
+        # Batches in input order: (items, results, misses as (index, cache key), future)
+        pending = deque()
+        batch_items, batch_results, misses = [], [], []
         
-        return mapping
+        def extract(chunk_items, chunk_misses):
+            return [self.extract_imports(path_of(chunk_items[index])) for index, _ in chunk_misses]
+        
+        def drain(limit: int):
+            while len(pending) > limit:
+                chunk_items, results, chunk_misses, future = pending.popleft()
+                if future is not None:
+                    try:
+                        extracted = future.result()
+                    except BrokenProcessPool as e:
+                        self.logger.warning(f"Import extraction process failed, extracting in-process: {e}")
+                        extracted = extract(chunk_items, chunk_misses)
+                else:
+                    extracted = extract(chunk_items, chunk_misses)
+                for (index, key), imports in zip(chunk_misses, extracted):
+                    results[index] = imports
+                    if cache is not None and key is not None and imports is not None:
+                        cache.store(self._full_path(path_of(chunk_items[index])), key, imports)
+                yield from zip(chunk_items, results)
+        
+        def flush():
+            nonlocal executor, use_pool
+            if misses and executor is None and use_pool and len(misses) >= self.chunk_size:
+                try:
+                    executor = ProcessPoolExecutor(max_workers=self.max_workers,
+                                                   initializer=_init_import_worker,
+                                                   initargs=(self.root_path,))
+                except (OSError, RuntimeError) as e:
+                    self.logger.warning(f"Process pool unavailable, extracting imports in-process: {e}")
+                    use_pool = False
+            future = None
+            if misses and executor is not None:
+                future = executor.submit(_extract_imports_chunk, [path_of(batch_items[index]) for index, _ in misses])
+            pending.append((batch_items, batch_results, misses, future))
+        
+        try:
+            for item in items:
+                file_path = path_of(item)
+                imports = None
+                if self._is_supported_file(file_path):
+                    key = None
+                    if cache is not None:
+                        cached, key = cache.lookup(self._full_path(file_path))
+                        imports = set(cached) if cached is not None else None
+                    if imports is None:
+                        misses.append((len(batch_items), key))
+                batch_items.append(item)
+                batch_results.append(imports)
+                
+                if len(misses) >= self.chunk_size or len(batch_items) >= self.chunk_size * 16:
+                    flush()
+                    batch_items, batch_results, misses = [], [], []
+                    yield from drain(self.max_workers * 2 if executor is not None else 0)
+            
+            if batch_items:
+                flush()
+            yield from drain(0)
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
+    
+    def _create_file_mapping(self, files: List[str]) -> ModuleIndex:
+        """
+        Crea el índice de módulos (trie de rutas e índice de sufijos) usado para resolver imports.
+        
+        Args:
+            files: Lista de archivos
+            
+        Returns:
+            ModuleIndex de los archivos
+        """
+        return ModuleIndex(files)
     
     def _extract_python_imports(self, file_path: str) -> Set[str]:
         """
@@ -147,7 +430,7 @@ class UnifiedDependencyAnalyzer:
         imports = set()
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
+            with open(self._full_path(file_path), 'r', encoding='utf-8') as f:
                 content = f.read()
             
             tree = ast.parse(content)
@@ -158,10 +441,9 @@ class UnifiedDependencyAnalyzer:
                         imports.add(alias.name)
                 elif isinstance(node, ast.ImportFrom):
                     if node.module:
-                        imports.add(node.module)
-                        # También añadir imports relativos
-                        if node.level > 0:
-                            imports.add('.' + node.module if node.module else '.')
+                        # Los imports relativos conservan sus puntos: el nombre sin
+                        # ellos se tomaría por una librería externa
+                        imports.add('.' * node.level + node.module)
                         
         except Exception as e:
             self.logger.warning(f"Error parsing Python file {file_path}: {e}")
@@ -170,7 +452,9 @@ class UnifiedDependencyAnalyzer:
     
     def _extract_js_imports(self, file_path: str) -> Set[str]:
         """
-        Extrae imports de archivo JavaScript.
+        Extrae imports de archivo JavaScript con un lexer de una sola pasada
+        (ver js_imports); los archivos minificados o generados se omiten tras
+        leer solo su comienzo.
         
         Args:
             file_path: Ruta del archivo JavaScript
@@ -181,19 +465,14 @@ class UnifiedDependencyAnalyzer:
         imports = set()
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            with open(self._full_path(file_path), 'r', encoding='utf-8') as f:
+                content = f.read(MINIFIED_SAMPLE_CHARS)
+                if looks_minified(content):
+                    self.logger.debug("Skipping minified JavaScript file %s", file_path)
+                    return imports
+                content += f.read()
             
-            # Regex para import statements
-            import_patterns = [
-                r"import.*from\s+['\"]([^'\"]+)['\"]",  # import ... from '...'
-                r"require\(['\"]([^'\"]+)['\"]\)",      # require('...')
-                r"import\(['\"]([^'\"]+)['\"]\)"        # import('...')
-            ]
-            
-            for pattern in import_patterns:
-                matches = re.findall(pattern, content, re.MULTILINE)
-                imports.update(matches)
+            imports = extract_js_imports(content)
                 
         except Exception as e:
             self.logger.warning(f"Error parsing JavaScript file {file_path}: {e}")
@@ -213,106 +492,156 @@ class UnifiedDependencyAnalyzer:
         # TypeScript usa misma sintaxis que JavaScript para imports
         return self._extract_js_imports(file_path)
     
-    def _add_imports_to_graph(self, graph: nx.DiGraph, file_path: str, imports: Set[str], file_mapping: Dict[str, str]):
+    def _add_imports_to_graph(self, graph: IndexedGraph, file_path: str, imports: Iterable[str],
+                              file_mapping: ModuleIndex):
         """
-        Añade imports al grafo de dependencias.
+        Establece las dependencias de un archivo a partir de sus imports
+        (reemplaza las aristas salientes que tuviera).
         
         Args:
             graph: Grafo de dependencias
             file_path: Archivo fuente
-            imports: Set de imports detectados
-            file_mapping: Mapeo de módulos a archivos
+            imports: Imports detectados
+            file_mapping: Índice de módulos
         """
-        # Añadir nodo fuente
-        graph.add_node(file_path)
-        
+        targets = {}
         for import_name in imports:
             # Buscar archivo correspondiente al import
             target_file = self._resolve_import(import_name, file_path, file_mapping)
             
-            if target_file and target_file != file_path:
-                graph.add_edge(file_path, target_file)
-                self.logger.debug(f"Added dependency: {file_path} -> {target_file}")
+            if target_file is None:
+                self.unresolved_imports.setdefault(file_path, set()).add(import_name)
+            elif target_file != file_path and target_file not in targets:
+                targets[target_file] = None
+                self.logger.debug("Added dependency: %s -> %s", file_path, target_file)
+        graph.set_successors(file_path, targets)
     
-    def _resolve_import(self, import_name: str, source_file: str, file_mapping: Dict[str, str]) -> Optional[str]:
+    def _resolve_import(self, import_name: str, source_file: str, file_mapping: ModuleIndex) -> Optional[str]:
         """
         Resolve an import to its corresponding file.
         
+        Lookups walk the module trie (longest prefix, nearest package first)
+        and fall back to the suffix index, so each import costs O(depth)
+        regardless of the number of files.
+        
         Args:
             import_name: Name of the import
             source_file: Source file of the import
-            file_mapping: Mapping of modules to files
+            file_mapping: Module index of the analyzed files
             
         Returns:
             Path of the target file or None
         """
-        # Direct search
-        if import_name in file_mapping:
-            return file_mapping[import_name]
-        
-        # Buscar por nombre parcial
-        for module_name, file_path in file_mapping.items():
-            if import_name in module_name or module_name in import_name:
-                return file_path
-        
-        # Buscar archivos relativos
-        if import_name.startswith('.'):
-            source_dir = Path(source_file).parent
-            relative_path = source_dir / (import_name.lstrip('.') + '.py')
-            if relative_path.exists():
-                return str(relative_path)
-        
-        return None
+        return file_mapping.resolve(import_name, source_file)
     
     def _detect_circular_dependencies(self) -> List[List[str]]:
         """
-        Detecta dependencias circulares.
+        Detecta dependencias circulares como componentes fuertemente conexas
+        (Tarjan, tiempo lineal) y elige un ciclo más corto representativo de cada una.
         
+        Las componentes quedan en self.cyclic_components; enumerar todos los
+        ciclos elementales (nx.simple_cycles) es exponencial en código enredado.
+            
         Returns:
-            Lista de ciclos detectados
+            Lista de ciclos detectados (uno por componente, de mayor a menor)
         """
+        graph = self.graph
         try:
-            cycles = list(nx.simple_cycles(self.graph))
-            # Filtrar ciclos triviales (self-loops)
-            meaningful_cycles = [list(cycle) for cycle in cycles if len(cycle) > 1]
-            
-            if meaningful_cycles:
-                self.logger.warning(f"⚠️  Detected {len(meaningful_cycles)} circular dependencies")
-            
-            return meaningful_cycles
+            self._cycles = {}
+            for component in graph.cyclic_components():
+                cycle = None
+                if self.find_cycle_examples:
+                    cycle = [graph.names[node] for node in graph.shortest_cycle(component)]
+                self._cycles[frozenset(graph.names[node] for node in component)] = cycle
         except Exception as e:
             self.logger.error(f"Error detecting circular dependencies: {e}")
-            return []
+            self._cycles = {}
+        return self._collect_cycles()
     
-    def _calculate_importance_scores(self) -> Dict[str, float]:
+    def _update_circular_dependencies(self, removed_nodes: Set[str], removed_edges: List[Tuple[str, str]],
+                                      added_edges: List[Tuple[str, str]]):
+        """
+        Actualiza las componentes cíclicas tras un cambio, recalculando solo
+        las que pueden haber cambiado (ver update_cyclic_components).
+        
+        Args:
+            removed_nodes: Archivos eliminados del grafo
+            removed_edges: Aristas eliminadas entre archivos que siguen en el grafo
+            added_edges: Aristas añadidas
+        """
+        try:
+            stale, fresh = update_cyclic_components(self.graph.successors, self.graph.predecessors,
+                                                    self._component_of, removed_nodes, removed_edges, added_edges)
+            for component in stale:
+                del self._cycles[component]
+            for component in fresh:
+                cycle = None
+                if self.find_cycle_examples:
+                    subgraph = IndexedGraph(((node, target) for node in component
+                                             for target in self.graph.successors(node) if target in component),
+                                            sorted(component))
+                    cycle = [subgraph.names[node] for node in subgraph.shortest_cycle(list(range(len(subgraph))))]
+                self._cycles[component] = cycle
+        except Exception as e:
+            self.logger.error(f"Error updating circular dependencies: {e}")
+            self._cycles = {}
+        self.circular_deps = self._collect_cycles()
+    
+    def _collect_cycles(self) -> List[List[str]]:
+        """
+        Ordena las componentes cíclicas conocidas (de mayor a menor) en
+        self.cyclic_components y devuelve sus ciclos representativos.
+        """
+        components = sorted(self._cycles, key=lambda component: (-len(component), min(component)))
+        self.cyclic_components = [sorted(component) for component in components]
+        self._component_of = {node: component for component in components for node in component}
+        if components:
+            self.logger.warning(f"⚠️  Detected {len(components)} circular dependency groups "
+                                f"({sum(map(len, components))} files)")
+        return [self._cycles[component] for component in components if self._cycles[component] is not None]
+    
+    def _calculate_importance_scores(self, start: Optional[np.ndarray] = None) -> Dict[str, float]:
         """
         Calcula scores de importancia basado en conexiones.
         
+        PageRank vectorizado sobre una representación CSR (mismos valores que
+        nx.pagerank), normalizado por el máximo; si no converge se usa la
+        centralidad de grado.
+        
+        Args:
+            start: Scores PageRank iniciales por nodo (p. ej. los del grafo antes de un cambio)
+            
         Returns:
             Diccionario archivo -> score de importancia
         """
-        if self.graph.number_of_nodes() == 0:
+        self._pagerank = None
+        graph = self.graph
+        if len(graph) == 0:
             return {}
         
         try:
-            # PageRank para importancia
-            pagerank = nx.pagerank(self.graph)
+            indptr, indices = graph.to_csr()
+            scores = pagerank(indptr, indices, start=start)
+            if scores is None:
+                self.logger.warning("PageRank did not converge, using degree centrality")
+                in_degree, out_degree = degree_centrality(indptr, indices)
+                return dict(zip(graph.names, (in_degree + out_degree).tolist()))
             
             # Normalizar scores
-            max_score = max(pagerank.values()) if pagerank else 1
-            normalized_scores = {
-                node: score / max_score for node, score in pagerank.items()
-            }
-            
-            return normalized_scores
+            self._pagerank = scores
+            return dict(zip(graph.names, (scores / scores.max()).tolist()))
             
         except Exception as e:
             self.logger.error(f"Error calculating importance scores: {e}")
-            # Fallback: degree centrality
-            try:
-                return nx.degree_centrality(self.graph)
-            except:
-                return {}
+            return {}
+    
+    def _full_path(self, file_path: str) -> str:
+        """Ruta en disco de un archivo, relativa a root_path si se indicó."""
+        return os.path.join(self.root_path, file_path) if self.root_path else file_path
+    
+    def _is_supported_file(self, file_path: str) -> bool:
+        """Verifica si se pueden extraer imports del archivo."""
+        return self._is_python_file(file_path) or self._is_javascript_file(file_path) or self._is_typescript_file(file_path)
     
     def _is_python_file(self, file_path: str) -> bool:
         """Verifica si es archivo Python."""
@@ -333,10 +662,12 @@ class UnifiedDependencyAnalyzer:
         Returns:
             Resumen con estadísticas clave
         """
+        indptr, indices = self.graph.to_csr()
+        degrees = np.diff(indptr) + np.bincount(indices, minlength=len(self.graph))
         return {
             'total_files': self.graph.number_of_nodes(),
             'total_dependencies': self.graph.number_of_edges(),
-            'circular_dependencies_count': len(self.circular_deps),
-            'isolated_files': len([n for n in self.graph.nodes() if self.graph.degree(n) == 0]),
-            'highly_connected_files': len([n for n in self.graph.nodes() if self.graph.degree(n) > 5])
+            'circular_dependencies_count': len(self.cyclic_components),
+            'isolated_files': int((degrees == 0).sum()),
+            'highly_connected_files': int((degrees > 5).sum())
         }
@@ -0,0 +1,160 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Per-file cache of FunctionalityDetector content hits.
+
+Keyword hits of a file depend only on the bytes the detector read from it,
+the compiled rules and the per-file byte budget. The cache stores, per file,
+its size and mtime, the number of bytes read and a digest of those bytes,
+plus the keywords found. On the next run:
+
+- a file whose size and mtime are unchanged reuses its hits without being
+  read at all;
+- a file whose mtime changed is re-read only up to the bytes used last time
+  and reuses its hits when the digest still matches (e.g. after a checkout);
+- any other file is scanned again.
+
+Each project has one cache file, keyed by the project path, stored under
+~/.project-prompt/detector-cache. The cache is discarded as a whole when the
+rules fingerprint or byte budget changes.
+"""
+
+import os
+import pickle
+import hashlib
+import logging
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+from .detector import ContentScan, content_digest
+
+logger = logging.getLogger(__name__)
+
+# Bump when the entry layout changes so stale caches are ignored
+DETECTION_CACHE_VERSION = 1
+
+# Directory holding per-project detection caches
+DEFAULT_CACHE_DIR = Path.home() / '.project-prompt' / 'detector-cache'
+
+# (size, mtime_ns, bytes_read, digest, keywords found)
+CacheEntry = Tuple[int, int, int, bytes, Tuple[str, ...]]
+
+
+class DetectionCache:
+    """On-disk cache of per-file keyword hits for one project."""
+
+    def __init__(self, project_path: Union[str, Path], fingerprint: str,
+                 cache_dir: Optional[Union[str, Path]] = None):
+        """
+        Initialize the cache of a project.
+
+        Args:
+            project_path: Project root the cached paths are relative to
+            fingerprint: Identifies the rules and byte budget the hits were computed with
+            cache_dir: Cache directory (default: ~/.project-prompt/detector-cache)
+        """
+        self.fingerprint = fingerprint
+        project_key = hashlib.sha256(os.path.abspath(str(project_path)).encode()).hexdigest()[:32]
+        self.cache_path = Path(cache_dir or DEFAULT_CACHE_DIR) / f"{project_key}.pickle"
+        self.entries: Dict[str, CacheEntry] = {}
+        self._seen: Dict[str, CacheEntry] = {}
+        self.hits = 0
+        self.misses = 0
+        self.load()
+
+    def load(self):
+        """Load entries from disk, ignoring caches built with other rules."""
+        try:
+            with open(self.cache_path, 'rb') as f:
+                data = pickle.load(f)
+            if (isinstance(data, dict) and data.get('version') == DETECTION_CACHE_VERSION
+                    and data.get('fingerprint') == self.fingerprint):
+                self.entries = data['entries']
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable detection cache {self.cache_path}: {e}")
+
+    def lookup(self, file_path: str, read_path: str) -> Optional[Tuple[Tuple[str, ...], int]]:
+        """
+        Return the cached keywords of a file if its content is unchanged.
+
+        Args:
+            file_path: Cache key (path relative to the project root)
+            read_path: Path to stat and, if needed, verify on disk
+
+        Returns:
+            Tuple (keywords found, file size), or None on a miss
+        """
+        entry = self.entries.get(file_path)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        size, mtime_ns, bytes_read, digest, keywords = entry
+        try:
+            stat = os.stat(read_path)
+        except OSError:
+            self.misses += 1
+            return None
+
+        if stat.st_size != size or stat.st_mtime_ns != mtime_ns:
+            if not self._verify(read_path, stat.st_size, size, bytes_read, digest):
+                self.misses += 1
+                return None
+            entry = (stat.st_size, stat.st_mtime_ns, bytes_read, digest, keywords)
+
+        self._seen[file_path] = entry
+        self.hits += 1
+        return keywords, stat.st_size
+
+    def store(self, file_path: str, scan: ContentScan):
+        """
+        Record the result of a fresh content scan.
+
+        Args:
+            file_path: Cache key (path relative to the project root)
+            scan: Result of scan_file_content
+        """
+        if not scan.digest:
+            # Unreadable files are scanned again next time
+            return
+        keywords = tuple(keyword for keywords in scan.hits.values() for keyword in keywords)
+        self._seen[file_path] = (scan.file_size, scan.mtime_ns, scan.bytes_read, scan.digest, keywords)
+
+    def save(self):
+        """Write the entries used in this run to disk, dropping the rest."""
+        self.entries = self._seen
+        self._seen = {}
+        data = {
+            'version': DETECTION_CACHE_VERSION,
+            'fingerprint': self.fingerprint,
+            'entries': self.entries,
+        }
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            logger.warning(f"Could not write detection cache {self.cache_path}: {e}")
+
+    @staticmethod
+    def _verify(read_path: str, new_size: int, size: int, bytes_read: int, digest: bytes) -> bool:
+        """Check that the bytes the cached scan depended on are unchanged."""
+        # A fully read file must keep its size; a partially read one must still cover the prefix
+        if bytes_read >= size:
+            if new_size != size:
+                return False
+        elif new_size < bytes_read:
+            return False
+
+        current = content_digest()
+        try:
+            with open(read_path, 'rb') as f:
+                current.update(f.read(bytes_read))
+        except OSError:
+            return False
+        return current.digest() == digest
@@ -9,7 +9,15 @@ Detects common project functionalities without complex configurations.
 
 import os
 import re
-from typing import Dict, List, Optional, Any
+import codecs
+import hashlib
+import logging
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import chain, islice
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Any, Tuple, TypeVar
 
 try:
     from models.project import FunctionalityDetection
@@ -17,95 +25,902 @@ except ImportError:
     # Fallback for direct execution
     from ..models.project import FunctionalityDetection
 
+from .scoring import HitMatrix
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
 # Simplified patterns for functionality detection
 SIMPLE_PATTERNS = {
     'authentication': {
         'files': ['auth', 'login', 'user', 'jwt', 'oauth', 'security'],
-        'keywords': ['authenticate', 'login', 'jwt', 'auth', 'password', 'token']
+        'keywords': ['authenticate', 'login', 'jwt', 'auth', 'password', 'token'],
+        'imports': ['jwt', 'jose', 'passlib', 'authlib', 'oauthlib', 'flask_login',
+                    'flask_jwt_extended', 'django.contrib.auth', 'passport', 'jsonwebtoken',
+                    'next-auth', '@auth0', 'firebase/auth']
     },
     'database': {
         'files': ['db', 'model', 'schema', 'migration', 'orm'],
-        'keywords': ['database', 'model', 'query', 'schema', 'table', 'collection']
+        'keywords': ['database', 'model', 'query', 'schema', 'table', 'collection'],
+        'imports': ['sqlalchemy', 'alembic', 'psycopg2', 'psycopg', 'pymongo', 'motor', 'sqlite3',
+                    'peewee', 'tortoise', 'django.db', 'mongoose', 'sequelize', 'typeorm',
+                    '@prisma/client', 'knex', 'pg', 'mysql', 'mysql2', 'mongodb']
     },
     'api': {
         'files': ['api', 'controller', 'route', 'endpoint', 'service'],
-        'keywords': ['api', 'endpoint', 'controller', 'route', 'rest', 'graphql']
+        'keywords': ['api', 'endpoint', 'controller', 'route', 'rest', 'graphql'],
+        'imports': ['fastapi', 'flask', 'starlette', 'rest_framework', 'aiohttp.web', 'falcon',
+                    'tornado.web', 'graphene', 'strawberry', 'grpc', 'express', 'koa', 'fastify',
+                    '@nestjs/common', 'apollo-server', '@apollo/server', 'graphql']
     },
     'frontend': {
         'files': ['component', 'view', 'page', 'ui', 'react', 'vue'],
-        'keywords': ['component', 'render', 'template', 'view', 'state', 'props']
+        'keywords': ['component', 'render', 'template', 'view', 'state', 'props'],
+        'imports': ['react', 'react-dom', 'vue', '@angular/core', 'svelte', 'next', 'nuxt',
+                    'jquery', 'solid-js', 'preact']
     },
     'testing': {
         'files': ['test', 'spec', '__tests__', 'cypress', 'jest'],
-        'keywords': ['test', 'spec', 'assert', 'expect', 'describe', 'it']
+        'keywords': ['test', 'spec', 'assert', 'expect', 'describe', 'it'],
+        'imports': ['pytest', 'unittest', 'nose', 'hypothesis', 'mock', 'jest', 'mocha', 'chai',
+                    'vitest', 'sinon', 'cypress', '@testing-library', '@playwright/test']
     },
     'configuration': {
         'files': ['config', 'settings', '.env', 'docker', 'compose'],
-        'keywords': ['config', 'environment', 'settings', 'docker', 'deploy']
+        'keywords': ['config', 'environment', 'settings', 'docker', 'deploy'],
+        'imports': ['configparser', 'dotenv', 'decouple', 'dynaconf', 'pydantic_settings',
+                    'tomllib', 'toml', 'yaml', 'config', 'convict']
     }
 }
 
-# Minimum confidence threshold
+# Descriptions of the built-in functionalities
+FUNCTIONALITY_DESCRIPTIONS = {
+    'authentication': 'User authentication and authorization features',
+    'database': 'Database operations and data modeling',
+    'api': 'API endpoints and web service functionality',
+    'frontend': 'User interface and frontend components',
+    'testing': 'Test suites and testing infrastructure',
+    'configuration': 'Configuration management and deployment setup'
+}
+
+# Minimum confidence threshold (sum of hit weights)
 CONFIDENCE_THRESHOLD = 2
 
+# Base weight of a file pattern hit, a content keyword hit and an imported library hit
+FILE_PATTERN_WEIGHT = 1.0
+KEYWORD_WEIGHT = 0.5
+IMPORT_WEIGHT = 1.0
+
+# Text file extensions whose content is scanned for keywords
+ANALYZABLE_EXTENSIONS = frozenset({
+    '.py', '.js', '.ts', '.jsx', '.tsx', '.java', '.cpp', '.c', '.cs',
+    '.php', '.rb', '.go', '.rs', '.swift', '.kt', '.scala',
+    '.html', '.css', '.scss', '.json', '.yaml', '.yml', '.toml',
+    '.md', '.txt', '.rst', '.sql', '.sh', '.bash'
+})
+
+# Raw score at which a functionality is saturated (full confidence in the legacy formula)
+SATURATION_SCORE = CONFIDENCE_THRESHOLD * 2
+
+# Files whose content is always scanned before stopping on saturation
+SATURATION_MIN_FILES = 200
+
+# Maximum bytes read from a single file when scanning for keywords
+DEFAULT_FILE_BYTE_BUDGET = 128 * 1024
+
+# Bytes read per step when scanning file content
+CONTENT_READ_SIZE = 16 * 1024
+
+# Files sent to a worker per task when content scanning runs in a process pool
+DEFAULT_CHUNK_SIZE = 200
+
+# Until this many files have needed a content scan, content is scanned
+# in-process to avoid paying process pool startup for small projects
+PARALLEL_MIN_FILES = 2000
+
+
+class KeywordMatcher:
+    """
+    Matches every functionality keyword in a single pass over the content.
+    
+    All keywords are compiled once into one word-bounded alternation regex,
+    so each file is scanned exactly once regardless of how many keywords
+    the patterns define.
+    """
+    
+    def __init__(self, patterns: Dict[str, Dict[str, List[str]]]):
+        """
+        Compile keywords from functionality patterns.
+        
+        Args:
+            patterns: Functionality patterns in SIMPLE_PATTERNS format
+        """
+        self.functionalities = list(patterns)
+        self.keyword_functionalities: Dict[str, List[str]] = {}
+        
+        for func_name, func_patterns in patterns.items():
+            for keyword in func_patterns.get('keywords', []):
+                owners = self.keyword_functionalities.setdefault(keyword.lower(), [])
+                if func_name not in owners:
+                    owners.append(func_name)
+        
+        # Longest keywords first so overlapping prefixes resolve cheaply
+        keywords = sorted(self.keyword_functionalities, key=lambda k: (-len(k), k))
+        self.max_keyword_length = len(keywords[0]) if keywords else 0
+        self.regex = None
+        if keywords:
+            alternation = '|'.join(re.escape(keyword) for keyword in keywords)
+            self.regex = re.compile(r'\b(?:' + alternation + r')\b', re.IGNORECASE)
+        
+        # Keyword order per functionality, used to report hits deterministically
+        self._keyword_order = {
+            func_name: [k.lower() for k in func_patterns.get('keywords', [])]
+            for func_name, func_patterns in patterns.items()
+        }
+    
+    def match(self, content: str) -> Dict[str, List[str]]:
+        """
+        Find which keywords of each functionality appear in the content.
+        
+        Args:
+            content: Text to scan
+            
+        Returns:
+            Dictionary functionality -> matched keywords (in pattern order)
+        """
+        if self.regex is None:
+            return {}
+        
+        found = set()
+        self.find(content, found)
+        return self.hits(found)
+    
+    def find(self, text: str, found: set, start: int = 0, final: bool = True) -> int:
+        """
+        Add the keywords occurring in text to found.
+        
+        Args:
+            text: Text to scan
+            found: Keywords found so far (updated in place)
+            start: Position to start matching at; earlier text only provides context
+            final: False when more text follows, so undecided matches near the end are deferred
+            
+        Returns:
+            Position a scan of the extended text must resume at (len(text) when final)
+        """
+        end = len(text)
+        # Without more text, matches may still change in the last max_keyword_length characters
+        resume = end if final else max(start, end - self.max_keyword_length)
+        total = len(self.keyword_functionalities)
+        if self.regex is None or len(found) == total:
+            return resume
+        
+        for match in self.regex.finditer(text, start):
+            if not final and match.end() == end:
+                # A word touching the end of a partial chunk may continue in the next one
+                resume = match.start()
+                break
+            found.add(match.group(0).lower())
+            resume = max(resume, match.end())
+            if len(found) == total:
+                break
+        return resume
+    
+    def hits(self, found: set) -> Dict[str, List[str]]:
+        """
+        Group found keywords by functionality.
+        
+        Args:
+            found: Keywords found
+            
+        Returns:
+            Dictionary functionality -> matched keywords (in pattern order)
+        """
+        hits = {}
+        for func_name, keywords in self._keyword_order.items():
+            matched = [keyword for keyword in keywords if keyword in found]
+            if matched:
+                hits[func_name] = matched
+        return hits
+
+
+class PathMatcher:
+    """
+    Matches every functionality file pattern in a single pass over a path.
+    
+    File patterns are plain substrings, except for two anchored forms used
+    for short or common words: '/name/' matches a whole path segment (a
+    directory, a file name, or a file name without its extension) and
+    '*.ext' matches the file extension. Substrings are compiled into one
+    lookahead alternation (longest first), which reports the longest pattern
+    starting at each position; patterns contained in that match are then
+    added from a precomputed containment table, so overlapping patterns are
+    not lost. Anchored patterns are looked up in tables.
+    
+    Directory parts are matched once and cached, since most paths of a
+    project share their parent directories.
+    """
+    
+    def __init__(self, patterns: Dict[str, Dict[str, List[str]]]):
+        """
+        Compile file patterns from functionality patterns.
+        
+        Args:
+            patterns: Functionality patterns in SIMPLE_PATTERNS format
+        """
+        self.pattern_functionalities: Dict[str, List[str]] = {}
+        
+        for func_name, func_patterns in patterns.items():
+            for pattern in func_patterns.get('files', []):
+                owners = self.pattern_functionalities.setdefault(pattern.lower(), [])
+                if func_name not in owners:
+                    owners.append(func_name)
+        
+        # Anchored patterns: segment name or extension -> pattern
+        self._segments: Dict[str, str] = {}
+        self._extensions: Dict[str, str] = {}
+        substrings = []
+        for pattern in self.pattern_functionalities:
+            if len(pattern) > 2 and pattern.startswith('/') and pattern.endswith('/'):
+                self._segments[pattern[1:-1]] = pattern
+            elif len(pattern) > 2 and pattern.startswith('*.'):
+                self._extensions[pattern[1:]] = pattern
+            else:
+                substrings.append(pattern)
+        substrings.sort(key=lambda p: (-len(p), p))
+        self.regex = None
+        if substrings:
+            alternation = '|'.join(re.escape(pattern) for pattern in substrings)
+            self.regex = re.compile(r'(?=(' + alternation + r'))')
+        
+        # pattern -> every pattern it contains (itself included)
+        self._contained = {
+            pattern: [other for other in substrings if other in pattern]
+            for pattern in substrings
+        }
+        
+        # Pattern order per functionality, used to report hits deterministically
+        self._pattern_order = {
+            func_name: [p.lower() for p in func_patterns.get('files', [])]
+            for func_name, func_patterns in patterns.items()
+        }
+        
+        # Splitting at '/' is only safe when no pattern spans a separator
+        self._split_paths = not any('/' in pattern for pattern in substrings)
+        self._directory_cache: Dict[str, frozenset] = {}
+        self._hits_cache: Dict[frozenset, Dict[str, List[str]]] = {frozenset(): {}}
+    
+    def match(self, lowered_path: str) -> Dict[str, List[str]]:
+        """
+        Find which file patterns of each functionality appear in a path.
+        
+        Args:
+            lowered_path: File path, already lowercased
+            
+        Returns:
+            Dictionary functionality -> matched patterns (in pattern order).
+            The returned dictionary is shared and must not be modified.
+        """
+        if not self.pattern_functionalities:
+            return {}
+        
+        directory, separator, name = lowered_path.rpartition('/')
+        found = self._find_name(name)
+        if separator:
+            directory_found = self._directory_cache.get(directory)
+            if directory_found is None:
+                directory_found = self._find_segments(directory.split('/'))
+                if self._split_paths:
+                    directory_found |= self._find(directory)
+                self._directory_cache[directory] = directory_found
+            found |= directory_found
+            if not self._split_paths:
+                found |= self._find(lowered_path)
+        
+        hits = self._hits_cache.get(found)
+        if hits is None:
+            hits = {}
+            for func_name, func_patterns in self._pattern_order.items():
+                matched = [pattern for pattern in func_patterns if pattern in found]
+                if matched:
+                    hits[func_name] = matched
+            self._hits_cache[found] = hits
+        return hits
+    
+    def _find(self, text: str) -> frozenset:
+        """Return the set of substring patterns occurring in text."""
+        if self.regex is None:
+            return frozenset()
+        matches = self.regex.findall(text)
+        if not matches:
+            return frozenset()
+        return frozenset(chain.from_iterable(map(self._contained.__getitem__, matches)))
+    
+    def _find_segments(self, segments: Iterable[str]) -> frozenset:
+        """Return the set of segment patterns equal to one of segments."""
+        if not self._segments:
+            return frozenset()
+        return frozenset(self._segments[segment] for segment in segments if segment in self._segments)
+    
+    def _find_name(self, name: str) -> frozenset:
+        """Return the set of patterns matching a file name."""
+        stem, extension = os.path.splitext(name)
+        found = self._find(name) | self._find_segments((name, stem))
+        if extension in self._extensions:
+            found |= {self._extensions[extension]}
+        return found
+
+
+class ImportMatcher:
+    """
+    Maps imported modules to functionalities through a library table.
+    
+    Library names are matched against every dotted or slashed prefix of an
+    import, so 'sqlalchemy.orm' matches 'sqlalchemy' and '@nestjs/common/x'
+    matches '@nestjs/common'. Relative imports never match.
+    """
+    
+    def __init__(self, patterns: Dict[str, Dict[str, List[str]]]):
+        """
+        Build the library table from functionality patterns.
+        
+        Args:
+            patterns: Functionality patterns in SIMPLE_PATTERNS format
+        """
+        self.library_functionalities: Dict[str, List[str]] = {}
+        
+        for func_name, func_patterns in patterns.items():
+            for library in func_patterns.get('imports', []):
+                owners = self.library_functionalities.setdefault(library.lower(), [])
+                if func_name not in owners:
+                    owners.append(func_name)
+        
+        # Library order per functionality, used to report hits deterministically
+        self._library_order = {
+            func_name: [library.lower() for library in func_patterns.get('imports', [])]
+            for func_name, func_patterns in patterns.items()
+        }
+        self._import_cache: Dict[str, tuple] = {}
+    
+    def match(self, imports: Iterable[str]) -> Dict[str, List[str]]:
+        """
+        Find which libraries of each functionality a file imports.
+        
+        Args:
+            imports: Module names imported by the file
+            
+        Returns:
+            Dictionary functionality -> imported libraries (in pattern order)
+        """
+        found = set()
+        for import_name in imports:
+            libraries = self._import_cache.get(import_name)
+            if libraries is None:
+                libraries = tuple(library for library in self._prefixes(import_name)
+                                  if library in self.library_functionalities)
+                self._import_cache[import_name] = libraries
+            found.update(libraries)
+        
+        hits = {}
+        if found:
+            for func_name, libraries in self._library_order.items():
+                matched = [library for library in libraries if library in found]
+                if matched:
+                    hits[func_name] = matched
+        return hits
+    
+    @staticmethod
+    def _prefixes(import_name: str) -> List[str]:
+        """Return the import and each of its dotted or slashed prefixes."""
+        name = import_name.strip().lower()
+        if not name or name.startswith(('.', '/')):
+            return []
+        if name.startswith('node:'):
+            name = name[5:]
+        
+        prefixes = [name]
+        for index in range(len(name) - 1, 0, -1):
+            if name[index] in './':
+                prefixes.append(name[:index])
+        return prefixes
+
+
+class ContentScan(NamedTuple):
+    """Result of scanning one file's content."""
+    hits: Dict[str, List[str]]
+    bytes_read: int
+    file_size: int
+    mtime_ns: int = 0
+    digest: bytes = b''
+
+
+def content_digest() -> Any:
+    """Return the hash object used to fingerprint scanned content."""
+    return hashlib.blake2b(digest_size=16)
+
+
+def scan_file_content(file_path: str, keyword_matcher: KeywordMatcher,
+                      byte_budget: int = DEFAULT_FILE_BYTE_BUDGET) -> ContentScan:
+    """
+    Read a file incrementally and match its content against the keyword matcher.
+    
+    Reading stops as soon as every keyword has been found or byte_budget
+    bytes have been read, so most files are only partially read.
+    
+    Args:
+        file_path: File to scan
+        keyword_matcher: Compiled keyword matcher
+        byte_budget: Maximum bytes to read from the file
+        
+    Returns:
+        ContentScan with the hits (functionality -> matched keywords), the
+        bytes read, the file size and mtime, and a digest of the bytes read.
+        Hits are empty on read errors.
+    """
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return ContentScan({}, 0, 0)
+    file_size = stat.st_size
+    
+    found = set()
+    bytes_read = 0
+    digest = content_digest()
+    total = len(keyword_matcher.keyword_functionalities)
+    try:
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='ignore')
+        carry = ''
+        start = 0
+        with open(file_path, 'rb') as f:
+            while True:
+                data = f.read(min(CONTENT_READ_SIZE, byte_budget - bytes_read))
+                bytes_read += len(data)
+                digest.update(data)
+                final = not data or bytes_read >= byte_budget or bytes_read >= file_size
+                text = carry + decoder.decode(data, final)
+                resume = keyword_matcher.find(text, found, start, final)
+                if final or len(found) == total:
+                    break
+                # Carry the undecided tail, plus one character of word boundary context
+                start = 1 if resume else 0
+                carry = text[resume - start:]
+    except Exception:
+        # Ignore read errors
+        return ContentScan({}, bytes_read, file_size)
+    
+    return ContentScan(keyword_matcher.hits(found), bytes_read, file_size,
+                       stat.st_mtime_ns, digest.digest())
+
+
+# Keyword matcher and per-file budget of a content scanning worker process
+_worker_keyword_matcher: Optional[KeywordMatcher] = None
+_worker_byte_budget: int = DEFAULT_FILE_BYTE_BUDGET
+
+
+def _init_content_worker(keyword_matcher: KeywordMatcher, byte_budget: int):
+    """Install the keyword matcher and byte budget once per worker process."""
+    global _worker_keyword_matcher, _worker_byte_budget
+    _worker_keyword_matcher = keyword_matcher
+    _worker_byte_budget = byte_budget
+
+
+def _scan_content_chunk(file_paths: List[str]) -> List[ContentScan]:
+    """Scan a chunk of files in a worker process, preserving input order."""
+    return [scan_file_content(file_path, _worker_keyword_matcher, _worker_byte_budget)
+            for file_path in file_paths]
+
+
+class FileSignals(NamedTuple):
+    """Functionality signals found for one file."""
+    path_hits: Dict[str, List[str]]
+    library_hits: Optional[Dict[str, List[str]]] = None
+    keyword_hits: Optional[Dict[str, List[str]]] = None
+
+
+class DetectionSession:
+    """
+    One functionality detection run, fed file by file.
+    
+    iter_match() computes the signals of a stream of files (path patterns,
+    imported libraries and, when needed, content keywords within the byte
+    budgets, possibly read in a process pool) and may run on a different
+    thread than add(), which records them in the hit matrix. finish() scores
+    the project.
+    """
+    
+    def __init__(self, detector: 'FunctionalityDetector', root_path: Optional[str] = None,
+                 cache: Optional[Any] = None):
+        """
+        Initialize an empty run.
+        
+        Args:
+            detector: Detector providing rules, matchers and budgets
+            root_path: Directory that relative file paths are read from (default: cwd)
+            cache: DetectionCache supplying keyword hits of unchanged files
+        """
+        self.detector = detector
+        self.root_path = root_path
+        self.cache = cache
+        
+        # Every signal is recorded as a files x features hit; scores come from the matrix
+        self.matrix = HitMatrix(list(detector.patterns))
+        # Evidence and patterns are insertion-ordered sets (dict keys)
+        self.evidence: Dict[str, Dict[str, None]] = {name: {} for name in detector.patterns}
+        self.patterns_matched: Dict[str, Dict[str, None]] = {name: {} for name in detector.patterns}
+        self._path_features: Dict[int, Tuple[int, ...]] = {}
+        
+        self.stats: Dict[str, Any] = {
+            'files_scanned': 0,
+            'files_cached': 0,
+            'files_partially_read': 0,
+            'files_skipped': 0,
+            'bytes_read': 0,
+            'bytes_total': 0,
+            'bytes_saved': 0,
+            'stop_reason': None,
+        }
+        self._files_seen = 0
+        self._scores: Optional[Dict[str, float]] = None
+        self._unsaturated: set = set()
+    
+    def iter_match(self, items: Iterable[Tuple[T, Optional[Iterable[str]]]],
+                   path_of: Optional[Callable[[T], str]] = None
+                   ) -> Iterator[Tuple[T, Optional[Iterable[str]], FileSignals]]:
+        """
+        Compute the signals of a stream of files, reading content only when needed.
+        
+        Path patterns and imported libraries are matched as files arrive.
+        Analyzable files without imports have their content scanned within
+        the byte budgets: unchanged files take their keyword hits from the
+        cache, and the others are read in chunks of chunk_size across a
+        process pool, with a bounded number of chunks in flight. The pool is
+        only started once parallel_min_files files have needed a scan, so
+        small projects are scanned in-process; it is not used with workers=1,
+        inside daemonic processes (which cannot have children) or when it
+        cannot be started. Results are consumed in input order, so the stop
+        conditions apply as in a sequential scan: once the run byte budget is
+        spent or every signal is saturated, later files get no keyword hits.
+        
+        Args:
+            items: Tuples (file, imported modules or None, if a dependency pass extracted them)
+            path_of: Returns the file path (relative to root_path) of a file (default: the file is the path)
+            
+        Yields:
+            Tuples (file, imports, FileSignals for add()), in input order
+        """
+        detector = self.detector
+        path_of = path_of or (lambda item: item)
+        if self._scores is None and detector.stop_when_saturated:
+            self._scores = dict.fromkeys(detector.patterns, 0.0)
+        use_pool = detector.workers > 1 and not multiprocessing.current_process().daemon
+        executor = None
+        scans_needed = 0
+        # Batches in input order: (entries, misses as (index, read path), future)
+        pending = deque()
+        batch, misses = [], []
+        
+        def scan(read_paths):
+            return [scan_file_content(read_path, detector.keyword_matcher, detector.file_byte_budget)
+                    for read_path in read_paths]
+        
+        def drain(limit: int):
+            while len(pending) > limit:
+                entries, chunk_misses, future = pending.popleft()
+                read_paths = [read_path for _, read_path in chunk_misses]
+                if future is not None:
+                    try:
+                        results = future.result()
+                    except BrokenProcessPool as e:
+                        logger.warning(f"Content scanning process failed, scanning in-process: {e}")
+                        results = scan(read_paths)
+                else:
+                    results = scan(read_paths)
+                scans = dict(zip((index for index, _ in chunk_misses), results))
+                for index, (item, imports, file_path, path_hits, library_hits, read_path, entry) in enumerate(entries):
+                    yield item, imports, self._signals(file_path, path_hits, library_hits, read_path,
+                                                       entry, scans.get(index))
+        
+        def flush():
+            nonlocal executor, use_pool
+            if misses and executor is None and use_pool and scans_needed >= detector.parallel_min_files:
+                try:
+                    executor = ProcessPoolExecutor(max_workers=detector.workers,
+                                                   initializer=_init_content_worker,
+                                                   initargs=(detector.keyword_matcher, detector.file_byte_budget))
+                except (OSError, RuntimeError) as e:
+                    logger.warning(f"Process pool unavailable, scanning content in-process: {e}")
+                    use_pool = False
+            future = None
+            if misses and executor is not None:
+                future = executor.submit(_scan_content_chunk, [read_path for _, read_path in misses])
+            pending.append((batch, misses, future))
+        
+        try:
+            for item, imports in items:
+                file_path = path_of(item)
+                # The file name is part of the path, so one lowered path covers both
+                path_hits = detector.path_matcher.match(file_path.lower())
+                library_hits = detector.import_matcher.match(imports) if imports else None
+                
+                # Imported libraries are precise signals and replace content scanning
+                read_path = entry = None
+                if library_hits is None and detector._is_analyzable_file(file_path):
+                    read_path = self._read_path(file_path)
+                    if self.stats['stop_reason'] is None:
+                        if self.cache is not None:
+                            entry = self.cache.lookup(file_path, read_path)
+                        if entry is None:
+                            misses.append((len(batch), read_path))
+                            scans_needed += 1
+                batch.append((item, imports, file_path, path_hits, library_hits, read_path, entry))
+                
+                if len(misses) >= detector.chunk_size or len(batch) >= detector.chunk_size * 16:
+                    flush()
+                    batch, misses = [], []
+                    yield from drain(detector.workers * 2 if executor is not None else 0)
+            
+            if batch:
+                flush()
+            yield from drain(0)
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
+    
+    def _signals(self, file_path: str, path_hits: Dict[str, List[str]],
+                 library_hits: Optional[Dict[str, List[str]]], read_path: Optional[str],
+                 entry: Optional[Tuple[Tuple[str, ...], int]], scan: Optional[ContentScan]) -> FileSignals:
+        """Account for one file in input order and return its signals."""
+        if self._scores is not None:
+            self._track(path_hits, FILE_PATTERN_WEIGHT)
+            self._track(library_hits or {}, IMPORT_WEIGHT)
+        
+        keyword_hits = None
+        if read_path is not None:
+            if self.stats['stop_reason'] is not None:
+                keyword_hits = self._skip(read_path)
+            elif entry is not None:
+                keyword_hits = self._cached(entry)
+            else:
+                keyword_hits = self._scanned(file_path, scan)
+            self._check_stop()
+        return FileSignals(path_hits, library_hits, keyword_hits)
+    
+    def add(self, file_path: str, signals: FileSignals):
+        """
+        Record the signals of one file.
+        
+        Args:
+            file_path: File path
+            signals: Result of match() (or of a batch scan)
+        """
+        matrix = self.matrix
+        evidence = self.evidence
+        patterns_matched = self.patterns_matched
+        path_hits, library_hits, keyword_hits = signals
+        
+        for func_name in path_hits:
+            evidence[func_name][file_path] = None
+        
+        # Hit dictionaries are shared, so their features and patterns are recorded once each
+        features = self._path_features.get(id(path_hits))
+        if features is None:
+            features = matrix.feature_ids(path_hits, 'file', FILE_PATTERN_WEIGHT)
+            self._path_features[id(path_hits)] = features
+            for func_name, patterns in path_hits.items():
+                for pattern in patterns:
+                    patterns_matched[func_name][f"file:{pattern}"] = None
+        
+        # Record imported libraries
+        if library_hits:
+            features += matrix.feature_ids(library_hits, 'import', IMPORT_WEIGHT)
+            for func_name, libraries in library_hits.items():
+                evidence[func_name][file_path] = None
+                for library in libraries:
+                    patterns_matched[func_name][f"import:{library}"] = None
+        
+        # Record content keywords
+        if keyword_hits:
+            features += matrix.feature_ids(keyword_hits, 'keyword', KEYWORD_WEIGHT)
+            for func_name, keywords in keyword_hits.items():
+                evidence[func_name][file_path] = None
+                for keyword in keywords:
+                    patterns_matched[func_name][f"keyword:{keyword}"] = None
+        
+        matrix.add_file(file_path, features)
+    
+    def finish(self) -> List[FunctionalityDetection]:
+        """
+        Score the recorded files.
+        
+        The hit matrix, evidence and content scanning statistics are also
+        stored on the detector (hit_matrix, evidence, patterns_matched,
+        scan_stats).
+        
+        Returns:
+            List of detected functionalities
+        """
+        detector = self.detector
+        self.stats['bytes_saved'] = self.stats['bytes_total'] - self.stats['bytes_read']
+        detector.hit_matrix = self.matrix
+        detector.evidence = self.evidence
+        detector.patterns_matched = self.patterns_matched
+        detector.scan_stats = self.stats
+        return detector.detections(self.matrix, self.evidence, self.patterns_matched)
+    
+    def _read_path(self, file_path: str) -> str:
+        """Return the on-disk path of a file."""
+        return os.path.join(self.root_path, file_path) if self.root_path else file_path
+    
+    def _cached(self, entry: Tuple[Tuple[str, ...], int]) -> Dict[str, List[str]]:
+        """Account for a cache hit and return its keyword hits."""
+        keywords, file_size = entry
+        self.stats['files_cached'] += 1
+        self.stats['bytes_total'] += file_size
+        hits = self.detector.keyword_matcher.hits(set(keywords))
+        self._track_content(hits)
+        return hits
+    
+    def _scanned(self, file_path: str, scan: ContentScan) -> Dict[str, List[str]]:
+        """Account for a fresh content scan, cache it and return its keyword hits."""
+        stats = self.stats
+        stats['files_scanned'] += 1
+        stats['bytes_read'] += scan.bytes_read
+        stats['bytes_total'] += scan.file_size
+        if scan.bytes_read < scan.file_size:
+            stats['files_partially_read'] += 1
+        if self.cache is not None:
+            self.cache.store(file_path, scan)
+        self._track_content(scan.hits)
+        return scan.hits
+    
+    def _skip(self, read_path: str) -> Dict[str, List[str]]:
+        """Account for a file left unscanned after an early stop."""
+        self.stats['files_skipped'] += 1
+        try:
+            self.stats['bytes_total'] += os.path.getsize(read_path)
+        except OSError:
+            pass
+        return {}
+    
+    def _track(self, hits: Dict[str, List[str]], weight: float):
+        """Add signal weights to the running saturation scores."""
+        scores = self._scores
+        for func_name, values in hits.items():
+            scores[func_name] += weight * len(values)
+            if scores[func_name] < SATURATION_SCORE:
+                self._unsaturated.add(func_name)
+            else:
+                self._unsaturated.discard(func_name)
+    
+    def _track_content(self, hits: Dict[str, List[str]]):
+        """Count a content scan towards the stop conditions."""
+        self._files_seen += 1
+        if self._scores is not None:
+            self._track(hits, KEYWORD_WEIGHT)
+    
+    def _check_stop(self) -> bool:
+        """Stop content scanning once the run budget is spent or every signal is saturated."""
+        if self.stats['stop_reason'] is None:
+            run_byte_budget = self.detector.run_byte_budget
+            if (self._scores is not None and not self._unsaturated
+                    and self._files_seen >= SATURATION_MIN_FILES):
+                self.stats['stop_reason'] = 'saturated'
+            elif run_byte_budget is not None and self.stats['bytes_read'] >= run_byte_budget:
+                self.stats['stop_reason'] = 'run_byte_budget'
+        return self.stats['stop_reason'] is not None
+
 
 class FunctionalityDetector:
     """Simplified detector for common functionalities."""
     
-    def __init__(self):
-        """Initialize detector."""
+    def __init__(self, rules: Optional[Any] = None, workers: Optional[int] = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE, parallel_min_files: int = PARALLEL_MIN_FILES,
+                 file_byte_budget: int = DEFAULT_FILE_BYTE_BUDGET, run_byte_budget: Optional[int] = None,
+                 stop_when_saturated: bool = False):
+        """
+        Initialize detector.
+        
+        Args:
+            rules: Compiled rules from rule_packs.load_rules (default: built-in SIMPLE_PATTERNS)
+            workers: Worker processes for content scanning (default: CPU count, 1 disables the pool)
+            chunk_size: Files sent to a worker per task
+            parallel_min_files: Content scans needed before the process pool is started
+            file_byte_budget: Maximum bytes read from a single file
+            run_byte_budget: Maximum bytes read per detection run (None for unlimited)
+            stop_when_saturated: Stop content scanning once every functionality is saturated
+        """
         self.results = {}
+        self.hit_matrix: Optional[HitMatrix] = None
+        self.evidence: Dict[str, Dict[str, None]] = {}
+        self.patterns_matched: Dict[str, Dict[str, None]] = {}
+        self.scan_stats: Dict[str, Any] = {}
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = max(1, chunk_size)
+        self.parallel_min_files = parallel_min_files
+        self.file_byte_budget = file_byte_budget
+        self.run_byte_budget = run_byte_budget
+        self.stop_when_saturated = stop_when_saturated
+        
+        if rules is not None:
+            self.patterns = rules.patterns
+            self.descriptions = rules.descriptions
+            self.keyword_matcher = rules.keyword_matcher
+            self.path_matcher = rules.path_matcher
+            self.import_matcher = rules.import_matcher
+        else:
+            self.patterns = SIMPLE_PATTERNS
+            self.descriptions = FUNCTIONALITY_DESCRIPTIONS
+            self.keyword_matcher = KeywordMatcher(SIMPLE_PATTERNS)
+            self.path_matcher = PathMatcher(SIMPLE_PATTERNS)
+            self.import_matcher = ImportMatcher(SIMPLE_PATTERNS)
     
-    def detect_functionalities(self, file_paths: List[str]) -> List[FunctionalityDetection]:
+    def session(self, root_path: Optional[str] = None, cache: Optional[Any] = None) -> 'DetectionSession':
+        """
+        Start an incremental detection run.
+        
+        Args:
+            root_path: Directory that relative file paths are read from (default: cwd)
+            cache: DetectionCache supplying keyword hits of unchanged files
+            
+        Returns:
+            DetectionSession that files are fed into one at a time
+        """
+        return DetectionSession(self, root_path, cache)
+    
+    def detect_functionalities(self, file_paths: List[str], root_path: Optional[str] = None,
+                               file_imports: Optional[Dict[str, Iterable[str]]] = None,
+                               cache: Optional[Any] = None) -> List[FunctionalityDetection]:
         """
         Detect functionalities in the project.
         
+        Files with known imports (e.g. UnifiedDependencyAnalyzer.file_imports)
+        are scored from the libraries they import; only analyzable files
+        without imports have their content scanned for keywords. Content
+        scanning statistics (bytes read and saved) are stored in self.scan_stats.
+        
         Args:
             file_paths: List of file paths to analyze
+            root_path: Directory that relative file paths are read from (default: cwd)
+            file_imports: Imported module names per file path, from a dependency pass
+            cache: DetectionCache supplying keyword hits of unchanged files
             
         Returns:
             List of detected functionalities
         """
-        scores = {}
-        evidence = {}
-        patterns_matched = {}
+        session = self.session(root_path, cache)
+        file_imports = file_imports or {}
+        items = ((file_path, file_imports.get(file_path) or None) for file_path in file_paths)
+        for file_path, _, signals in session.iter_match(items):
+            session.add(file_path, signals)
         
-        # Initialize scores
-        for functionality in SIMPLE_PATTERNS:
-            scores[functionality] = 0
-            evidence[functionality] = []
-            patterns_matched[functionality] = []
+        return session.finish()
+    
+    def detections(self, matrix: HitMatrix, evidence: Dict[str, Iterable[str]],
+                   patterns_matched: Dict[str, Iterable[str]]) -> List[FunctionalityDetection]:
+        """
+        Score a hit matrix and return the functionalities above the threshold.
         
-        # Analyze file paths and names
-        for file_path in file_paths:
-            file_name = os.path.basename(file_path)
-            
-            # Check file names and paths
-            for func_name, patterns in SIMPLE_PATTERNS.items():
-                for pattern in patterns['files']:
-                    if pattern.lower() in file_path.lower() or pattern.lower() in file_name.lower():
-                        scores[func_name] += 1
-                        if file_path not in evidence[func_name]:
-                            evidence[func_name].append(file_path)
-                        if pattern not in patterns_matched[func_name]:
-                            patterns_matched[func_name].append(f"file:{pattern}")
+        Args:
+            matrix: Hit matrix of a detection run (or of merged runs)
+            evidence: Files supporting each functionality, in order of discovery
+            patterns_matched: Patterns matched for each functionality
             
-            # Analyze file content for important files
-            if self._is_analyzable_file(file_path):
-                self._analyze_file_content(file_path, scores, evidence, patterns_matched)
+        Returns:
+            List of detected functionalities
+        """
+        scores = matrix.score()
         
         # Convert to FunctionalityDetection objects
         detected_functionalities = []
-        for functionality, score in scores.items():
-            if score >= CONFIDENCE_THRESHOLD:
-                confidence = min(1.0, score / (CONFIDENCE_THRESHOLD * 2))
-                
+        for index, functionality in enumerate(matrix.functionalities):
+            if scores.raw[index] >= CONFIDENCE_THRESHOLD:
                 detection = FunctionalityDetection(
                     name=functionality,
-                    confidence=confidence,
+                    confidence=round(float(scores.confidence[index]), 4),
                     description=self._get_functionality_description(functionality),
-                    evidence_files=evidence[functionality][:5],  # Limit to top 5
-                    patterns_matched=patterns_matched[functionality]
+                    evidence_files=list(islice(evidence.get(functionality, ()), 5)),  # Limit to top 5
+                    patterns_matched=list(patterns_matched.get(functionality, ()))
                 )
                 detected_functionalities.append(detection)
         
@@ -114,54 +929,12 @@ class FunctionalityDetector:
     def _is_analyzable_file(self, file_path: str) -> bool:
         """Check if file should be analyzed for content."""
         # Only analyze text files, avoid binary and large files
-        analyzable_extensions = {
-            '.py', '.js', '.ts', '.jsx', '.tsx', '.java', '.cpp', '.c', '.cs',
-            '.php', '.rb', '.go', '.rs', '.swift', '.kt', '.scala',
-            '.html', '.css', '.scss', '.json', '.yaml', '.yml', '.toml',
-            '.md', '.txt', '.rst', '.sql', '.sh', '.bash'
-        }
-        
         ext = os.path.splitext(file_path)[1].lower()
-        return ext in analyzable_extensions
-    
-    def _analyze_file_content(self, file_path: str, scores: dict, evidence: dict, patterns_matched: dict):
-        """Analyze file content for keywords."""
-        try:
-            if not os.path.exists(file_path):
-                return
-                
-            # Check file size to avoid processing huge files
-            if os.path.getsize(file_path) > 1024 * 1024:  # 1MB limit
-                return
-            
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-            
-            # Check keywords in content
-            for func_name, patterns in SIMPLE_PATTERNS.items():
-                for keyword in patterns['keywords']:
-                    if re.search(r'\b' + re.escape(keyword) + r'\b', content, re.IGNORECASE):
-                        scores[func_name] += 0.5
-                        if file_path not in evidence[func_name]:
-                            evidence[func_name].append(file_path)
-                        pattern_key = f"keyword:{keyword}"
-                        if pattern_key not in patterns_matched[func_name]:
-                            patterns_matched[func_name].append(pattern_key)
-        except:
-            # Ignore read errors
-            pass
+        return ext in ANALYZABLE_EXTENSIONS
     
     def _get_functionality_description(self, functionality: str) -> str:
         """Get description for functionality."""
-        descriptions = {
-            'authentication': 'User authentication and authorization features',
-            'database': 'Database operations and data modeling',
-            'api': 'API endpoints and web service functionality',
-            'frontend': 'User interface and frontend components',
-            'testing': 'Test suites and testing infrastructure',
-            'configuration': 'Configuration management and deployment setup'
-        }
-        return descriptions.get(functionality, f'{functionality.title()} functionality')
+        return self.descriptions.get(functionality, f'{functionality.title()} functionality')
     
     def get_functionality_summary(self) -> str:
         """Generate summary of detected functionalities."""
@@ -0,0 +1,418 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Linear-time algorithms on file dependency graphs.
+
+Graphs are handled as integer adjacency lists (node i -> successors of i)
+built once from the edge list, which is several times faster than walking
+a networkx graph and keeps memory proportional to the number of edges.
+IndexedGraph is also the container the dependency analyzer builds and
+updates, so networkx is only imported by callers that ask for a networkx
+copy (IndexedGraph.to_networkx).
+
+Circular dependencies are reported as strongly connected components
+(iterative Tarjan, O(V + E)): every file in a component can reach every
+other, and the components do not depend on how cycles are enumerated.
+Enumerating elementary cycles instead (nx.simple_cycles) is exponential on
+tangled code and can hang an analysis. For readability each component also
+gets one representative shortest cycle, found by breadth-first searches
+restricted to the component from a bounded number of start nodes.
+
+Importance scores use a compressed sparse row (CSR) copy of the adjacency
+in NumPy arrays: PageRank is a vectorized power iteration (one bincount
+over the edge array per step) matching nx.pagerank, without networkx or
+scipy, and handles a million edges in a fraction of a second.
+
+For incremental analysis the indexed graph can be patched in place, the
+components are recomputed only around changed edges
+(update_cyclic_components) and PageRank is warm-started from the previous
+scores, which typically converges in a few iterations after a small change.
+"""
+
+from collections import deque
+from typing import Any, Callable, Dict, FrozenSet, Iterable, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+
+# Start nodes searched for the representative cycle of a component
+DEFAULT_CYCLE_STARTS = 8
+
+# PageRank parameters (the nx.pagerank defaults)
+PAGERANK_ALPHA = 0.85
+PAGERANK_MAX_ITER = 100
+PAGERANK_TOL = 1.0e-6
+
+
+class IndexedGraph:
+    """Directed graph with integer node ids and adjacency lists."""
+
+    def __init__(self, edges: Iterable[Tuple[str, str]], nodes: Iterable[str] = ()):
+        """
+        Index a graph.
+
+        Args:
+            edges: (source, target) pairs
+            nodes: Additional nodes (e.g. files without dependencies)
+        """
+        self.ids: Dict[str, int] = {}
+        self.names: List[str] = []
+        self.adjacency: List[List[int]] = []
+        # Predecessor lists, built on first use and dropped on every change
+        self._reverse: Optional[List[List[int]]] = None
+        for node in nodes:
+            self._id(node)
+        for source, target in edges:
+            self.adjacency[self._id(source)].append(self._id(target))
+
+    def _id(self, node: str) -> int:
+        node_id = self.ids.get(node)
+        if node_id is None:
+            node_id = self.ids[node] = len(self.names)
+            self.names.append(node)
+            self.adjacency.append([])
+            self._reverse = None
+        return node_id
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, node: str) -> bool:
+        return node in self.ids
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.names)
+
+    def add_node(self, node: str):
+        """Add a node without edges (no-op if it exists)."""
+        self._id(node)
+
+    def nodes(self) -> List[str]:
+        """Node names in id order."""
+        return list(self.names)
+
+    def edges(self) -> Iterator[Tuple[str, str]]:
+        """(source, target) pairs, grouped by source in id order."""
+        names = self.names
+        for node_id, successors in enumerate(self.adjacency):
+            for target in successors:
+                yield names[node_id], names[target]
+
+    def number_of_nodes(self) -> int:
+        return len(self.names)
+
+    def number_of_edges(self) -> int:
+        return sum(map(len, self.adjacency))
+
+    def successors(self, node: str) -> List[str]:
+        """Successor names of a node."""
+        return [self.names[target] for target in self.adjacency[self.ids[node]]]
+
+    def predecessors(self, node: str) -> List[str]:
+        """Predecessor names of a node (the reverse adjacency is built once after each change)."""
+        if self._reverse is None:
+            self._reverse = [[] for _ in self.names]
+            for node_id, successors in enumerate(self.adjacency):
+                for target in successors:
+                    self._reverse[target].append(node_id)
+        return [self.names[source] for source in self._reverse[self.ids[node]]]
+
+    def set_successors(self, node: str, targets: Iterable[str]):
+        """Replace the successors of a node, adding the node and the targets if needed."""
+        node_id = self._id(node)
+        self.adjacency[node_id] = [self._id(target) for target in targets]
+        self._reverse = None
+
+    def remove_nodes(self, nodes: Iterable[str]):
+        """Remove nodes and their edges; the remaining nodes keep their order but are renumbered."""
+        removed = {self.ids[node] for node in nodes if node in self.ids}
+        if not removed:
+            return
+        remap = []
+        count = 0
+        for node_id in range(len(self.names)):
+            remap.append(-1 if node_id in removed else count)
+            count += node_id not in removed
+        self.names = [name for node_id, name in enumerate(self.names) if node_id not in removed]
+        self.ids = {name: node_id for node_id, name in enumerate(self.names)}
+        self.adjacency = [[remap[target] for target in successors if remap[target] != -1]
+                          for node_id, successors in enumerate(self.adjacency) if node_id not in removed]
+        self._reverse = None
+
+    def to_networkx(self) -> Any:
+        """
+        Copy of the graph as a networkx DiGraph (imports networkx).
+
+        Returns:
+            networkx.DiGraph with the same nodes and edges
+        """
+        import networkx as nx
+        graph = nx.DiGraph()
+        graph.add_nodes_from(self.names)
+        graph.add_edges_from(self.edges())
+        return graph
+
+    def to_csr(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Adjacency in compressed sparse row form.
+
+        Returns:
+            Tuple (indptr, indices): the successors of node i are
+            indices[indptr[i]:indptr[i + 1]]
+        """
+        degrees = np.fromiter((len(successors) for successors in self.adjacency), dtype=np.int64,
+                              count=len(self.adjacency))
+        indptr = np.zeros(len(self.adjacency) + 1, dtype=np.int64)
+        np.cumsum(degrees, out=indptr[1:])
+        indices = np.fromiter((target for successors in self.adjacency for target in successors),
+                              dtype=np.int64, count=int(indptr[-1]))
+        return indptr, indices
+
+    def cyclic_components(self) -> List[List[int]]:
+        """Strongly connected components with more than one node (lists of node ids)."""
+        return [component for component in strongly_connected_components(self.adjacency) if len(component) > 1]
+
+    def shortest_cycle(self, component: List[int], max_starts: int = DEFAULT_CYCLE_STARTS) -> List[int]:
+        """
+        Shortest cycle found within a component.
+
+        Searches from the max_starts nodes with the most successors inside the
+        component (ties by name); on small components every node is tried, so
+        the cycle is the shortest overall.
+
+        Args:
+            component: Node ids of a cyclic strongly connected component
+            max_starts: Start nodes to search from
+
+        Returns:
+            Node ids of the cycle, starting with its smallest name
+        """
+        members = set(component)
+        successors = {node: [next_node for next_node in self.adjacency[node] if next_node in members]
+                      for node in component}
+        starts = sorted(component, key=lambda node: (-len(successors[node]), self.names[node]))[:max_starts]
+
+        best: Optional[List[int]] = None
+        for start in starts:
+            cycle = _shortest_cycle_through(start, successors, len(best) if best else None)
+            if cycle is not None and (best is None or len(cycle) < len(best)):
+                best = cycle
+                if len(best) == 2:
+                    break
+        # A component always contains a cycle through each of its nodes
+        first = min(range(len(best)), key=lambda index: self.names[best[index]])
+        return best[first:] + best[:first]
+
+
+def _shortest_cycle_through(start: int, successors: Dict[int, List[int]],
+                            shorter_than: Optional[int]) -> Optional[List[int]]:
+    """Breadth-first search for the shortest cycle through start (None if none shorter than the bound)."""
+    parents = {start: None}
+    frontier = deque([(start, 1)])
+    while frontier:
+        node, length = frontier.popleft()
+        if shorter_than is not None and length >= shorter_than:
+            return None
+        for next_node in successors[node]:
+            if next_node == start:
+                cycle = []
+                while node is not None:
+                    cycle.append(node)
+                    node = parents[node]
+                cycle.reverse()
+                return cycle
+            if next_node not in parents:
+                parents[next_node] = node
+                frontier.append((next_node, length + 1))
+    return None
+
+
+def strongly_connected_components(adjacency: List[List[int]]) -> List[List[int]]:
+    """
+    Strongly connected components of a graph (iterative Tarjan).
+
+    Args:
+        adjacency: Successor ids of every node id
+
+    Returns:
+        Components as lists of node ids, in reverse topological order
+    """
+    count = len(adjacency)
+    index = [-1] * count
+    lowlink = [0] * count
+    on_stack = [False] * count
+    stack: List[int] = []
+    components: List[List[int]] = []
+    counter = 0
+    for root in range(count):
+        if index[root] != -1:
+            continue
+        index[root] = lowlink[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        work = [(root, iter(adjacency[root]))]
+        while work:
+            node, successors = work[-1]
+            for successor in successors:
+                if index[successor] == -1:
+                    index[successor] = lowlink[successor] = counter
+                    counter += 1
+                    stack.append(successor)
+                    on_stack[successor] = True
+                    work.append((successor, iter(adjacency[successor])))
+                    break
+                if on_stack[successor] and index[successor] < lowlink[node]:
+                    lowlink[node] = index[successor]
+            else:
+                work.pop()
+                if work and lowlink[node] < lowlink[work[-1][0]]:
+                    lowlink[work[-1][0]] = lowlink[node]
+                if lowlink[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = False
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+    return components
+
+
+def cyclic_components(edges: Iterable[Tuple[str, str]]) -> Set[FrozenSet[str]]:
+    """
+    Strongly connected components with more than one node.
+
+    Args:
+        edges: (source, target) pairs
+
+    Returns:
+        Set of components, each a frozenset of node names
+    """
+    graph = IndexedGraph(edges)
+    return {frozenset(graph.names[node] for node in component) for component in graph.cyclic_components()}
+
+
+def update_cyclic_components(successors: Callable[[str], Iterable[str]],
+                             predecessors: Callable[[str], Iterable[str]],
+                             component_of: Dict[str, FrozenSet[str]],
+                             removed_nodes: Iterable[str],
+                             removed_edges: Iterable[Tuple[str, str]],
+                             added_edges: Iterable[Tuple[str, str]]) -> Tuple[Set[FrozenSet[str]], Set[FrozenSet[str]]]:
+    """
+    Cyclic components after a change, recomputed only where they can differ.
+
+    Removing an edge can only split the component containing both of its
+    ends, and adding an edge u -> v between different components can only
+    merge the nodes both reachable from v and reaching u. Tarjan runs on the
+    subgraph induced by those nodes, which is a union of components of the
+    new graph; every other component is unchanged.
+
+    Args:
+        successors: Successors of a node in the new graph
+        predecessors: Predecessors of a node in the new graph
+        component_of: Cyclic component of each node before the change (nodes
+            not in a cyclic component are absent)
+        removed_nodes: Nodes removed from the graph
+        removed_edges: Edges removed between remaining nodes
+        added_edges: Edges added
+
+    Returns:
+        Tuple (components that no longer exist, new components)
+    """
+    removed_nodes = set(removed_nodes)
+    region: Set[str] = set()
+    for node in removed_nodes:
+        region.update(component_of.get(node, ()))
+    for source, target in removed_edges:
+        component = component_of.get(source)
+        if component is not None and target in component:
+            region.update(component)
+    for source, target in added_edges:
+        component = component_of.get(source)
+        if component is not None and target in component:
+            continue
+        reachable = _reachable(target, successors)
+        if source in reachable:
+            region.update(_reachable(source, predecessors, within=reachable))
+
+    stale = {component_of[node] for node in region if node in component_of}
+    region.difference_update(removed_nodes)
+    subgraph = IndexedGraph(((node, next_node) for node in region for next_node in successors(node)
+                             if next_node in region), region)
+    fresh = {frozenset(subgraph.names[node] for node in component) for component in subgraph.cyclic_components()}
+    return stale - fresh, fresh - stale
+
+
+def _reachable(start: str, neighbors: Callable[[str], Iterable[str]],
+               within: Optional[Set[str]] = None) -> Set[str]:
+    """Nodes reachable from start (optionally only through nodes of within)."""
+    seen = {start}
+    stack = [start]
+    while stack:
+        for next_node in neighbors(stack.pop()):
+            if next_node not in seen and (within is None or next_node in within):
+                seen.add(next_node)
+                stack.append(next_node)
+    return seen
+
+
+def pagerank(indptr: np.ndarray, indices: np.ndarray, alpha: float = PAGERANK_ALPHA,
+             max_iter: int = PAGERANK_MAX_ITER, tol: float = PAGERANK_TOL,
+             start: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
+    """
+    PageRank of a CSR graph by power iteration, as computed by nx.pagerank.
+
+    Every edge has weight 1 (parallel edges count once per occurrence) and
+    the rank of nodes without successors is spread uniformly.
+
+    Args:
+        indptr: CSR row pointers (see IndexedGraph.to_csr)
+        indices: CSR successor ids
+        alpha: Damping factor
+        max_iter: Maximum number of iterations
+        tol: Convergence tolerance (per node, on the L1 change)
+        start: Initial scores by node id, e.g. those of the graph before a
+            small change (default: uniform)
+
+    Returns:
+        Scores summing to 1 indexed by node id, or None if the iteration did not converge
+    """
+    count = len(indptr) - 1
+    if count == 0:
+        return np.zeros(0)
+    out_degree = np.diff(indptr)
+    sources = np.repeat(np.arange(count), out_degree)
+    dangling = out_degree == 0
+    inverse_degree = np.zeros(count)
+    inverse_degree[~dangling] = 1.0 / out_degree[~dangling]
+
+    if start is not None and start.sum() > 0:
+        x = start / start.sum()
+    else:
+        x = np.full(count, 1.0 / count)
+    for _ in range(max_iter):
+        previous = x
+        spread = np.bincount(indices, weights=(x * inverse_degree)[sources], minlength=count)
+        x = alpha * (spread + x[dangling].sum() / count) + (1.0 - alpha) / count
+        if np.abs(x - previous).sum() < count * tol:
+            return x
+    return None
+
+
+def degree_centrality(indptr: np.ndarray, indices: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    In- and out-degree centrality of a CSR graph (degree divided by n - 1, as in networkx).
+
+    Args:
+        indptr: CSR row pointers
+        indices: CSR successor ids
+
+    Returns:
+        Tuple (in-degree centrality, out-degree centrality) indexed by node id
+    """
+    count = len(indptr) - 1
+    scale = 1.0 / (count - 1) if count > 1 else 1.0
+    in_degree = np.bincount(indices, minlength=count)
+    return in_degree * scale, np.diff(indptr) * scale
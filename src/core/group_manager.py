@@ -10,6 +10,7 @@ Resolves: Problem 1 - Groups with 0 files
 
 from typing import Dict, List, Optional
 from pathlib import Path
+import os
 import logging
 
 try:
@@ -33,12 +34,14 @@ class GroupManager:
         self.logger = logger
         self.check_file_existence = check_file_existence
     
-    def filter_empty_groups(self, groups: Dict[str, List[str]]) -> Dict[str, List[str]]:
+    def filter_empty_groups(self, groups: Dict[str, List[str]],
+                            root_path: Optional[str] = None) -> Dict[str, List[str]]:
         """
         Remove groups without files or with non-existent files.
         
         Args:
             groups: Dictionary of groups with file lists
+            root_path: Directory relative file paths are checked against (default: cwd)
             
         Returns:
             Filtered dictionary without empty groups
@@ -48,7 +51,10 @@ class GroupManager:
         for group_name, files in groups.items():
             # Filter files that actually exist (if enabled)
             if self.check_file_existence:
-                existing_files = [f for f in files if self._file_exists(f)]
+                existing_files = [
+                    f for f in files
+                    if self._file_exists(os.path.join(root_path, f) if root_path else f)
+                ]
             else:
                 # In test mode, assume all files exist
                 existing_files = files
@@ -78,18 +84,53 @@ class GroupManager:
             self.logger.error(f"Error checking file existence for {file_path}: {e}")
             return False
     
-    def create_groups(self, files: List[FileInfo]) -> Dict[str, List[str]]:
+    def create_groups(self, files: List[FileInfo], root_path: Optional[str] = None) -> Dict[str, List[str]]:
         """
         Create groups ensuring they are not empty.
         
         Args:
             files: List of FileInfo to group
+            root_path: Directory relative file paths are checked against (default: cwd)
             
         Returns:
             Dictionary of valid groups without empty groups
         """
         raw_groups = self._build_raw_groups(files)
-        return self.filter_empty_groups(raw_groups)
+        return self.filter_empty_groups(raw_groups, root_path)
+    
+    def empty_groups(self) -> Dict[str, List[str]]:
+        """Return the initial (empty) groups that files are classified into."""
+        return {
+            'core_modules': [],
+            'utility_modules': [],
+            'test_modules': [],
+            'feature_modules': [],
+            'configuration': []
+        }
+    
+    def classify(self, file_info: FileInfo) -> str:
+        """
+        Return the group a file belongs to.
+        
+        Args:
+            file_info: File to classify
+            
+        Returns:
+            Group name
+        """
+        file_path = file_info.path.lower()
+        file_name = file_info.name.lower()
+        
+        # Grouping logic
+        if 'test' in file_path or file_name.startswith('test_'):
+            return 'test_modules'
+        elif 'core' in file_path or 'main' in file_name:
+            return 'core_modules'
+        elif 'util' in file_path or 'helper' in file_name:
+            return 'utility_modules'
+        elif file_name in ['config.py', 'settings.py', 'config.yaml', 'config.json']:
+            return 'configuration'
+        return 'feature_modules'
     
     def _build_raw_groups(self, files: List[FileInfo]) -> Dict[str, List[str]]:
         """
@@ -101,30 +142,9 @@ class GroupManager:
         Returns:
             Initial groups (may be empty)
         """
-        groups = {
-            'core_modules': [],
-            'utility_modules': [],
-            'test_modules': [],
-            'feature_modules': [],
-            'configuration': []
-        }
-        
+        groups = self.empty_groups()
         for file_info in files:
-            file_path = file_info.path
-            file_name = file_info.name.lower()
-            
-            # Grouping logic
-            if 'test' in file_path.lower() or file_name.startswith('test_'):
-                groups['test_modules'].append(file_path)
-            elif 'core' in file_path.lower() or 'main' in file_name:
-                groups['core_modules'].append(file_path)
-            elif 'util' in file_path.lower() or 'helper' in file_name:
-                groups['utility_modules'].append(file_path)
-            elif file_name in ['config.py', 'settings.py', 'config.yaml', 'config.json']:
-                groups['configuration'].append(file_path)
-            else:
-                groups['feature_modules'].append(file_path)
-        
+            groups[self.classify(file_info)].append(file_info.path)
         return groups
     
     def validate_groups(self, groups: Dict[str, List[str]]) -> bool:
@@ -0,0 +1,231 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Persistent cache of extracted imports, keyed by file content.
+
+The imports of a file depend only on its bytes and on the extractor, so
+entries are keyed by a digest of the content and shared by every project
+analyzed on the machine; the whole cache is ignored when the extractor
+version changes. A stat index (path -> size, mtime, digest) lets unchanged
+files be looked up without being read; files whose mtime changed are
+hashed, which is still far cheaper than parsing them. After editing one
+file, a re-analysis parses only that file.
+
+The cache is one file, ~/.project-prompt/import-cache/imports.cache, kept
+compact: every distinct import name is stored once in a string table and
+entries are packed arrays (16-byte digests, offsets and name ids). Entries
+are kept in least-recently-used order and the oldest are evicted when the
+packed size exceeds max_bytes. Saving merges with what other processes
+saved in the meantime and replaces the file atomically.
+"""
+
+import os
+import pickle
+import hashlib
+import logging
+from array import array
+from pathlib import Path
+from typing import Dict, FrozenSet, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Bump when the file layout changes so stale caches are ignored
+IMPORT_CACHE_VERSION = 1
+
+# Directory holding the import cache
+DEFAULT_CACHE_DIR = Path.home() / '.project-prompt' / 'import-cache'
+CACHE_FILENAME = 'imports.cache'
+
+# Default bound of the packed entries
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+DIGEST_SIZE = 16
+
+# (size, mtime_ns, digest) of a file when it was last hashed
+StatEntry = Tuple[int, int, bytes]
+
+
+def file_digest(path: str) -> Optional[bytes]:
+    """Digest of a file's content, or None if it cannot be read."""
+    digest = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    try:
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+    except OSError:
+        return None
+    return digest.digest()
+
+
+def _entry_size(imports: FrozenSet[str]) -> int:
+    """Packed size of an entry: digest, offset and one id per import."""
+    return DIGEST_SIZE + 4 + 4 * len(imports)
+
+
+class ImportCache:
+    """On-disk LRU cache of import sets by file content digest."""
+
+    def __init__(self, extractor_version: int, cache_dir: Optional[Union[str, Path]] = None,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Initialize the cache.
+
+        Args:
+            extractor_version: Version of the import extractor; entries of other versions are ignored
+            cache_dir: Cache directory (default: ~/.project-prompt/import-cache)
+            max_bytes: Bound of the packed entries; least recently used ones are evicted
+        """
+        self.extractor_version = extractor_version
+        self.cache_path = Path(cache_dir or DEFAULT_CACHE_DIR) / CACHE_FILENAME
+        self.max_bytes = max_bytes
+        # digest -> imports, oldest first (dicts keep insertion order)
+        self.entries: Dict[bytes, FrozenSet[str]] = {}
+        self.stats: Dict[str, StatEntry] = {}
+        self._used: Dict[bytes, FrozenSet[str]] = {}
+        self._used_stats: Dict[str, StatEntry] = {}
+        self.hits = 0
+        self.misses = 0
+        self.entries, self.stats = self._read()
+
+    def lookup(self, path: str) -> Tuple[Optional[FrozenSet[str]], Optional[StatEntry]]:
+        """
+        Look a file up.
+
+        Args:
+            path: File path (absolute, or relative to the working directory)
+
+        Returns:
+            Tuple (cached imports or None on a miss, file key to pass to store
+            after extracting; None if the file cannot be read)
+        """
+        path = os.path.abspath(path)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            self.misses += 1
+            return None, None
+
+        known = self.stats.get(path)
+        if known is not None and known[0] == stat.st_size and known[1] == stat.st_mtime_ns:
+            key = known
+        else:
+            digest = file_digest(path)
+            if digest is None:
+                self.misses += 1
+                return None, None
+            key = (stat.st_size, stat.st_mtime_ns, digest)
+
+        imports = self._used.get(key[2])
+        if imports is None:
+            imports = self.entries.get(key[2])
+        if imports is None:
+            self.misses += 1
+            return None, key
+        self._used[key[2]] = imports
+        self._used_stats[path] = key
+        self.hits += 1
+        return imports, key
+
+    def store(self, path: str, key: StatEntry, imports):
+        """
+        Record the imports extracted from a file.
+
+        Args:
+            path: File path given to lookup
+            key: File key returned by lookup
+            imports: Extracted import names
+        """
+        self._used[key[2]] = frozenset(imports)
+        self._used_stats[os.path.abspath(path)] = key
+
+    def save(self):
+        """Merge the entries used in this run into the cache file, evicting the least recently used."""
+        if not self._used:
+            return
+        entries, stats = self._read()
+        entries.update(self.entries)
+        stats.update(self.stats)
+        # Entries used in this run become the most recent
+        for digest, imports in self._used.items():
+            entries.pop(digest, None)
+            entries[digest] = imports
+        stats.update(self._used_stats)
+
+        size = sum(_entry_size(imports) for imports in entries.values())
+        evict = []
+        for digest, imports in entries.items():
+            if size <= self.max_bytes:
+                break
+            evict.append(digest)
+            size -= _entry_size(imports)
+        for digest in evict:
+            del entries[digest]
+        stats = {path: key for path, key in stats.items() if key[2] in entries}
+
+        self.entries, self.stats = entries, stats
+        self._used, self._used_stats = {}, {}
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(self._pack(entries, stats), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            logger.warning(f"Could not write import cache {self.cache_path}: {e}")
+
+    def _pack(self, entries: Dict[bytes, FrozenSet[str]], stats: Dict[str, StatEntry]) -> Dict:
+        names: Dict[str, int] = {}
+        offsets = array('I', [0])
+        ids = array('I')
+        for imports in entries.values():
+            ids.extend(names.setdefault(name, len(names)) for name in sorted(imports))
+            offsets.append(len(ids))
+        digest_ids = {digest: index for index, digest in enumerate(entries)}
+        paths = list(stats)
+        return {
+            'version': IMPORT_CACHE_VERSION,
+            'extractor': self.extractor_version,
+            'names': list(names),
+            'digests': b''.join(entries),
+            'offsets': offsets.tobytes(),
+            'ids': ids.tobytes(),
+            'paths': paths,
+            'sizes': array('Q', (stats[path][0] for path in paths)).tobytes(),
+            'mtimes': array('q', (stats[path][1] for path in paths)).tobytes(),
+            'path_digests': array('I', (digest_ids[stats[path][2]] for path in paths)).tobytes(),
+        }
+
+    def _read(self) -> Tuple[Dict[bytes, FrozenSet[str]], Dict[str, StatEntry]]:
+        """Load the cache file, ignoring caches of other layouts or extractor versions."""
+        try:
+            with open(self.cache_path, 'rb') as f:
+                data = pickle.load(f)
+            if (not isinstance(data, dict) or data.get('version') != IMPORT_CACHE_VERSION
+                    or data.get('extractor') != self.extractor_version):
+                return {}, {}
+            names: List[str] = data['names']
+            digests: bytes = data['digests']
+            offsets = array('I')
+            offsets.frombytes(data['offsets'])
+            ids = array('I')
+            ids.frombytes(data['ids'])
+            digest_list = [digests[start:start + DIGEST_SIZE] for start in range(0, len(digests), DIGEST_SIZE)]
+            entries = {
+                digest: frozenset(names[name_id] for name_id in ids[offsets[index]:offsets[index + 1]])
+                for index, digest in enumerate(digest_list)
+            }
+            sizes, mtimes, path_digests = array('Q'), array('q'), array('I')
+            sizes.frombytes(data['sizes'])
+            mtimes.frombytes(data['mtimes'])
+            path_digests.frombytes(data['path_digests'])
+            stats = {
+                path: (size, mtime, digest_list[digest_id])
+                for path, size, mtime, digest_id in zip(data['paths'], sizes, mtimes, path_digests)
+            }
+            return entries, stats
+        except FileNotFoundError:
+            return {}, {}
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable import cache {self.cache_path}: {e}")
+            return {}, {}
@@ -0,0 +1,440 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+SQLite-backed queue of analysis jobs and the worker processes that run them.
+
+Jobs move through queued -> running -> completed | failed | cancelled. All
+state lives in the database, so any number of processes can submit, poll
+and claim jobs, and the job history survives restarts:
+
+- submit() refuses new jobs once `max_pending` jobs are queued (QueueFullError),
+  so callers get backpressure instead of an ever-growing backlog;
+- workers claim the oldest queued job in an IMMEDIATE transaction, so a job is
+  never run twice;
+- cancelling a queued job removes it from the queue; cancelling a running job
+  makes the pool terminate the worker running it and start a fresh one;
+- each job records the pool that claimed it, so several servers can share one
+  database without a pool touching the jobs of another;
+- finished jobs are deleted once older than the retention period.
+
+Each worker process keeps an AnalysisService, so rules, analyzers and the
+results of unchanged projects stay warm across the jobs it runs.
+"""
+
+import os
+import json
+import time
+import uuid
+import sqlite3
+import logging
+import threading
+import multiprocessing
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# Default job database
+DEFAULT_JOBS_DB = Path.home() / '.project-prompt' / 'jobs.db'
+
+QUEUED = 'queued'
+RUNNING = 'running'
+COMPLETED = 'completed'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+FINISHED_STATES = (COMPLETED, FAILED, CANCELLED)
+
+# Seconds an idle worker waits before polling the queue again
+POLL_INTERVAL = 0.5
+
+# Workers are spawned, not forked: the pool forks from a threaded server
+_mp = multiprocessing.get_context('spawn')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    params TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    worker_pid INTEGER,
+    pool_pid INTEGER,
+    cancel_requested INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at);
+CREATE INDEX IF NOT EXISTS jobs_finished ON jobs (finished_at);
+"""
+
+
+class QueueFullError(Exception):
+    """Raised by JobQueue.submit when the queue is at capacity."""
+
+
+class JobQueue:
+    """Persistent job queue stored in a SQLite database."""
+
+    def __init__(self, db_path: Union[str, Path, None] = None, max_pending: int = 100):
+        """
+        Open (and create if needed) a job queue.
+
+        Args:
+            db_path: SQLite database file (default: ~/.project-prompt/jobs.db)
+            max_pending: Maximum number of queued jobs accepted by submit()
+        """
+        self.db_path = Path(db_path or DEFAULT_JOBS_DB)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_pending = max_pending
+        self._lock = threading.Lock()
+        # Transactions are managed explicitly (BEGIN IMMEDIATE for claims)
+        self.conn = sqlite3.connect(str(self.db_path), timeout=30.0,
+                                    isolation_level=None, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        self.conn.executescript(_SCHEMA)
+        # Databases created before jobs recorded their pool
+        columns = {row['name'] for row in self.conn.execute("PRAGMA table_info(jobs)")}
+        if 'pool_pid' not in columns:
+            self.conn.execute("ALTER TABLE jobs ADD COLUMN pool_pid INTEGER")
+
+    def close(self):
+        """Close the database connection."""
+        self.conn.close()
+
+    def submit(self, params: Dict[str, Any]) -> str:
+        """
+        Queue an analysis job.
+
+        Args:
+            params: Analysis options (see AnalysisService.analyze)
+
+        Returns:
+            Id of the new job
+
+        Raises:
+            QueueFullError: If max_pending jobs are already queued
+        """
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                queued = self.conn.execute("SELECT COUNT(*) FROM jobs WHERE status = ?", (QUEUED,)).fetchone()[0]
+                if queued >= self.max_pending:
+                    raise QueueFullError(f"{queued} jobs already queued")
+                self.conn.execute(
+                    "INSERT INTO jobs (id, status, params, created_at) VALUES (?, ?, ?, ?)",
+                    (job_id, QUEUED, json.dumps(params), time.time())
+                )
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+            self.conn.execute("COMMIT")
+        return job_id
+
+    def claim(self, worker_pid: int, pool_pid: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """
+        Atomically take the oldest queued job.
+
+        Args:
+            worker_pid: Process that will run the job
+            pool_pid: Process of the pool supervising the worker
+
+        Returns:
+            The job, now running, or None if the queue is empty
+        """
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self.conn.execute(
+                    "SELECT id FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1", (QUEUED,)
+                ).fetchone()
+                if row is not None:
+                    self.conn.execute(
+                        "UPDATE jobs SET status = ?, worker_pid = ?, pool_pid = ?, started_at = ? WHERE id = ?",
+                        (RUNNING, worker_pid, pool_pid, time.time(), row['id'])
+                    )
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+            self.conn.execute("COMMIT")
+        return self.get(row['id']) if row is not None else None
+
+    def complete(self, job_id: str, result: Any):
+        """Record the result of a running job (ignored if it was cancelled meanwhile)."""
+        self._finish(job_id, COMPLETED, result=json.dumps(result, default=str))
+
+    def fail(self, job_id: str, error: str):
+        """Record the failure of a running job (ignored if it was cancelled meanwhile)."""
+        self._finish(job_id, FAILED, error=error)
+
+    def _finish(self, job_id: str, status: str, result: Optional[str] = None, error: Optional[str] = None):
+        with self._lock:
+            self.conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ? WHERE id = ? AND status = ?",
+                (status, result, error, time.time(), job_id, RUNNING)
+            )
+
+    def cancel(self, job_id: str) -> Optional[str]:
+        """
+        Cancel a job.
+
+        A queued job is cancelled immediately. A running job is flagged and
+        cancelled by the worker pool, which terminates its worker.
+
+        Args:
+            job_id: Job to cancel
+
+        Returns:
+            The job status after the request, or None if the job does not exist
+        """
+        with self._lock:
+            self.conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ? WHERE id = ? AND status = ?",
+                (CANCELLED, time.time(), job_id, QUEUED)
+            )
+            self.conn.execute(
+                "UPDATE jobs SET cancel_requested = 1 WHERE id = ? AND status = ?", (job_id, RUNNING)
+            )
+        job = self.get(job_id, include_result=False)
+        return job['status'] if job else None
+
+    def mark_cancelled(self, job_id: str):
+        """Finish a running job whose worker was terminated on request."""
+        with self._lock:
+            self.conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ? WHERE id = ? AND status = ?",
+                (CANCELLED, time.time(), job_id, RUNNING)
+            )
+
+    def get(self, job_id: str, include_result: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        Return a job.
+
+        Args:
+            job_id: Job id
+            include_result: Decode and include the result
+
+        Returns:
+            Job dictionary, or None if it does not exist
+        """
+        with self._lock:
+            row = self.conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return _job_dict(row, include_result) if row is not None else None
+
+    def list(self, status: Optional[str] = None, limit: int = 100) -> List[Dict[str, Any]]:
+        """List jobs, most recent first, without results."""
+        query = "SELECT * FROM jobs"
+        params: tuple = ()
+        if status:
+            query += " WHERE status = ?"
+            params = (status,)
+        with self._lock:
+            rows = self.conn.execute(query + " ORDER BY created_at DESC LIMIT ?", params + (limit,)).fetchall()
+        return [_job_dict(row, include_result=False) for row in rows]
+
+    def counts(self) -> Dict[str, int]:
+        """Number of jobs per status."""
+        with self._lock:
+            rows = self.conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return {status: count for status, count in rows}
+
+    def running(self, pool_pid: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Running jobs (of one pool, if given) with their worker and cancellation flag."""
+        query = "SELECT id, worker_pid, pool_pid, cancel_requested FROM jobs WHERE status = ?"
+        params: tuple = (RUNNING,)
+        if pool_pid is not None:
+            query += " AND pool_pid = ?"
+            params += (pool_pid,)
+        with self._lock:
+            rows = self.conn.execute(query, params).fetchall()
+        return [dict(row) for row in rows]
+
+    def requeue_running(self, pool_pid: Optional[int] = None) -> int:
+        """
+        Put back running jobs whose pool stopped (e.g. after a restart).
+
+        Cancelled jobs are finished instead of requeued.
+
+        Args:
+            pool_pid: Pool whose jobs are requeued (default: every pool that is no longer running)
+
+        Returns:
+            Number of jobs requeued
+        """
+        with self._lock:
+            if pool_pid is not None:
+                pools = [pool_pid]
+            else:
+                rows = self.conn.execute(
+                    "SELECT DISTINCT pool_pid FROM jobs WHERE status = ?", (RUNNING,)
+                ).fetchall()
+                pools = [row[0] for row in rows if row[0] is None or not _process_alive(row[0])]
+            requeued = 0
+            for pool in pools:
+                owner = "pool_pid IS NULL" if pool is None else "pool_pid = ?"
+                owner_params: tuple = () if pool is None else (pool,)
+                cursor = self.conn.execute(
+                    "UPDATE jobs SET status = ?, worker_pid = NULL, pool_pid = NULL, started_at = NULL"
+                    " WHERE status = ? AND cancel_requested = 0 AND " + owner,
+                    (QUEUED, RUNNING) + owner_params
+                )
+                requeued += cursor.rowcount
+                self.conn.execute(
+                    "UPDATE jobs SET status = ?, finished_at = ? WHERE status = ? AND " + owner,
+                    (CANCELLED, time.time(), RUNNING) + owner_params
+                )
+        return requeued
+
+    def purge(self, retention_seconds: float) -> int:
+        """
+        Delete finished jobs older than the retention period.
+
+        Returns:
+            Number of jobs deleted
+        """
+        with self._lock:
+            cursor = self.conn.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?, ?) AND finished_at < ?",
+                FINISHED_STATES + (time.time() - retention_seconds,)
+            )
+        return cursor.rowcount
+
+
+def _job_dict(row: sqlite3.Row, include_result: bool) -> Dict[str, Any]:
+    job = {
+        'id': row['id'],
+        'status': row['status'],
+        'params': json.loads(row['params']),
+        'error': row['error'],
+        'cancel_requested': bool(row['cancel_requested']),
+        'created_at': row['created_at'],
+        'started_at': row['started_at'],
+        'finished_at': row['finished_at'],
+    }
+    if include_result:
+        job['result'] = json.loads(row['result']) if row['result'] else None
+    return job
+
+
+def _process_alive(pid: int) -> bool:
+    """Whether a process with this pid exists."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        # Exists but belongs to another user
+        return True
+    return True
+
+
+def _worker_main(db_path: str, stop, parent_pid: int):
+    """Claim and run jobs until stopped or orphaned."""
+    from .daemon import AnalysisService
+
+    queue = JobQueue(db_path)
+    service = AnalysisService()
+    pid = os.getpid()
+    while not stop.is_set() and os.getppid() == parent_pid:
+        job = queue.claim(pid, parent_pid)
+        if job is None:
+            stop.wait(POLL_INTERVAL)
+            continue
+        try:
+            result = service.analyze(job['params'])
+        except Exception as e:
+            error = str(e) if isinstance(e, ValueError) else f"{type(e).__name__}: {e}"
+            queue.fail(job['id'], error)
+        else:
+            queue.complete(job['id'], result)
+
+
+class JobWorkerPool:
+    """Keeps N worker processes running jobs and enforces cancellation and retention."""
+
+    def __init__(self, queue: JobQueue, workers: int = 2, retention_seconds: float = 7 * 24 * 3600):
+        """
+        Initialize the pool.
+
+        Args:
+            queue: Queue the workers claim jobs from
+            workers: Number of worker processes
+            retention_seconds: Age after which finished jobs are deleted
+        """
+        self.queue = queue
+        self.workers = max(1, workers)
+        self.retention_seconds = retention_seconds
+        self._stop = _mp.Event()
+        self._processes: list = []
+        # Recorded on the jobs claimed by this pool's workers
+        self.pid = os.getpid()
+        self._supervisor: Optional[threading.Thread] = None
+        self._shutdown = threading.Event()
+
+    def start(self):
+        """Start the workers and the supervising thread."""
+        # A previous server may have run under this pid, so its jobs are requeued too
+        requeued = self.queue.requeue_running() + self.queue.requeue_running(self.pid)
+        if requeued:
+            logger.info(f"Requeued {requeued} jobs left running by a previous run")
+        for _ in range(self.workers):
+            self._processes.append(self._spawn())
+        self._supervisor = threading.Thread(target=self._supervise, name='job-supervisor', daemon=True)
+        self._supervisor.start()
+
+    def stop(self, timeout: float = 10.0):
+        """Stop the workers, terminating jobs still running after the timeout."""
+        self._shutdown.set()
+        self._stop.set()
+        if self._supervisor is not None:
+            self._supervisor.join()
+        deadline = time.time() + timeout
+        for process in self._processes:
+            process.join(max(0.0, deadline - time.time()))
+            if process.is_alive():
+                process.terminate()
+                process.join()
+        # Jobs interrupted by the shutdown run again on the next start
+        self.queue.requeue_running(self.pid)
+
+    def _spawn(self):
+        process = _mp.Process(target=_worker_main, args=(str(self.queue.db_path), self._stop, self.pid),
+                              name='analysis-job-worker', daemon=True)
+        process.start()
+        return process
+
+    def _supervise(self):
+        """Enforce cancellations, replace dead workers and purge old jobs."""
+        last_purge = 0.0
+        while not self._shutdown.wait(POLL_INTERVAL):
+            try:
+                self._check_workers()
+                if time.time() - last_purge > 60:
+                    self.queue.purge(self.retention_seconds)
+                    last_purge = time.time()
+            except Exception:
+                logger.exception("Job supervisor error")
+
+    def _check_workers(self):
+        by_pid = {process.pid: process for process in self._processes}
+        # Jobs of other pools sharing the database are theirs to supervise
+        for job in self.queue.running(self.pid):
+            process = by_pid.get(job['worker_pid'])
+            if job['cancel_requested'] and process is not None and process.is_alive():
+                process.terminate()
+                process.join()
+                self.queue.mark_cancelled(job['id'])
+            elif process is None or not process.is_alive():
+                if job['cancel_requested']:
+                    self.queue.mark_cancelled(job['id'])
+                else:
+                    self.queue.fail(job['id'], "Worker process died")
+
+        for i, process in enumerate(self._processes):
+            if not process.is_alive() and not self._stop.is_set():
+                process.join()
+                self._processes[i] = self._spawn()
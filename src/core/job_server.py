@@ -0,0 +1,246 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+HTTP front end of the analysis job queue (standard library only).
+
+Endpoints (JSON in and out):
+
+    POST   /jobs               submit {"path": ..., "output": ..., "quick": ...}
+                               202 with the job, 429 + Retry-After when the queue is full
+    GET    /jobs[?status=...]  list jobs, most recent first
+    GET    /jobs/<id>          job status
+    GET    /jobs/<id>/result   job result (409 until the job has finished)
+    DELETE /jobs/<id>          cancel the job
+    GET    /health             job counts per status and worker count
+
+Clients choose what the server reads and writes only within limits set
+when it starts: "output" is resolved under the server's output root (paths
+outside it are refused; without one, each project gets its own directory
+there), and "rules" may only name rule packs on the server's allowlist.
+"""
+
+import os
+import json
+import hashlib
+import logging
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+from urllib.parse import parse_qs, urlparse
+
+from .job_queue import JobQueue, JobWorkerPool, QueueFullError, FINISHED_STATES
+from ..utils.filenames import sanitize_filename
+
+logger = logging.getLogger(__name__)
+
+# Largest accepted request body
+MAX_BODY_SIZE = 64 * 1024
+
+# Directory under which jobs write their outputs
+DEFAULT_OUTPUT_ROOT = Path.home() / '.project-prompt' / 'job-outputs'
+
+# Analysis options accepted in a submitted job
+JOB_OPTIONS = {'path', 'output', 'max_files', 'rules', 'content_budget', 'quick',
+               'skip_dependencies', 'no_cache'}
+
+
+class _JobRequestHandler(BaseHTTPRequestHandler):
+    """Routes job queue requests."""
+
+    server_version = 'ProjectPromptJobs/1.0'
+
+    @property
+    def queue(self) -> JobQueue:
+        return self.server.queue
+
+    def log_message(self, format, *args):
+        logger.info("%s - %s", self.address_string(), format % args)
+
+    def _send(self, status: HTTPStatus, body: Any, headers: Optional[Dict[str, str]] = None):
+        data = json.dumps(body, default=str).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _error(self, status: HTTPStatus, message: str, headers: Optional[Dict[str, str]] = None):
+        self._send(status, {'error': message}, headers)
+
+    def _route(self):
+        """Split the path into (collection, job id, sub-resource)."""
+        url = urlparse(self.path)
+        parts = [part for part in url.path.split('/') if part]
+        parts += [None] * (3 - len(parts))
+        return parts[0], parts[1], parts[2], parse_qs(url.query)
+
+    def do_GET(self):
+        collection, job_id, resource, query = self._route()
+        if collection == 'health' and job_id is None:
+            self._send(HTTPStatus.OK, {'jobs': self.queue.counts(), 'workers': self.server.pool.workers})
+        elif collection == 'jobs' and job_id is None:
+            status = query.get('status', [None])[0]
+            try:
+                limit = int(query.get('limit', ['100'])[0])
+            except ValueError:
+                self._error(HTTPStatus.BAD_REQUEST, "limit must be an integer")
+                return
+            self._send(HTTPStatus.OK, {'jobs': self.queue.list(status, min(limit, 1000))})
+        elif collection == 'jobs' and resource is None:
+            job = self.queue.get(job_id, include_result=False)
+            if job is None:
+                self._error(HTTPStatus.NOT_FOUND, f"Unknown job {job_id}")
+            else:
+                self._send(HTTPStatus.OK, job)
+        elif collection == 'jobs' and resource == 'result':
+            job = self.queue.get(job_id)
+            if job is None:
+                self._error(HTTPStatus.NOT_FOUND, f"Unknown job {job_id}")
+            elif job['status'] not in FINISHED_STATES:
+                self._error(HTTPStatus.CONFLICT, f"Job {job_id} is {job['status']}")
+            else:
+                self._send(HTTPStatus.OK, {'id': job_id, 'status': job['status'],
+                                           'result': job['result'], 'error': job['error']})
+        else:
+            self._error(HTTPStatus.NOT_FOUND, "Not found")
+
+    def do_POST(self):
+        collection, job_id, _, _ = self._route()
+        if collection != 'jobs' or job_id is not None:
+            self._error(HTTPStatus.NOT_FOUND, "Not found")
+            return
+
+        length = self.headers.get('Content-Length') or '0'
+        if not length.isdigit():
+            self._error(HTTPStatus.BAD_REQUEST, "Invalid Content-Length")
+            return
+        if int(length) > MAX_BODY_SIZE:
+            self._error(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Request body too large")
+            return
+        try:
+            params = json.loads(self.rfile.read(int(length)) or b'{}')
+            if not isinstance(params, dict):
+                raise ValueError("Expected a JSON object")
+            unknown = set(params) - JOB_OPTIONS
+            if unknown:
+                raise ValueError(f"Unknown options: {', '.join(sorted(unknown))}")
+            if not isinstance(params.get('path'), str) or not os.path.isdir(params['path']):
+                raise ValueError(f"Not a directory: {params.get('path')}")
+            params['path'] = os.path.abspath(params['path'])
+            params['output'] = self.server.resolve_output(
+                params['output'] if params.get('output') is not None else self.server.default_output(params['path'])
+            )
+            if params.get('rules'):
+                params['rules'] = self.server.check_rules(params['rules'])
+        except ValueError as e:
+            self._error(HTTPStatus.BAD_REQUEST, str(e))
+            return
+
+        try:
+            job_id = self.queue.submit(params)
+        except QueueFullError as e:
+            self._error(HTTPStatus.TOO_MANY_REQUESTS, f"Queue full: {e}", {'Retry-After': '5'})
+            return
+        self._send(HTTPStatus.ACCEPTED, self.queue.get(job_id, include_result=False),
+                   {'Location': f"/jobs/{job_id}"})
+
+    def do_DELETE(self):
+        collection, job_id, resource, _ = self._route()
+        if collection != 'jobs' or job_id is None or resource is not None:
+            self._error(HTTPStatus.NOT_FOUND, "Not found")
+            return
+        status = self.queue.cancel(job_id)
+        if status is None:
+            self._error(HTTPStatus.NOT_FOUND, f"Unknown job {job_id}")
+        else:
+            self._send(HTTPStatus.ACCEPTED, {'id': job_id, 'status': status})
+
+
+class JobServer(ThreadingHTTPServer):
+    """HTTP server exposing a job queue and running its worker pool."""
+
+    daemon_threads = True
+
+    def __init__(self, host: str, port: int, queue: JobQueue, workers: int = 2,
+                 retention_seconds: float = 7 * 24 * 3600,
+                 output_root: Union[str, Path, None] = None,
+                 rule_files: Iterable[Union[str, Path]] = ()):
+        """
+        Initialize the server.
+
+        Args:
+            host: Interface to bind (use 127.0.0.1 unless behind a trusted proxy)
+            port: TCP port
+            queue: Job queue
+            workers: Worker processes running jobs
+            retention_seconds: Age after which finished jobs are deleted
+            output_root: Directory holding the output directories jobs may
+                request (default: ~/.project-prompt/job-outputs)
+            rule_files: Rule packs jobs may request
+        """
+        super().__init__((host, port), _JobRequestHandler)
+        self.queue = queue
+        self.pool = JobWorkerPool(queue, workers=workers, retention_seconds=retention_seconds)
+        self.output_root = os.path.realpath(output_root or DEFAULT_OUTPUT_ROOT)
+        self.rule_files = {os.path.realpath(rule_file) for rule_file in rule_files}
+
+    @staticmethod
+    def default_output(path: str) -> str:
+        """Output directory name of a project submitted without one."""
+        digest = hashlib.sha1(path.encode('utf-8')).hexdigest()[:8]
+        return f"{sanitize_filename(os.path.basename(path)) or 'project'}-{digest}"
+
+    def resolve_output(self, output: Any) -> str:
+        """
+        Resolve a requested output directory under the output root.
+
+        Args:
+            output: Directory requested by a client, relative to the output
+                root or absolute
+
+        Returns:
+            Absolute output directory
+
+        Raises:
+            ValueError: If the directory is not inside the output root
+        """
+        if not isinstance(output, str) or not output:
+            raise ValueError("output must be a directory name")
+        resolved = os.path.realpath(os.path.join(self.output_root, output))
+        if os.path.commonpath([resolved, self.output_root]) != self.output_root:
+            raise ValueError(f"output must be inside {self.output_root}")
+        return resolved
+
+    def check_rules(self, rules: Any) -> List[str]:
+        """
+        Check that requested rule packs are on the allowlist.
+
+        Args:
+            rules: Rule pack paths requested by a client
+
+        Returns:
+            Absolute rule pack paths
+
+        Raises:
+            ValueError: If a rule pack is not allowed
+        """
+        if not isinstance(rules, list) or not all(isinstance(rule_file, str) for rule_file in rules):
+            raise ValueError("rules must be a list of rule pack paths")
+        resolved = [os.path.realpath(rule_file) for rule_file in rules]
+        refused = [rule_file for rule_file, path in zip(rules, resolved) if path not in self.rule_files]
+        if refused:
+            raise ValueError(f"Rule packs not allowed: {', '.join(refused)}")
+        return resolved
+
+    def run(self):
+        """Start the workers and serve until interrupted."""
+        self.pool.start()
+        try:
+            self.serve_forever()
+        finally:
+            self.server_close()
+            self.pool.stop()
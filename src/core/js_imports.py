@@ -0,0 +1,208 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Import extraction for JavaScript and TypeScript sources.
+
+A single left-to-right pass over the source. Candidate keywords
+(import/export/require) are located with str.find, and a scanner regex
+steps over comments, strings, template literals and regular expression
+literals between them, so keywords inside those are ignored and quotes
+inside them cannot derail the scan; template literals are followed into
+their ${...} expressions. Every scanner alternative starts with one of a
+few characters, which lets the regex engine skip ordinary code without
+trying each alternative, and the scan stops at the last candidate keyword.
+Captured forms:
+
+    import x, { y } from 'a'        import type { T } from 'a'
+    import 'a'                      export { y } from 'a'
+    export * as ns from 'a'         import('a'), await import(`a`)
+    require('a')                    import x = require('a')
+
+Every pattern applied after a keyword is anchored and bounded by the
+statement, so long lines cannot cause backtracking. A string that is not
+closed on its line ends there, which keeps JSX text such as "don't" from
+swallowing the rest of the file.
+
+Minified and generated bundles (very long lines) have no useful imports and
+are the largest files in most trees; looks_minified detects them from the
+first kilobytes so callers can skip reading the rest.
+"""
+
+import re
+from typing import List, Set
+
+# Characters read to decide whether a file is minified
+MINIFIED_SAMPLE_CHARS = 64 * 1024
+
+# A line this long only occurs in minified or generated code
+MINIFIED_MAX_LINE = 4096
+
+# Hand-written code averages well below this many characters per line
+MINIFIED_MEAN_LINE = 250
+
+_KEYWORDS = ('import', 'export', 'require')
+_KEYWORD = re.compile(r"(?<![\w$.])(?:import|export|require)(?![\w$])")
+
+# Comments and strings are matched whole; a backtick or slash alone is handled by the caller.
+# No named groups: they would stop the engine from skipping to the first character.
+_TOKEN = r"""
+    //[^\n]*
+    |/\*[^*]*\*+(?:[^/*][^*]*\*+)*/|/\*[\s\S]*
+    |'[^'\\\n]*(?:\\[\s\S][^'\\\n]*)*'?
+    |"[^"\\\n]*(?:\\[\s\S][^"\\\n]*)*"?
+    |`|/
+"""
+
+# Outside template expressions braces do not matter
+_SCAN = re.compile(_TOKEN, re.VERBOSE)
+# Inside ${...} they are counted to find the end of the expression
+_SCAN_BRACES = re.compile(_TOKEN + r"|\{|\}", re.VERBOSE)
+
+# Template text up to its closing backtick or the next ${
+_TEMPLATE_TEXT = re.compile(r"[^`\\$]*(?:(?:\\[\s\S]|\$(?!\{))[^`\\$]*)*(?:`|\$\{)?")
+_REGEX_LITERAL = re.compile(r"(?:[^/\\\[\n]|\\.|\[(?:[^\]\\\n]|\\.)*\])+/")
+
+_SPECIFIER = r"""(?:'(?P<single>[^'\\\n]*)'|"(?P<double>[^"\\\n]*)")"""
+# After 'import' or 'export': the clause and its 'from', or a side-effect import
+_FROM = re.compile(r"""
+    (?:\s*(?:/\*[^*]*\*/\s*)*)
+    (?:
+        (?:type\s+)?
+        [\w$*{}\s,]*?\bfrom\s*
+    )?
+""" + _SPECIFIER, re.VERBOSE)
+_EXPORT_FROM = re.compile(r"""
+    \s*(?:type\s+)?
+    (?:\*(?:\s*as\s+[\w$]+)?|\{[^{}'"`;()]*\})
+    \s*from\s*
+""" + _SPECIFIER, re.VERBOSE)
+# import(...) and require(...) with a literal argument
+_CALL = re.compile(r"""
+    \s*\(\s*
+    (?:'(?P<single>[^'\\\n]*)'|"(?P<double>[^"\\\n]*)"|`(?P<template>[^`\\$]*)`)
+    \s*[,)]
+""", re.VERBOSE)
+
+# Tokens after which a slash starts a regular expression rather than a division
+_REGEX_PRECEDERS = set('(,=:[!&|?{};+-*%<>~^')
+_REGEX_KEYWORDS = ('return', 'typeof', 'case', 'do', 'else', 'in', 'of', 'void', 'yield', 'await', 'delete')
+
+
+def looks_minified(sample: str) -> bool:
+    """
+    Whether a source looks minified or generated, judging by its line lengths.
+
+    Args:
+        sample: Beginning of the source (MINIFIED_SAMPLE_CHARS characters suffice)
+
+    Returns:
+        True if the sample has a very long line or a high mean line length
+    """
+    lines = sample.split('\n')
+    if any(len(line) >= MINIFIED_MAX_LINE for line in lines):
+        return True
+    return len(sample) >= 1024 and len(sample) / len(lines) >= MINIFIED_MEAN_LINE
+
+
+def extract_js_imports(source: str) -> Set[str]:
+    """
+    Module specifiers imported by a JavaScript or TypeScript source.
+
+    Args:
+        source: Source text
+
+    Returns:
+        Set of imported specifiers ('./x', 'react', '@/lib/y', ...)
+    """
+    imports = set()
+    keywords = sorted(position for keyword in _KEYWORDS for position in _find_all(source, keyword))
+    # Brace depth at which each open template expression ends
+    templates = []
+    depth = 0
+    pos = 0
+    # No comment, string or template after pos: every later keyword is code
+    exhausted = False
+    for keyword_start in keywords:
+        # Step over the tokens before the keyword; pos ends past it if a token contains it
+        while pos < keyword_start and not exhausted:
+            for match in (_SCAN_BRACES if templates else _SCAN).finditer(source, pos):
+                start, end = match.span()
+                if start > keyword_start:
+                    pos = max(pos, keyword_start)
+                    break
+                pos = end
+                if end - start > 1:
+                    # A whole comment or string
+                    continue
+                char = source[start]
+                if char == '`' or (char == '}' and templates and depth == templates[-1]):
+                    if char == '}':
+                        templates.pop()
+                        depth -= 1
+                    pos = _TEMPLATE_TEXT.match(source, pos).end()
+                    if source.endswith('${', 0, pos):
+                        depth += 1
+                        templates.append(depth)
+                    break
+                if char == '{':
+                    depth += 1
+                elif char == '}':
+                    depth -= 1
+                elif char == '/' and _starts_regex(source, start):
+                    literal = _REGEX_LITERAL.match(source, pos)
+                    if literal is not None:
+                        pos = literal.end()
+                        break
+            else:
+                exhausted = True
+        if exhausted:
+            pos = max(pos, keyword_start)
+        if pos != keyword_start:
+            continue
+
+        keyword = _KEYWORD.match(source, keyword_start)
+        if keyword is None:
+            pos = keyword_start + 1
+            continue
+        pos = keyword.end()
+        if keyword.group() == 'export':
+            statement = _EXPORT_FROM.match(source, pos)
+        else:
+            statement = _CALL.match(source, pos)
+            if statement is None and keyword.group() == 'import':
+                statement = _FROM.match(source, pos)
+        if statement is not None:
+            specifier = next(value for value in statement.groupdict().values() if value is not None)
+            if specifier:
+                imports.add(specifier)
+            pos = statement.end()
+    return imports
+
+
+def _find_all(source: str, word: str) -> List[int]:
+    """Positions of every occurrence of word in source."""
+    positions = []
+    position = source.find(word)
+    while position != -1:
+        positions.append(position)
+        position = source.find(word, position + len(word))
+    return positions
+
+
+def _starts_regex(source: str, slash: int) -> bool:
+    """Whether the slash at position slash opens a regular expression literal."""
+    end = slash
+    while end > 0 and source[end - 1] in ' \t\r\n':
+        end -= 1
+    if end == 0:
+        return True
+    previous = source[end - 1]
+    if previous in _REGEX_PRECEDERS:
+        return True
+    if previous.isalpha():
+        start = end
+        while start > 0 and (source[start - 1].isalnum() or source[start - 1] in '_$'):
+            start -= 1
+        return source[start:end] in _REGEX_KEYWORDS
+    return False
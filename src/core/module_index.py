@@ -0,0 +1,315 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module index for import resolution.
+
+Built once per dependency analysis from the analyzed file list, it maps an
+import to the file that defines it in time proportional to the depth of
+the import, independently of the number of files:
+
+- A trie of module paths (directories and module names from the project
+  root) resolves dotted imports with longest-prefix semantics:
+  `import pkg.mod.Class` resolves to pkg/mod.py, `import pkg` to
+  pkg/__init__.py. Python imports are looked up from each ancestor package
+  of the importing file, nearest first, which covers scripts importing
+  siblings as well as imports from the project root; the match covering
+  the most components wins.
+- A suffix index (every trailing part of every module path) resolves
+  imports whose package root is not an ancestor of the importing file,
+  e.g. tests importing src/mylib as `mylib`. Ambiguous suffixes go to the
+  shortest path, then the first in path order, so results do not depend
+  on file order.
+- JavaScript/TypeScript relative imports ('./x', '../y') are resolved
+  against the importing file's directory with the usual extension and
+  index-file lookup.
+
+Imports resolve only to files of the same language family, and imports
+of modules that are not in the project (standard library, packages)
+resolve to nothing.
+
+Files can be added and removed after the index is built (incremental
+analysis); an import can only resolve differently afterwards if it names
+the module of a changed file (see ModuleIndex.add).
+"""
+
+import posixpath
+from typing import Dict, Iterable, List, Optional, Tuple
+
+PYTHON_EXTENSIONS = ('.py', '.pyi')
+JS_EXTENSIONS = ('.ts', '.tsx', '.js', '.jsx', '.mjs', '.cjs')
+
+_FAMILIES = {extension: 'python' for extension in PYTHON_EXTENSIONS}
+_FAMILIES.update({extension: 'js' for extension in JS_EXTENSIONS})
+
+# File names standing for their directory
+_PACKAGE_FILES = {'python': '__init__', 'js': 'index'}
+
+
+class _Node:
+    """Trie node: one directory or module name."""
+
+    __slots__ = ('children', 'file')
+
+    def __init__(self):
+        self.children: Dict[str, '_Node'] = {}
+        self.file: Optional[str] = None
+
+
+def _split_extension(path: str) -> Tuple[str, str]:
+    stem, extension = posixpath.splitext(path)
+    return stem, extension.lower()
+
+
+def _preferred(candidate: str, current: Optional[str]) -> bool:
+    """Whether candidate should replace current for an ambiguous module name."""
+    if current is None:
+        return True
+    return (candidate.count('/'), candidate) < (current.count('/'), current)
+
+
+class _FamilyIndex:
+    """Trie and suffix index of the files of one language family."""
+
+    def __init__(self):
+        self.root = _Node()
+        self.suffixes: Dict[str, str] = {}
+        # path -> (module parts, package file), to re-elect files when one is removed
+        self.files: Dict[str, Tuple[Tuple[str, ...], bool]] = {}
+
+    def add(self, path: str, parts: List[str], package: bool):
+        self.files[path] = (tuple(parts), package)
+        node = self.root
+        for part in parts:
+            node = node.children.setdefault(part, _Node())
+        # A package (__init__.py, index.js) takes precedence over a module of the same name
+        if node.file is None or package:
+            node.file = path
+        for start in range(len(parts)):
+            key = '/'.join(parts[start:])
+            if _preferred(path, self.suffixes.get(key)):
+                self.suffixes[key] = path
+
+    def remove(self, path: str):
+        parts, package = self.files.pop(path)
+        node = self.root
+        for part in parts:
+            node = node.children[part]
+        if node.file == path:
+            node.file = None
+        stale = set()
+        for start in range(len(parts)):
+            key = '/'.join(parts[start:])
+            if self.suffixes.get(key) == path:
+                del self.suffixes[key]
+                stale.add(key)
+        if node.file is None or stale:
+            # Only files with the same module name can take the removed file's place
+            for other, (other_parts, other_package) in self.files.items():
+                if other_parts[-1] != parts[-1]:
+                    continue
+                if other_parts == parts and (node.file is None or other_package):
+                    node.file = other
+                for start in range(len(other_parts)):
+                    key = '/'.join(other_parts[start:])
+                    if key in stale and _preferred(other, self.suffixes.get(key)):
+                        self.suffixes[key] = other
+
+    def longest_prefix(self, node: _Node, parts: List[str]) -> Tuple[int, Optional[str]]:
+        """Deepest file on the path of parts below node, as (components matched, file)."""
+        matched, found = 0, None
+        for depth, part in enumerate(parts, 1):
+            node = node.children.get(part)
+            if node is None:
+                break
+            if node.file is not None:
+                matched, found = depth, node.file
+        return matched, found
+
+    def ancestors(self, directory: List[str]) -> List[_Node]:
+        """Trie nodes of the root and of each directory down to directory."""
+        nodes = [self.root]
+        for part in directory:
+            node = nodes[-1].children.get(part)
+            if node is None:
+                break
+            nodes.append(node)
+        return nodes
+
+    def suffix_match(self, parts: List[str]) -> Optional[str]:
+        for end in range(len(parts), 0, -1):
+            found = self.suffixes.get('/'.join(parts[:end]))
+            if found is not None:
+                return found
+        return None
+
+
+class ModuleIndex:
+    """Resolves imports to analyzed files (see the module documentation)."""
+
+    def __init__(self, files: Iterable[str]):
+        """
+        Index files by module path.
+
+        Args:
+            files: Analyzed file paths, relative to the project root
+        """
+        self._paths: Dict[str, str] = {}
+        # Imports of one file are resolved in a row: keep the last file's directory lookups
+        self._context_source: Optional[str] = None
+        self._context: Tuple[Optional[str], List[str], List[_Node]] = (None, [], [])
+        self._families: Dict[str, _FamilyIndex] = {'python': _FamilyIndex(), 'js': _FamilyIndex()}
+        for path in files:
+            self.add(path)
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def __contains__(self, path: str) -> bool:
+        return path.replace('\\', '/') in self._paths
+
+    def add(self, path: str) -> Optional[str]:
+        """
+        Index a file.
+
+        Imports whose resolution may change are those containing the
+        returned module name as a whole component (or, for JavaScript
+        directory imports such as '..', no name at all).
+
+        Args:
+            path: File path, relative to the project root
+
+        Returns:
+            Module name of the file (last module component), or None if it is not a module
+        """
+        normalized = path.replace('\\', '/')
+        self._paths[normalized] = path
+        self._context_source = None
+        module = _module_parts(normalized)
+        if module is None:
+            return None
+        family, parts, package = module
+        self._families[family].add(path, parts, package)
+        return parts[-1]
+
+    def remove(self, path: str) -> Optional[str]:
+        """
+        Remove a file from the index.
+
+        Args:
+            path: File path as given to the index
+
+        Returns:
+            Module name of the file (see add), or None if it was not an indexed module
+        """
+        normalized = path.replace('\\', '/')
+        path = self._paths.pop(normalized, None)
+        if path is None:
+            return None
+        self._context_source = None
+        module = _module_parts(normalized)
+        if module is None:
+            return None
+        family, parts, _ = module
+        self._families[family].remove(path)
+        return parts[-1]
+
+    def resolve(self, import_name: str, source_file: str) -> Optional[str]:
+        """
+        Resolve an import to the file it refers to.
+
+        Args:
+            import_name: Imported module ('pkg.mod', '.sibling', './x', 'lib/y')
+            source_file: File containing the import
+
+        Returns:
+            Path of the imported file (as given to the index), or None
+        """
+        if source_file != self._context_source:
+            self._context_source = source_file
+            self._context = self._source_context(source_file)
+        family, directory, ancestors = self._context
+        if family is None or not import_name:
+            return None
+        if family == 'python':
+            return self._resolve_python(import_name, directory, ancestors)
+        return self._resolve_js(import_name, directory)
+
+    def _source_context(self, source_file: str) -> Tuple[Optional[str], List[str], List[_Node]]:
+        """Language family, directory parts and Python package trie nodes of an importing file."""
+        source = source_file.replace('\\', '/')
+        family = _FAMILIES.get(_split_extension(source)[1])
+        directory = [part for part in posixpath.dirname(source).split('/') if part and part != '.']
+        ancestors = self._families['python'].ancestors(directory) if family == 'python' else []
+        return family, directory, ancestors
+
+    def _resolve_python(self, import_name: str, directory: List[str], ancestors: List[_Node]) -> Optional[str]:
+        index = self._families['python']
+        dotted = import_name.lstrip('.')
+        parts = [part for part in dotted.split('.') if part]
+
+        level = len(import_name) - len(dotted)
+        if level:
+            # Relative import: from the importing package, one level up per extra dot
+            depth = len(directory) - (level - 1)
+            if depth < 0 or depth >= len(ancestors):
+                return None
+            if not parts:
+                return ancestors[depth].file
+            return index.longest_prefix(ancestors[depth], parts)[1]
+
+        if not parts:
+            return None
+        best_matched, best = 0, None
+        for node in reversed(ancestors):
+            matched, found = index.longest_prefix(node, parts)
+            if matched > best_matched:
+                best_matched, best = matched, found
+                if matched == len(parts):
+                    break
+        return best if best is not None else index.suffix_match(parts)
+
+    def _resolve_js(self, import_name: str, directory: List[str]) -> Optional[str]:
+        spec = import_name.split('?', 1)[0].split('#', 1)[0]
+        if spec.startswith('.'):
+            target = posixpath.normpath(posixpath.join('/'.join(directory), spec))
+            if target == '..' or target.startswith('../'):
+                return None
+            return self._find_js_file('' if target == '.' else target)
+
+        # Bare specifier: a project module imported through a path alias or package name
+        parts = [part for part in _split_js_specifier(spec).split('/') if part]
+        if parts and parts[0] in ('@', '~'):
+            parts = parts[1:]
+        return self._families['js'].suffix_match(parts) if parts else None
+
+    def _find_js_file(self, target: str) -> Optional[str]:
+        """Look a relative import target up as a file, with an extension or as a directory index."""
+        candidates = [target] if target else []
+        candidates += [target + extension for extension in JS_EXTENSIONS] if target else []
+        prefix = f"{target}/" if target else ''
+        candidates += [f"{prefix}index{extension}" for extension in JS_EXTENSIONS]
+        for candidate in candidates:
+            path = self._paths.get(candidate)
+            if path is not None and _FAMILIES.get(_split_extension(candidate)[1]) == 'js':
+                return path
+        return None
+
+
+def _module_parts(normalized: str) -> Optional[Tuple[str, List[str], bool]]:
+    """Language family, module path parts and package flag of a file (None if not a module)."""
+    stem, extension = _split_extension(normalized)
+    family = _FAMILIES.get(extension)
+    if family is None:
+        return None
+    parts = [part for part in stem.split('/') if part and part != '.']
+    package = len(parts) > 1 and parts[-1] == _PACKAGE_FILES[family]
+    if package:
+        parts.pop()
+    return (family, parts, package) if parts else None
+
+
+def _split_js_specifier(spec: str) -> str:
+    """Drop a known script extension from a module specifier."""
+    stem, extension = _split_extension(spec)
+    return stem if extension in _FAMILIES else spec
@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Atomic, parallel writer for analysis output files.
+
+Outputs are rendered in a thread pool. Each rendered file is compared with
+the existing file by size and SHA-256 hash and skipped when identical, so
+re-running an analysis on an unchanged project leaves the output tree
+untouched. Changed files are written to a temporary file in the same
+directory and moved into place with os.replace, so concurrent readers see
+either the old or the new file, never a partial one.
+"""
+
+import os
+import hashlib
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple, Union
+
+from .progress import ProgressCallback, ProgressTracker
+
+logger = logging.getLogger(__name__)
+
+# Renders the content of one output file (text is encoded as UTF-8)
+Renderer = Callable[[], Union[str, bytes]]
+
+# Mode of new files before the process umask, as open() uses
+NEW_FILE_MODE = 0o666
+
+
+def write_atomic(path: Union[str, Path], data: bytes):
+    """
+    Write data to path through a temporary file and an atomic rename.
+
+    A new file gets the permissions a plain write would give it (the
+    kernel applies the umask); an existing file keeps its permissions.
+
+    Args:
+        path: Destination file
+        data: File content
+    """
+    path = Path(path)
+    try:
+        mode = os.stat(path).st_mode & 0o777
+    except OSError:
+        mode = None
+
+    fd, tmp_path = _create_temporary(path)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        if mode is not None:
+            os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _create_temporary(path: Path) -> Tuple[int, str]:
+    """Create a new temporary file next to path and return its descriptor and path."""
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0)
+    while True:
+        tmp_path = os.path.join(path.parent, f".{path.name}.{os.urandom(6).hex()}.tmp")
+        try:
+            return os.open(tmp_path, flags, NEW_FILE_MODE), tmp_path
+        except FileExistsError:
+            continue
+
+
+def is_unchanged(path: Union[str, Path], data: bytes) -> bool:
+    """
+    Check whether a file already holds exactly data.
+
+    Args:
+        path: Existing file
+        data: New content
+
+    Returns:
+        True if the file exists with the same size and hash
+    """
+    try:
+        if os.path.getsize(path) != len(data):
+            return False
+        with open(path, 'rb') as f:
+            existing = f.read()
+    except OSError:
+        return False
+    return hashlib.sha256(existing).digest() == hashlib.sha256(data).digest()
+
+
+class OutputWriter:
+    """Renders and writes output files in parallel, skipping unchanged ones."""
+
+    def __init__(self, max_workers: Optional[int] = None):
+        """
+        Initialize the writer.
+
+        Args:
+            max_workers: Render/write threads (default: min(8, CPU count + 4))
+        """
+        self.max_workers = max_workers or min(8, (os.cpu_count() or 1) + 4)
+        self.stats = {'written': 0, 'unchanged': 0}
+
+    def write_all(self, outputs: Dict[Path, Renderer],
+                  progress_callback: Optional[ProgressCallback] = None) -> Dict[str, int]:
+        """
+        Render and write every output.
+
+        Parent directories must exist. Errors are raised after all other
+        outputs have been processed.
+
+        Args:
+            outputs: Dictionary destination path -> renderer
+            progress_callback: Receives a 'write' progress event as outputs complete
+
+        Returns:
+            Statistics with the number of files written and left unchanged
+        """
+        self.stats = {'written': 0, 'unchanged': 0}
+        if not outputs:
+            return dict(self.stats)
+
+        progress = ProgressTracker(progress_callback)
+        progress.stage('write', total=len(outputs), unit='outputs')
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(outputs))) as executor:
+            futures = {path: executor.submit(self._write_one, path, render) for path, render in outputs.items()}
+            for future in as_completed(futures.values()):
+                progress.advance()
+        progress.finish()
+
+        error = None
+        for path, future in futures.items():
+            try:
+                written = future.result()
+            except Exception as e:
+                logger.error(f"Could not write {path}: {e}")
+                error = error or e
+                continue
+            self.stats['written' if written else 'unchanged'] += 1
+
+        if error is not None:
+            raise error
+        return dict(self.stats)
+
+    def _write_one(self, path: Path, render: Renderer) -> bool:
+        """Render one output and write it unless unchanged. Returns True if written."""
+        data = render()
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        if is_unchanged(path, data):
+            return False
+        write_atomic(path, data)
+        return True
@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Streaming stages for the analysis pipeline.
+
+A stage is a generator function that transforms an iterator of items.
+Stages are chained lazily, so every item flows through all stages before
+it is released and nothing is materialized between them. With threading
+enabled, each stage runs on its own thread and hands items to the next one
+through a bounded queue: a slow consumer blocks its producer instead of
+letting items pile up, which keeps memory flat regardless of input size.
+"""
+
+import queue
+import threading
+from typing import Callable, Iterable, Iterator, List, TypeVar
+
+T = TypeVar('T')
+
+Stage = Callable[[Iterator], Iterator]
+
+# Default capacity of the queue between two stages
+DEFAULT_QUEUE_SIZE = 256
+
+# Marks the end of a stage's output
+_DONE = object()
+
+
+class _StageFailure:
+    """Carries an exception raised by a stage to the consuming thread."""
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+def buffered(items: Iterable[T], maxsize: int = DEFAULT_QUEUE_SIZE) -> Iterator[T]:
+    """
+    Iterate items on a background thread, handing them over through a bounded queue.
+
+    Exceptions raised while producing items are re-raised in the consumer.
+    Closing the returned iterator stops the producer.
+
+    Args:
+        items: Items to produce (typically the output of a stage)
+        maxsize: Queue capacity
+
+    Yields:
+        The items, in order
+    """
+    handoff = queue.Queue(maxsize=max(1, maxsize))
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                handoff.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        iterator = iter(items)
+        try:
+            for item in iterator:
+                if not put(item):
+                    return
+        except BaseException as e:
+            put(_StageFailure(e))
+            return
+        finally:
+            close = getattr(iterator, 'close', None)
+            if close is not None:
+                close()
+        put(_DONE)
+
+    thread = threading.Thread(target=produce, name='analysis-stage', daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = handoff.get()
+            if item is _DONE:
+                return
+            if isinstance(item, _StageFailure):
+                raise item.error
+            yield item
+    finally:
+        stop.set()
+        thread.join()
+
+
+def run_stages(source: Iterable, stages: List[Stage], threaded: bool = True,
+               queue_size: int = DEFAULT_QUEUE_SIZE) -> Iterator:
+    """
+    Chain stages over a source.
+
+    Args:
+        source: Items entering the first stage
+        stages: Stage functions, applied in order
+        threaded: Run the source and every stage on separate threads
+        queue_size: Capacity of each queue between threads
+
+    Returns:
+        Iterator over the output of the last stage
+    """
+    items = iter(source)
+    for stage in stages:
+        if threaded:
+            items = buffered(items, queue_size)
+        items = stage(items)
+    if threaded:
+        items = buffered(items, queue_size)
+    return items
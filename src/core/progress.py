@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Progress events of long-running analysis stages.
+
+A ProgressTracker turns "one more file done" calls into throttled event
+dictionaries for a progress callback:
+
+    {
+        'stage': 'scan',          # stage name (see STAGE_LABELS)
+        'unit': 'files',          # what done/total count
+        'done': 1200,             # units processed so far
+        'total': 5000,            # estimated units, or None when unknown
+        'bytes': 18874368,        # bytes processed so far
+        'elapsed': 2.4,           # seconds since the stage started
+        'rate': 500.0,            # units per second
+        'byte_rate': 7864320.0,   # bytes per second
+        'eta': 7.6,               # estimated seconds left, or None
+        'finished': False,        # True on the last event of the stage
+    }
+
+Events are emitted at most every `interval` seconds while a stage runs, plus
+once when it starts and once when it finishes, so a callback can redraw a
+status line on every event. Totals are estimates (e.g. a directory count
+that does not apply .gitignore) and are raised when exceeded.
+"""
+
+import time
+from typing import Any, Callable, Dict, Optional
+
+# Receives progress event dictionaries
+ProgressCallback = Callable[[Dict[str, Any]], None]
+
+# Human-readable stage names
+STAGE_LABELS = {
+    'count': 'Counting files',
+    'scan': 'Scanning files',
+    'score': 'Scoring functionalities',
+    'dependencies': 'Resolving dependencies',
+    'grouping': 'Validating groups',
+    'write': 'Writing outputs',
+    'shards': 'Analyzing shards',
+    'merge': 'Merging shards',
+    'context': 'Loading group context',
+    'prompt': 'Building prompt',
+    'suggest': 'Generating suggestions',
+    'save': 'Saving results',
+}
+
+# Minimum seconds between two events of a running stage
+DEFAULT_INTERVAL = 0.1
+
+
+class ProgressTracker:
+    """Tracks the current stage of an analysis and reports it to a callback."""
+
+    def __init__(self, callback: Optional[ProgressCallback] = None, interval: float = DEFAULT_INTERVAL):
+        """
+        Initialize the tracker.
+
+        Args:
+            callback: Receives progress events (None disables tracking)
+            interval: Minimum seconds between two events of a running stage
+        """
+        self.callback = callback
+        self.interval = interval
+        self.stage_name: Optional[str] = None
+        self.unit = 'files'
+        self.total: Optional[int] = None
+        self.done = 0
+        self.bytes = 0
+        self._started = 0.0
+        self._last_emit = 0.0
+
+    def stage(self, name: str, total: Optional[int] = None, unit: str = 'files'):
+        """
+        Start a stage, finishing the current one.
+
+        Args:
+            name: Stage name
+            total: Estimated units of work (None if unknown)
+            unit: What the units are (files, shards, outputs, ...)
+        """
+        if self.callback is None:
+            return
+        self.finish()
+        self.stage_name = name
+        self.unit = unit
+        self.total = total
+        self.done = 0
+        self.bytes = 0
+        self._started = self._last_emit = time.monotonic()
+        self._emit(self._started, False)
+
+    def advance(self, count: int = 1, size: int = 0):
+        """
+        Record processed units.
+
+        Args:
+            count: Units processed
+            size: Bytes processed
+        """
+        if self.callback is None or self.stage_name is None:
+            return
+        self.done += count
+        self.bytes += size
+        now = time.monotonic()
+        if now - self._last_emit >= self.interval:
+            self._last_emit = now
+            self._emit(now, False)
+
+    def finish(self):
+        """Finish the current stage (no-op without one)."""
+        if self.callback is None or self.stage_name is None:
+            return
+        self._emit(time.monotonic(), True)
+        self.stage_name = None
+
+    def _emit(self, now: float, finished: bool):
+        if self.total is not None and self.done > self.total:
+            self.total = self.done
+        elapsed = now - self._started
+        rate = self.done / elapsed if elapsed > 0 else 0.0
+        eta = None
+        if not finished and self.total is not None and rate > 0:
+            eta = (self.total - self.done) / rate
+        self.callback({
+            'stage': self.stage_name,
+            'unit': self.unit,
+            'done': self.done,
+            'total': self.done if finished else self.total,
+            'bytes': self.bytes,
+            'elapsed': elapsed,
+            'rate': rate,
+            'byte_rate': self.bytes / elapsed if elapsed > 0 else 0.0,
+            'eta': eta,
+            'finished': finished,
+        })
@@ -0,0 +1,231 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Pluggable rule packs for the FunctionalityDetector.
+
+Rule packs are YAML files that add functionalities (or extend built-in ones)
+with file patterns, content keywords and imported libraries. Packs are compiled into the
+detector matcher structures once and cached on disk, keyed by a hash of
+the rule files, so repeated CLI invocations skip YAML parsing and matcher
+compilation.
+
+Rule pack format:
+
+    functionalities:
+      payments:
+        description: Payment processing and billing
+        files: [payment, billing, checkout]
+        keywords: [payment, invoice, refund]
+        imports: [stripe, braintree]
+
+File patterns are substrings of the lowercased path; '/name/' matches a
+whole path segment and '*.ext' the file extension (see PathMatcher).
+"""
+
+import os
+import json
+import pickle
+import hashlib
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import yaml
+
+from .detector import (
+    SIMPLE_PATTERNS,
+    FUNCTIONALITY_DESCRIPTIONS,
+    ImportMatcher,
+    KeywordMatcher,
+    PathMatcher,
+)
+
+logger = logging.getLogger(__name__)
+
+# Bump when the compiled layout changes so stale caches are ignored
+RULES_CACHE_VERSION = 4
+
+# Rule pack shipped with ProjectPrompt
+DEFAULT_RULES_FILE = os.path.join(os.path.dirname(__file__), '..', '..', 'config', 'detector_rules.yaml')
+
+# Directory holding compiled rule caches
+DEFAULT_CACHE_DIR = Path.home() / '.project-prompt' / 'rule-cache'
+
+
+class CompiledRules:
+    """Detector patterns and their compiled matchers."""
+
+    def __init__(self, patterns: Dict[str, Dict[str, List[str]]], descriptions: Dict[str, str],
+                 fingerprint: str = ''):
+        """
+        Compile matchers for the given patterns.
+
+        Args:
+            patterns: Functionality patterns in SIMPLE_PATTERNS format
+            descriptions: Functionality descriptions
+            fingerprint: Hash of the sources the rules were built from
+        """
+        self.patterns = patterns
+        self.descriptions = descriptions
+        self.fingerprint = fingerprint
+        self.keyword_matcher = KeywordMatcher(patterns)
+        self.path_matcher = PathMatcher(patterns)
+        self.import_matcher = ImportMatcher(patterns)
+
+
+def parse_rule_pack(path: Union[str, Path]) -> Dict[str, Dict]:
+    """
+    Parse and validate a YAML rule pack.
+
+    Args:
+        path: Path of the rule pack
+
+    Returns:
+        Dictionary functionality -> {'description', 'files', 'keywords', 'imports'}
+
+    Raises:
+        ValueError: If the rule pack is malformed
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        try:
+            data = yaml.safe_load(f) or {}
+        except yaml.YAMLError as e:
+            raise ValueError(f"Invalid rule pack {path}: {e}")
+
+    functionalities = data.get('functionalities') if isinstance(data, dict) else None
+    if not isinstance(functionalities, dict):
+        raise ValueError(f"Rule pack {path} must define a 'functionalities' mapping")
+
+    rules = {}
+    for name, spec in functionalities.items():
+        spec = spec or {}
+        if not isinstance(spec, dict):
+            raise ValueError(f"Rule pack {path}: functionality '{name}' must be a mapping")
+
+        rule = {'description': spec.get('description')}
+        for key in ('files', 'keywords', 'imports'):
+            values = spec.get(key) or []
+            if not isinstance(values, list) or not all(isinstance(v, str) and v for v in values):
+                raise ValueError(f"Rule pack {path}: '{name}.{key}' must be a list of strings")
+            rule[key] = values
+        rules[str(name)] = rule
+
+    return rules
+
+
+def compile_rules(rule_files: List[Union[str, Path]], include_builtin: bool = True,
+                  fingerprint: str = '') -> CompiledRules:
+    """
+    Merge rule packs and compile them into detector matchers.
+
+    Packs are applied in order. A functionality defined again extends the
+    existing file patterns, keywords and imports and replaces its description.
+
+    Args:
+        rule_files: Rule pack paths
+        include_builtin: Whether to start from the built-in SIMPLE_PATTERNS
+        fingerprint: Hash recorded on the compiled rules
+
+    Returns:
+        Compiled rules
+    """
+    patterns = {}
+    descriptions = {}
+    if include_builtin:
+        patterns = {name: {key: list(values) for key, values in spec.items()}
+                    for name, spec in SIMPLE_PATTERNS.items()}
+        descriptions = dict(FUNCTIONALITY_DESCRIPTIONS)
+
+    for rule_file in rule_files:
+        for name, rule in parse_rule_pack(rule_file).items():
+            merged = patterns.setdefault(name, {'files': [], 'keywords': [], 'imports': []})
+            for key in ('files', 'keywords', 'imports'):
+                merged[key].extend(v for v in rule[key] if v not in merged[key])
+            if rule['description']:
+                descriptions[name] = rule['description']
+
+    return CompiledRules(patterns, descriptions, fingerprint)
+
+
+def rules_fingerprint(rule_files: List[Union[str, Path]], include_builtin: bool = True) -> str:
+    """
+    Hash the rule sources that determine the compiled rules.
+
+    Args:
+        rule_files: Rule pack paths
+        include_builtin: Whether built-in patterns are part of the rules
+
+    Returns:
+        Hex digest identifying the compiled rules
+    """
+    digest = hashlib.sha256()
+    digest.update(f"v{RULES_CACHE_VERSION}".encode())
+    if include_builtin:
+        digest.update(json.dumps([SIMPLE_PATTERNS, FUNCTIONALITY_DESCRIPTIONS], sort_keys=True).encode())
+    for rule_file in rule_files:
+        with open(rule_file, 'rb') as f:
+            content = f.read()
+        digest.update(hashlib.sha256(content).digest())
+    return digest.hexdigest()
+
+
+def rule_pack_files(rule_files: Optional[List[Union[str, Path]]] = None,
+                    include_default: bool = True) -> List[Union[str, Path]]:
+    """
+    List the rule packs load_rules compiles, in merge order.
+
+    Args:
+        rule_files: Additional rule packs (e.g. per-team rules)
+        include_default: Whether to include the rule pack shipped in config/
+
+    Returns:
+        Rule pack paths
+    """
+    files: List[Union[str, Path]] = []
+    if include_default and os.path.exists(DEFAULT_RULES_FILE):
+        files.append(DEFAULT_RULES_FILE)
+    files.extend(rule_files or [])
+    return files
+
+
+def load_rules(rule_files: Optional[List[Union[str, Path]]] = None, include_default: bool = True,
+               include_builtin: bool = True, cache_dir: Optional[Union[str, Path]] = None) -> CompiledRules:
+    """
+    Load compiled rules, using the on-disk cache when the sources are unchanged.
+
+    Args:
+        rule_files: Additional rule packs (e.g. per-team rules)
+        include_default: Whether to load the rule pack shipped in config/
+        include_builtin: Whether to start from the built-in SIMPLE_PATTERNS
+        cache_dir: Cache directory (default: ~/.project-prompt/rule-cache)
+
+    Returns:
+        Compiled rules
+    """
+    files = rule_pack_files(rule_files, include_default)
+    fingerprint = rules_fingerprint(files, include_builtin)
+    cache_path = Path(cache_dir or DEFAULT_CACHE_DIR) / f"{fingerprint}.pickle"
+
+    try:
+        with open(cache_path, 'rb') as f:
+            rules = pickle.load(f)
+        if isinstance(rules, CompiledRules) and rules.fingerprint == fingerprint:
+            return rules
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable rule cache {cache_path}: {e}")
+
+    rules = compile_rules(files, include_builtin, fingerprint)
+
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(rules, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logger.warning(f"Could not write rule cache {cache_path}: {e}")
+
+    return rules
@@ -10,9 +10,10 @@ Respects .gitignore patterns.
 
 import os
 import time
+import hashlib
 import fnmatch
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Set
+from typing import Dict, Iterable, Iterator, List, Optional, Any, Set
 from collections import Counter
 
 try:
@@ -204,6 +205,7 @@ class ProjectScanner:
         self.files = []
         self.directories = []
         self.languages = {}
+        self._exclude_dirs = set()
         self.stats = {
             'total_files': 0,
             'total_dirs': 0,
@@ -224,7 +226,32 @@ class ProjectScanner:
         Returns:
             ProjectStructure with complete information
         """
-        start_time = time.time()
+        files = list(self.iter_files(project_path))
+        self.files = files
+        return self.get_structure(project_path)
+    
+    def iter_files(self, project_path: str, subdir: Optional[str] = None,
+                   exclude_dirs: Iterable[str] = ()) -> Iterator[FileInfo]:
+        """
+        Scan a project and yield its files as they are found.
+        
+        Files are not retained by the scanner; directories, languages and
+        stats are accumulated and complete once the iteration ends (see
+        get_structure).
+        
+        A part of the project (e.g. one package of a monorepo) is scanned by
+        passing subdir and/or exclude_dirs. Paths stay relative to
+        project_path and the project's .gitignore still applies, so the
+        files are exactly the ones a full scan would find in that part.
+        
+        Args:
+            project_path: Path to project directory
+            subdir: Only scan this directory (relative to project_path)
+            exclude_dirs: Directories (relative to project_path) left out of the scan
+            
+        Yields:
+            FileInfo of every analyzed file
+        """
         self.reset()
         
         if not os.path.isdir(project_path):
@@ -232,14 +259,85 @@ class ProjectScanner:
         
         # Initialize gitignore parser
         self.gitignore_parser = GitignoreParser(project_path)
+        self._exclude_dirs = {os.path.normpath(path) for path in exclude_dirs}
         
         # Scan recursively
-        self._scan_directory(project_path, project_path)
+        if subdir and os.path.normpath(subdir) != '.':
+            subdir = os.path.normpath(subdir)
+            start = os.path.join(project_path, subdir)
+            if not os.path.isdir(start):
+                raise ValueError(f"Path is not a valid directory: {start}")
+            yield from self._scan_directory(start, project_path, depth=subdir.count(os.sep) + 1)
+        else:
+            yield from self._scan_directory(project_path, project_path)
         
         # Analyze main language
         self._analyze_languages()
+    
+    def manifest_digest(self, project_path: str) -> str:
+        """
+        Fingerprint the files a scan of a project could see.
+        
+        Walks the tree with the scan's directory and file filters, without
+        reading files or applying .gitignore patterns (so it covers a
+        superset of the scanned files), and hashes the path, size and
+        modification time of every file. Any change that could alter a scan
+        changes the digest.
+        
+        Args:
+            project_path: Path to project directory
+            
+        Returns:
+            Hex digest of the file manifest
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        for entry in self._walk_candidates(project_path):
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            digest.update(f"{entry.path}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode('utf-8', 'surrogateescape'))
+        return digest.hexdigest()
+    
+    def estimate_file_count(self, project_path: str, subdir: Optional[str] = None,
+                            exclude_dirs: Iterable[str] = ()) -> int:
+        """
+        Quickly estimate how many files a scan will visit (for progress reporting).
+        
+        Counts directory entries with the scan's directory and file filters
+        but without reading files or applying .gitignore patterns, so the
+        estimate is an upper bound. Counting stops at the max_files limit.
         
-        # Build result
+        Args:
+            project_path: Path to project directory
+            subdir: Only count this directory (relative to project_path)
+            exclude_dirs: Directories (relative to project_path) left out
+            
+        Returns:
+            Estimated number of files
+        """
+        start, depth = project_path, 0
+        if subdir and os.path.normpath(subdir) != '.':
+            subdir = os.path.normpath(subdir)
+            start, depth = os.path.join(project_path, subdir), subdir.count(os.sep) + 1
+        excluded = {os.path.join(project_path, os.path.normpath(path)) for path in exclude_dirs}
+        count = 0
+        for _ in self._walk_candidates(start, depth, excluded, ordered=False):
+            count += 1
+            if count >= self.config.max_files:
+                break
+        return count
+    
+    def get_structure(self, project_path: str) -> ProjectStructure:
+        """
+        Build the ProjectStructure of the last scan.
+        
+        Args:
+            project_path: Path to project directory
+            
+        Returns:
+            ProjectStructure with the scanned files (empty when streamed with iter_files)
+        """
         return ProjectStructure(
             root_path=project_path,
             files=self.files,
@@ -251,8 +349,30 @@ class ProjectScanner:
             main_language=self._get_main_language()
         )
     
-    def _scan_directory(self, dir_path: str, base_path: str, depth: int = 0):
-        """Scan directory recursively, respecting .gitignore patterns."""
+    def _walk_candidates(self, start: str, depth: int = 0, excluded: Iterable[str] = (),
+                         ordered: bool = True) -> Iterator[os.DirEntry]:
+        """Yield the entries of files under start that pass the directory and file filters."""
+        pending = [(start, depth)]
+        while pending:
+            dir_path, depth = pending.pop()
+            try:
+                entries = list(os.scandir(dir_path))
+            except OSError:
+                continue
+            if ordered:
+                entries.sort(key=lambda entry: entry.name)
+            for entry in entries:
+                try:
+                    if entry.is_dir():
+                        if depth < 20 and not self._should_ignore_dir(entry.name) and entry.path not in excluded:
+                            pending.append((entry.path, depth + 1))
+                    elif entry.is_file() and not self._should_ignore_file(entry.name):
+                        yield entry
+                except OSError:
+                    continue
+    
+    def _scan_directory(self, dir_path: str, base_path: str, depth: int = 0) -> Iterator[FileInfo]:
+        """Scan directory recursively, respecting .gitignore patterns, yielding its files."""
         if depth > 20:  # Prevent excessive recursion
             return
             
@@ -262,6 +382,8 @@ class ProjectScanner:
         
         # Check if this directory should be ignored by gitignore
         rel_path = os.path.relpath(dir_path, base_path)
+        if rel_path in self._exclude_dirs:
+            return
         if rel_path != '.' and self.gitignore_parser and self.gitignore_parser.should_ignore(rel_path + '/'):
             return
             
@@ -291,7 +413,7 @@ class ProjectScanner:
                 if os.path.isdir(item_path):
                     subdirs_in_dir += 1
                     if not self._should_ignore_dir(item_name):
-                        self._scan_directory(item_path, base_path, depth + 1)
+                        yield from self._scan_directory(item_path, base_path, depth + 1)
                 
                 elif os.path.isfile(item_path):
                     files_in_dir += 1
@@ -299,6 +421,7 @@ class ProjectScanner:
                         file_info = self._scan_file(item_path, base_path)
                         if file_info:
                             dir_size += file_info.size
+                            yield file_info
             
             # Create directory info
             if rel_path != '.':  # Don't add root directory
@@ -315,7 +438,7 @@ class ProjectScanner:
             # Ignore directories without permissions
             pass
     
-    def _scan_file(self, file_path: str, base_path: str):
+    def _scan_file(self, file_path: str, base_path: str) -> Optional[FileInfo]:
         """Scan individual file."""
         self.stats['total_files'] += 1
         
@@ -324,12 +447,11 @@ class ProjectScanner:
             file_size = os.path.getsize(file_path)
             if file_size > self.max_file_size:
                 self.stats['skipped_files'] += 1
-                return
+                return None
             
             # Analyze file
             file_info = self._analyze_file(file_path, base_path)
             if file_info:
-                self.files.append(file_info)
                 self.stats['analyzed_files'] += 1
                 self.stats['total_size_kb'] += file_info.size / 1024  # Convert bytes to KB
                 
@@ -340,9 +462,11 @@ class ProjectScanner:
                         self.languages[language] = {'files': 0, 'size_kb': 0}
                     self.languages[language]['files'] += 1
                     self.languages[language]['size_kb'] += file_info.size / 1024
+            return file_info
             
         except (PermissionError, OSError):
             self.stats['skipped_files'] += 1
+            return None
     
     def _analyze_file(self, file_path: str, base_path: str) -> Optional[FileInfo]:
         """Analyze file and extract basic information."""
@@ -0,0 +1,221 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Vectorized functionality scoring for the FunctionalityDetector.
+
+The detector records every signal it finds as a sparse files x features hit
+matrix (a feature is one file pattern or keyword of one functionality).
+Scores are then computed with NumPy in a few vectorized passes:
+
+1. TF-IDF style weighting: each hit is weighted by its base weight
+   (file pattern or keyword) times the smoothed inverse document frequency
+   of its feature among the files with evidence of its functionality, so
+   signals present in every such file count less.
+2. Per-directory aggregation: weighted hits are summed per directory and
+   functionality and dampened with log1p, so one large directory cannot
+   dominate a functionality on its own.
+3. Normalization: the dampened directory scores of each functionality are
+   averaged over the directories with evidence of it and mapped to a
+   confidence in [0, 1) with 1 - exp(-score / CONFIDENCE_SCALE). Files and
+   directories without evidence of a functionality do not enter its
+   score, which keeps confidences comparable between small and large
+   projects.
+
+The matrix is kept on the detector so grouping can reuse per-file scores.
+"""
+
+from dataclasses import dataclass
+from itertools import chain
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+# Mean directory score at which confidence reaches 1 - 1/e (~63%)
+CONFIDENCE_SCALE = 2.0
+
+
+@dataclass
+class FunctionalityScores:
+    """Scores per functionality, aligned with HitMatrix.functionalities."""
+    raw: np.ndarray
+    weighted: np.ndarray
+    confidence: np.ndarray
+
+
+class HitMatrix:
+    """Sparse files x features hit matrix built while detecting functionalities."""
+
+    def __init__(self, functionalities: List[str]):
+        """
+        Initialize an empty matrix.
+
+        Args:
+            functionalities: Functionality names (matrix column groups)
+        """
+        self.functionalities = list(functionalities)
+        self._functionality_index = {name: i for i, name in enumerate(self.functionalities)}
+        self.files: List[str] = []
+        self.features: List[Tuple[str, str]] = []
+        self._feature_ids: Dict[Tuple[str, str], int] = {}
+        self._feature_functionality: List[int] = []
+        self._feature_weight: List[float] = []
+        self._file_features: List[Tuple[int, ...]] = []
+
+    def feature_ids(self, hits: Dict[str, List[str]], prefix: str, weight: float) -> Tuple[int, ...]:
+        """
+        Translate detector hits into feature ids, registering new features.
+
+        Args:
+            hits: Dictionary functionality -> matched patterns or keywords
+            prefix: Feature kind ('file' or 'keyword')
+            weight: Base weight of a hit on this kind of feature
+
+        Returns:
+            Tuple of feature ids
+        """
+        ids = []
+        for func_name, values in hits.items():
+            for value in values:
+                key = (func_name, f"{prefix}:{value}")
+                feature_id = self._feature_ids.get(key)
+                if feature_id is None:
+                    feature_id = self._register(key, weight)
+                ids.append(feature_id)
+        return tuple(ids)
+
+    def _register(self, key: Tuple[str, str], weight: float) -> int:
+        """Add a new feature (functionality, feature name) and return its id."""
+        feature_id = len(self.features)
+        self._feature_ids[key] = feature_id
+        self.features.append(key)
+        self._feature_functionality.append(self._functionality_index[key[0]])
+        self._feature_weight.append(weight)
+        return feature_id
+
+    def add_file(self, file_path: str, feature_ids: Tuple[int, ...]):
+        """Add a file row with its feature hits."""
+        self.files.append(file_path)
+        self._file_features.append(feature_ids)
+
+    def extend(self, other: 'HitMatrix'):
+        """
+        Append the file rows of another matrix.
+
+        Features are matched by (functionality, feature name), so matrices
+        built separately over disjoint parts of a project (e.g. monorepo
+        shards) combine into the matrix of the whole project, and score()
+        then gives the same result as a single run. Cost is linear in the
+        number of hits.
+
+        Args:
+            other: Matrix to append
+        """
+        for func_name in other.functionalities:
+            if func_name not in self._functionality_index:
+                self._functionality_index[func_name] = len(self.functionalities)
+                self.functionalities.append(func_name)
+        remap = []
+        for key, weight in zip(other.features, other._feature_weight):
+            feature_id = self._feature_ids.get(key)
+            remap.append(self._register(key, weight) if feature_id is None else feature_id)
+        self.files.extend(other.files)
+        self._file_features.extend(tuple(remap[i] for i in row) for row in other._file_features)
+
+    def to_dict(self) -> Dict[str, list]:
+        """Return the matrix as JSON-serializable lists (see from_dict)."""
+        return {
+            'functionalities': self.functionalities,
+            'files': self.files,
+            'features': [list(key) for key in self.features],
+            'weights': self._feature_weight,
+            'rows': [list(row) for row in self._file_features],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, list]) -> 'HitMatrix':
+        """Rebuild a matrix saved with to_dict."""
+        matrix = cls(data['functionalities'])
+        for key, weight in zip(data['features'], data['weights']):
+            matrix._register((key[0], key[1]), weight)
+        matrix.files = list(data['files'])
+        matrix._file_features = [tuple(row) for row in data['rows']]
+        return matrix
+
+    def coo(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return the matrix in coordinate form.
+
+        Returns:
+            (rows, cols) arrays, one entry per hit
+        """
+        lengths = np.fromiter(map(len, self._file_features), dtype=np.int64, count=len(self._file_features))
+        rows = np.repeat(np.arange(len(self._file_features), dtype=np.int64), lengths)
+        cols = np.fromiter(chain.from_iterable(self._file_features), dtype=np.int64, count=int(lengths.sum()))
+        return rows, cols
+
+    def _hit_weights(self, rows: np.ndarray, cols: np.ndarray, func_of_hit: np.ndarray) -> np.ndarray:
+        """TF-IDF style weight of every hit, among the files with evidence of its functionality."""
+        n_funcs = len(self.functionalities)
+        document_frequency = np.bincount(cols, minlength=len(self.features))
+        evidence_files = np.bincount(np.unique(rows * n_funcs + func_of_hit) % n_funcs, minlength=n_funcs)
+        idf = np.log((1.0 + evidence_files[func_of_hit]) / (1.0 + document_frequency[cols])) + 1.0
+        base = np.asarray(self._feature_weight, dtype=np.float64)
+        return base[cols] * idf
+
+    def file_scores(self) -> np.ndarray:
+        """
+        Weighted score of every file for every functionality.
+
+        Returns:
+            Dense array of shape (files, functionalities)
+        """
+        n_funcs = len(self.functionalities)
+        scores = np.zeros((len(self.files), n_funcs), dtype=np.float64)
+        if not self.features:
+            return scores
+
+        rows, cols = self.coo()
+        func_of_hit = np.asarray(self._feature_functionality, dtype=np.int64)[cols]
+        np.add.at(scores, (rows, func_of_hit), self._hit_weights(rows, cols, func_of_hit))
+        return scores
+
+    def score(self) -> FunctionalityScores:
+        """
+        Compute functionality scores.
+
+        Returns:
+            FunctionalityScores with the unweighted hit sum (raw), the mean
+            dampened TF-IDF score of the directories with evidence (weighted)
+            and the normalized confidence per functionality
+        """
+        n_funcs = len(self.functionalities)
+        if not self.features or not self.files:
+            zeros = np.zeros(n_funcs, dtype=np.float64)
+            return FunctionalityScores(raw=zeros, weighted=zeros.copy(), confidence=zeros.copy())
+
+        rows, cols = self.coo()
+        feature_functionality = np.asarray(self._feature_functionality, dtype=np.int64)
+        func_of_hit = feature_functionality[cols]
+
+        # Unweighted sum, equal to the legacy additive score
+        base = np.asarray(self._feature_weight, dtype=np.float64)
+        raw = np.bincount(func_of_hit, weights=base[cols], minlength=n_funcs)
+
+        # Per-directory aggregation of TF-IDF weighted hits
+        directory_ids: Dict[str, int] = {}
+        file_directory = np.fromiter(
+            (directory_ids.setdefault(path.replace('\\', '/').rpartition('/')[0], len(directory_ids))
+             for path in self.files),
+            dtype=np.int64, count=len(self.files)
+        )
+        cell = file_directory[rows] * n_funcs + func_of_hit
+        directory_scores = np.bincount(cell, weights=self._hit_weights(rows, cols, func_of_hit),
+                                       minlength=len(directory_ids) * n_funcs)
+        dampened = np.log1p(directory_scores.reshape(len(directory_ids), n_funcs))
+        # Mean over the directories with evidence of each functionality
+        evidence_directories = np.bincount(np.unique(cell) % n_funcs, minlength=n_funcs)
+        weighted = dampened.sum(axis=0) / np.maximum(evidence_directories, 1)
+
+        confidence = 1.0 - np.exp(-weighted / CONFIDENCE_SCALE)
+        return FunctionalityScores(raw=raw, weighted=weighted, confidence=confidence)
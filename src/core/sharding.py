@@ -0,0 +1,439 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Sharded analysis of monorepos.
+
+A monorepo is split at package boundaries: every directory holding a
+pyproject.toml, package.json or go.mod starts a shard, and the project root
+is a shard for everything outside them. Each shard is analyzed on its own
+(in a worker process, or on another machine writing to a shared directory)
+with paths relative to the project root, the root .gitignore and nested
+shards excluded, so shards partition exactly the files of a full scan.
+
+A shard result carries what a merge needs besides its ProjectAnalysis:
+
+- the detection hit matrix, evidence and matched patterns, so
+  functionality confidences are scored over the whole project;
+- the imports it could not resolve to one of its own files, which the
+  merge resolves against the other shards to add cross-shard edges.
+
+merge_shards concatenates files, groups and dependency edges in one pass
+(merge_project_analyses), then rescores functionalities and recomputes
+cycles and importance on the combined graph. Limits such as the scanner's
+file count (ScanConfig.max_files) and the content budgets apply per shard,
+so a sharded analysis can cover more files than a full scan with the same
+limits.
+
+Shard results are stored in the snapshot format with extra sections, one
+*.shard file per shard.
+"""
+
+import os
+import re
+import time
+import hashlib
+import logging
+from collections import Counter
+from dataclasses import replace
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Union
+
+from .analyzer import ProjectAnalyzer, ProjectTypeSignals
+from .scanner import GitignoreParser, ProjectScanner
+from .scoring import HitMatrix
+from .graph_algorithms import IndexedGraph
+from .snapshot import AnalysisSnapshot, encode_snapshot
+from .output_writer import write_atomic
+from .progress import ProgressCallback, ProgressTracker
+from ..models.project import ScanConfig, ProjectAnalysis, AnalysisStatus, merge_project_analyses
+
+logger = logging.getLogger(__name__)
+
+# Files marking the root of a package (and so of a shard)
+SHARD_MARKERS = ('pyproject.toml', 'package.json', 'go.mod')
+
+# Name of the shard covering the files outside every package
+ROOT_SHARD = '.'
+
+# Extension of shard result files
+SHARD_SUFFIX = '.shard'
+
+# Evidence files kept per functionality, as in FunctionalityDetection
+MAX_EVIDENCE_FILES = 5
+
+
+class ShardResult(NamedTuple):
+    """Partial analysis of one shard."""
+    shard: str
+    layout: List[str]
+    fingerprint: str
+    analysis: ProjectAnalysis
+    hits: HitMatrix
+    evidence: Dict[str, List[str]]
+    patterns: Dict[str, List[str]]
+    unresolved_imports: Dict[str, List[str]]
+
+
+def find_shards(project_path: Union[str, Path], scan_config: Optional[ScanConfig] = None) -> List[str]:
+    """
+    Find the shards of a project.
+
+    Directories are walked with the scanner's directory filters and the
+    project's .gitignore, without reading any file.
+
+    Args:
+        project_path: Project root
+        scan_config: Scan configuration (ignored directories)
+
+    Returns:
+        Shard directories relative to the project root, the root shard ('.') first
+    """
+    project_path = str(project_path)
+    if not os.path.isdir(project_path):
+        raise ValueError(f"Path is not a valid directory: {project_path}")
+
+    scanner = ProjectScanner(scan_config)
+    gitignore = GitignoreParser(project_path)
+    shards = []
+    pending = [('', 0)]
+    while pending:
+        rel_dir, depth = pending.pop()
+        try:
+            entries = list(os.scandir(os.path.join(project_path, rel_dir)))
+        except OSError:
+            continue
+        if rel_dir and any(entry.name in SHARD_MARKERS and entry.is_file() for entry in entries):
+            shards.append(rel_dir)
+        if depth >= 20:
+            continue
+        for entry in entries:
+            if not entry.is_dir() or scanner._should_ignore_dir(entry.name):
+                continue
+            child = os.path.join(rel_dir, entry.name) if rel_dir else entry.name
+            if not gitignore.should_ignore(child + '/'):
+                pending.append((child, depth + 1))
+
+    return [ROOT_SHARD] + sorted(shards)
+
+
+def nested_shards(shard: str, layout: List[str]) -> List[str]:
+    """Return the shards inside a shard, which its scan leaves out."""
+    if shard == ROOT_SHARD:
+        return [other for other in layout if other != ROOT_SHARD]
+    prefix = shard + os.sep
+    return [other for other in layout if other.startswith(prefix)]
+
+
+def analyze_shard(analyzer: ProjectAnalyzer, project_path: Union[str, Path], shard: str,
+                  layout: List[str]) -> ShardResult:
+    """
+    Analyze one shard of a project.
+
+    Args:
+        analyzer: Analyzer (rules and scan configuration shared by all shards)
+        project_path: Project root
+        shard: Shard to analyze (an entry of layout)
+        layout: Every shard of the project (find_shards)
+
+    Returns:
+        ShardResult of the shard
+    """
+    if shard not in layout:
+        raise ValueError(f"Unknown shard '{shard}' (shards: {', '.join(layout)})")
+
+    analysis, _ = analyzer.build_analysis(
+        Path(project_path),
+        subdir=None if shard == ROOT_SHARD else shard,
+        exclude_dirs=nested_shards(shard, layout)
+    )
+    detector = analyzer.detector
+    unresolved = {}
+    if analyzer.scan_config.analyze_dependencies:
+        unresolved = {
+            file_path: sorted(imports)
+            for file_path, imports in analyzer.dependency_analyzer.unresolved_imports.items()
+        }
+    return ShardResult(
+        shard=shard,
+        layout=list(layout),
+        fingerprint=analyzer.rules.fingerprint,
+        analysis=analysis,
+        hits=detector.hit_matrix,
+        evidence={name: list(islice(files, MAX_EVIDENCE_FILES))
+                  for name, files in detector.evidence.items() if files},
+        patterns={name: list(patterns) for name, patterns in detector.patterns_matched.items() if patterns},
+        unresolved_imports=unresolved,
+    )
+
+
+def shard_filename(shard: str) -> str:
+    """File name of a shard result: readable shard name plus a hash of the shard path."""
+    name = 'root' if shard == ROOT_SHARD else re.sub(r'[^\w.-]+', '-', shard).strip('-')
+    digest = hashlib.sha256(shard.encode('utf-8')).hexdigest()[:8]
+    return f"{name}-{digest}{SHARD_SUFFIX}"
+
+
+def write_shard(result: ShardResult, shard_dir: Union[str, Path]) -> Path:
+    """
+    Write a shard result atomically into a (possibly shared) directory.
+
+    Args:
+        result: Shard result
+        shard_dir: Directory collecting the shard results of one project
+
+    Returns:
+        Path of the written file
+    """
+    shard_dir = Path(shard_dir)
+    shard_dir.mkdir(parents=True, exist_ok=True)
+    path = shard_dir / shard_filename(result.shard)
+    write_atomic(path, encode_snapshot(result.analysis, {
+        'shard': {
+            'shard': result.shard,
+            'layout': result.layout,
+            'fingerprint': result.fingerprint,
+            'evidence': result.evidence,
+            'patterns': result.patterns,
+        },
+        'hits': result.hits.to_dict(),
+        'imports': result.unresolved_imports,
+    }))
+    return path
+
+
+def load_shard(path: Union[str, Path]) -> ShardResult:
+    """
+    Read a shard result written by write_shard.
+
+    Raises:
+        ValueError: If the file is not a shard result
+    """
+    with AnalysisSnapshot(path) as snapshot:
+        meta = snapshot.section('shard')
+        return ShardResult(
+            shard=meta['shard'],
+            layout=meta['layout'],
+            fingerprint=meta['fingerprint'],
+            analysis=snapshot.to_analysis(),
+            hits=HitMatrix.from_dict(snapshot.section('hits')),
+            evidence=meta['evidence'],
+            patterns=meta['patterns'],
+            unresolved_imports=snapshot.section('imports'),
+        )
+
+
+def load_shards(shard_dir: Union[str, Path]) -> List[ShardResult]:
+    """Read every shard result in a directory."""
+    paths = sorted(Path(shard_dir).glob(f"*{SHARD_SUFFIX}"))
+    if not paths:
+        raise ValueError(f"No shard results ({SHARD_SUFFIX}) in {shard_dir}")
+    return [load_shard(path) for path in paths]
+
+
+def merge_shards(results: List[ShardResult], analyzer: ProjectAnalyzer) -> ProjectAnalysis:
+    """
+    Merge the shard results of one project into a complete analysis.
+
+    Args:
+        results: One result per shard of the layout, in any order
+        analyzer: Analyzer providing functionality descriptions, grouping
+            and graph metrics
+
+    Returns:
+        ProjectAnalysis of the whole project
+
+    Raises:
+        ValueError: If shards are missing, duplicated or from different layouts or rules
+    """
+    if not results:
+        raise ValueError("No shard results to merge")
+    started = time.perf_counter()
+
+    layout = results[0].layout
+    by_shard = {}
+    for result in results:
+        if result.layout != layout:
+            raise ValueError(f"Shard '{result.shard}' comes from another shard layout")
+        if result.fingerprint != results[0].fingerprint:
+            raise ValueError(f"Shard '{result.shard}' was analyzed with other detector rules")
+        if result.shard in by_shard:
+            raise ValueError(f"Shard '{result.shard}' appears twice")
+        by_shard[result.shard] = result
+    missing = [shard for shard in layout if shard not in by_shard]
+    if missing:
+        raise ValueError(f"Missing shard results: {', '.join(missing)}")
+    results = [by_shard[shard] for shard in layout]
+
+    # Files, groups, counters and dependency edges: concatenation into a fresh base
+    first = results[0].analysis
+    merged = merge_project_analyses(
+        [ProjectAnalysis(project_name=first.project_name, project_path=first.project_path)]
+        + [result.analysis for result in results]
+    )
+    merged.file_count = len(merged.files)
+    # Same group order as a single run
+    groups = {name: merged.groups[name] for name in analyzer.group_manager.empty_groups() if name in merged.groups}
+    groups.update(merged.groups)
+    merged.groups = groups
+
+    # Project type and main language over every file
+    type_signals = ProjectTypeSignals()
+    languages = Counter()
+    for file_info in merged.files:
+        type_signals.add(file_info.path)
+        if file_info.language:
+            languages[file_info.language] += 1
+    merged.project_type = type_signals.project_type()
+    # The scanner picks a language with at least 10% of the files; the most common one qualifies
+    merged.main_language = languages.most_common(1)[0][0] if languages else "unknown"
+
+    # Functionalities scored over the hits of the whole project
+    matrix = HitMatrix(list(analyzer.detector.patterns))
+    evidence: Dict[str, Dict[str, None]] = {}
+    patterns: Dict[str, Dict[str, None]] = {}
+    for result in results:
+        matrix.extend(result.hits)
+        for name, files in result.evidence.items():
+            evidence.setdefault(name, {}).update(dict.fromkeys(files))
+        for name, matched in result.patterns.items():
+            patterns.setdefault(name, {}).update(dict.fromkeys(matched))
+    merged.functionality_details = analyzer.detector.detections(matrix, evidence, patterns)
+    merged.detected_functionalities = [detection.name for detection in merged.functionality_details]
+
+    # Dependency graph: shard edges plus imports resolved across shards
+    if any(result.analysis.dependency_analysis for result in results):
+        merged.dependency_analysis = _merge_dependencies(results, merged, analyzer)
+
+    merged.analysis_date = max(result.analysis.analysis_date or '' for result in results) or None
+    merged.analysis_duration = (sum(result.analysis.analysis_duration or 0.0 for result in results)
+                                + time.perf_counter() - started)
+    merged.status = AnalysisStatus.COMPLETED
+    return merged
+
+
+def _merge_dependencies(results: List[ShardResult], merged: ProjectAnalysis,
+                        analyzer: ProjectAnalyzer) -> Dict[str, Any]:
+    """Build the project dependency graph from shard edges and cross-shard imports."""
+    dependency_analyzer = analyzer.dependency_analyzer
+    dependency_analyzer.root_path = merged.project_path
+    dependency_analyzer.file_imports = {}
+
+    paths = [file_info.path for file_info in merged.files]
+    edges: Dict[Tuple[str, str], None] = {}
+    for result in results:
+        edges.update(dict.fromkeys(map(tuple, result.analysis.dependency_analysis.get('edges', []))))
+
+    file_mapping = dependency_analyzer._create_file_mapping(paths)
+    shard_edges = len(edges)
+    for result in results:
+        for file_path, imports in result.unresolved_imports.items():
+            for import_name in imports:
+                target = dependency_analyzer._resolve_import(import_name, file_path, file_mapping)
+                if target and target != file_path:
+                    edges[file_path, target] = None
+    logger.info(f"Resolved {len(edges) - shard_edges} dependencies across {len(results)} shards")
+
+    return analyzer.dependency_summary(dependency_analyzer.analyze_graph(IndexedGraph(edges, paths)))
+
+
+def _init_shard_worker(scan_config: ScanConfig, rule_files: Optional[List[str]]):
+    """Build the analyzer once per worker process."""
+    global _worker_analyzer
+    # The pool already runs one analysis per process: extract imports in-process
+    _worker_analyzer = ProjectAnalyzer(scan_config=replace(scan_config, import_workers=1), rule_files=rule_files)
+
+
+_worker_analyzer: Optional[ProjectAnalyzer] = None
+
+
+def _analyze_shard_task(project_path: str, shard: str, layout: List[str]) -> ShardResult:
+    return analyze_shard(_worker_analyzer, project_path, shard, layout)
+
+
+class ShardedAnalyzer:
+    """Analyzes a monorepo shard by shard in worker processes and merges the results."""
+
+    def __init__(self, scan_config: Optional[ScanConfig] = None, rule_files: Optional[List[str]] = None,
+                 max_workers: Optional[int] = None):
+        """
+        Initialize the sharded analyzer.
+
+        Args:
+            scan_config: Scan configuration used for every shard
+            rule_files: Additional detector rule packs (YAML)
+            max_workers: Worker processes (default: CPU count; 1 analyzes in-process)
+        """
+        self.scan_config = scan_config or ScanConfig()
+        self.rule_files = rule_files
+        self.max_workers = max(1, max_workers or os.cpu_count() or 1)
+        self.analyzer = ProjectAnalyzer(scan_config=self.scan_config, rule_files=rule_files)
+
+    def shards(self, path: Union[str, Path]) -> List[str]:
+        """Return the shards of a project (see find_shards)."""
+        return find_shards(path, self.scan_config)
+
+    def build_analysis(self, path: Path, output_dir: Optional[Path] = None,
+                       progress_callback: Optional[ProgressCallback] = None) -> Tuple[ProjectAnalysis, Dict[str, int]]:
+        """
+        Analyze every shard of a project, merge the results and save the outputs.
+
+        Args:
+            path: Project root
+            output_dir: Output directory for analysis files (None skips saving)
+            progress_callback: Receives progress events (shards finished, merge, writes)
+
+        Returns:
+            Tuple (merged analysis, output statistics)
+        """
+        started = time.perf_counter()
+        layout = self.shards(path)
+        progress = ProgressTracker(progress_callback)
+        progress.stage('shards', total=len(layout), unit='shards')
+        results = []
+        for result in self.run_shards(path, layout):
+            results.append(result)
+            progress.advance(1, result.analysis.total_size)
+        progress.stage('merge')
+        analysis = merge_shards(results, self.analyzer)
+        analysis.analysis_duration = time.perf_counter() - started
+        progress.finish()
+        output_stats = self.analyzer.save_analysis(analysis, output_dir, progress_callback) if output_dir else {}
+        return analysis, output_stats
+
+    def analyze_project(self, path: Path, output_dir: Optional[Path] = None,
+                        progress_callback: Optional[ProgressCallback] = None) -> Dict:
+        """Sharded equivalent of ProjectAnalyzer.analyze_project."""
+        analysis, output_stats = self.build_analysis(path, output_dir, progress_callback)
+        return self.analyzer.summarize(analysis, output_stats)
+
+    def run_shards(self, path: Union[str, Path], layout: List[str]):
+        """
+        Analyze shards, yielding each result as it finishes.
+
+        Args:
+            path: Project root
+            layout: Shards to analyze (find_shards)
+
+        Yields:
+            ShardResult per shard, in completion order
+        """
+        path = str(path)
+        if self.max_workers > 1 and len(layout) > 1:
+            try:
+                executor = ProcessPoolExecutor(max_workers=min(self.max_workers, len(layout)),
+                                               initializer=_init_shard_worker,
+                                               initargs=(self.scan_config, self.rule_files))
+            except (OSError, RuntimeError) as e:
+                logger.warning(f"Process pool unavailable, analyzing shards in-process: {e}")
+            else:
+                with executor:
+                    futures = [executor.submit(_analyze_shard_task, path, shard, layout) for shard in layout]
+                    for future in as_completed(futures):
+                        yield future.result()
+                return
+
+        for shard in layout:
+            yield analyze_shard(self.analyzer, path, shard, layout)
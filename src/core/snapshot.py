@@ -0,0 +1,287 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Binary snapshot of a complete ProjectAnalysis.
+
+`analyze` writes the snapshot next to the markdown reports, and downstream
+commands (suggest, status, generate-prompts) load it instead of parsing the
+markdown, which is only a rendering of the same data.
+
+Layout:
+
+    header   magic b'PPSNAP', format version (uint16), index size (uint32)
+    index    JSON object: section name -> [offset, length]
+    sections zlib-compressed compact JSON, offsets relative to the index end
+
+Opening a snapshot reads the header, the index and the small 'meta' section
+only. Large sections (files, groups, functionalities, dependencies) are read
+and decoded the first time they are accessed. File records are stored
+column-wise, which compresses far better than one object per file.
+"""
+
+import json
+import zlib
+import struct
+import logging
+import threading
+from dataclasses import fields
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from .output_writer import write_atomic
+from ..models.project import (
+    ProjectAnalysis, ProjectType, AnalysisStatus, FileInfo, FunctionalityDetection
+)
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'PPSNAP'
+
+# Bump when the section layout changes; older snapshots are then rejected
+SNAPSHOT_VERSION = 1
+
+# Snapshot file name inside an analysis output directory
+SNAPSHOT_FILENAME = 'analysis.snapshot'
+
+_HEADER = struct.Struct('<6sHI')
+
+_FILE_FIELDS = [f.name for f in fields(FileInfo)]
+_FUNCTIONALITY_FIELDS = [f.name for f in fields(FunctionalityDetection)]
+
+
+def _json_default(value):
+    """Encode values json does not handle natively (enums, paths, NumPy scalars)."""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, Path):
+        return str(value)
+    if hasattr(value, 'item'):
+        return value.item()
+    raise TypeError(f"Cannot encode {type(value).__name__} in snapshot")
+
+
+def _encode_section(data: Any) -> bytes:
+    """Serialize one section."""
+    text = json.dumps(data, separators=(',', ':'), default=_json_default)
+    return zlib.compress(text.encode('utf-8'))
+
+
+def _columns(items: List[Any], names: List[str]) -> Dict[str, list]:
+    """Turn a list of dataclass instances into one list per field."""
+    return {name: [getattr(item, name) for item in items] for name in names}
+
+
+def _rows(columns: Dict[str, list], cls):
+    """Rebuild dataclass instances from column lists."""
+    names = list(columns)
+    return [cls(**dict(zip(names, values))) for values in zip(*(columns[name] for name in names))]
+
+
+def encode_snapshot(analysis: ProjectAnalysis, extra_sections: Optional[Dict[str, Any]] = None) -> bytes:
+    """
+    Serialize an analysis into the snapshot format.
+
+    Args:
+        analysis: Completed project analysis
+        extra_sections: Additional JSON-serializable sections (see AnalysisSnapshot.section)
+
+    Returns:
+        Snapshot content
+    """
+    meta = {
+        'project_name': analysis.project_name,
+        'project_path': analysis.project_path,
+        'project_type': analysis.project_type.value,
+        'main_language': analysis.main_language,
+        'file_count': analysis.file_count,
+        'directory_count': analysis.directory_count,
+        'total_size': analysis.total_size,
+        'detected_functionalities': analysis.detected_functionalities,
+        'important_files': analysis.important_files,
+        'group_sizes': {name: len(files) for name, files in analysis.groups.items()},
+        'detection_stats': analysis.detection_stats,
+        'analysis_date': analysis.analysis_date,
+        'analysis_duration': analysis.analysis_duration,
+        'status': analysis.status.value,
+    }
+    sections = {
+        'meta': meta,
+        'groups': analysis.groups,
+        'functionalities': _columns(analysis.functionality_details, _FUNCTIONALITY_FIELDS),
+        'files': _columns(analysis.files, _FILE_FIELDS),
+        'dependencies': analysis.dependency_analysis,
+    }
+    sections.update(extra_sections or {})
+
+    index = {}
+    payload = []
+    offset = 0
+    for name, data in sections.items():
+        encoded = _encode_section(data)
+        index[name] = [offset, len(encoded)]
+        payload.append(encoded)
+        offset += len(encoded)
+
+    index_bytes = json.dumps(index, separators=(',', ':')).encode('utf-8')
+    header = _HEADER.pack(MAGIC, SNAPSHOT_VERSION, len(index_bytes))
+    return b''.join([header, index_bytes] + payload)
+
+
+def write_snapshot(analysis: ProjectAnalysis, path: Union[str, Path]):
+    """
+    Write the snapshot of an analysis atomically.
+
+    Args:
+        analysis: Completed project analysis
+        path: Destination file
+    """
+    write_atomic(path, encode_snapshot(analysis))
+
+
+class AnalysisSnapshot:
+    """Read access to a snapshot file, decoding sections on first use."""
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Open a snapshot and read its index and metadata.
+
+        The file stays open until close() so all sections come from the same
+        snapshot even if a new analysis replaces the file meanwhile.
+
+        Args:
+            path: Snapshot file
+
+        Raises:
+            ValueError: If the file is not a snapshot or has another format version
+        """
+        self.path = Path(path)
+        self._file = open(self.path, 'rb')
+        self._lock = threading.Lock()
+        self._sections: Dict[str, Any] = {}
+        try:
+            header = self._file.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                raise ValueError(f"Truncated snapshot: {self.path}")
+            magic, version, index_size = _HEADER.unpack(header)
+            if magic != MAGIC:
+                raise ValueError(f"Not an analysis snapshot: {self.path}")
+            if version != SNAPSHOT_VERSION:
+                raise ValueError(f"Unsupported snapshot version {version} (expected {SNAPSHOT_VERSION}): {self.path}")
+            self._index = json.loads(self._file.read(index_size).decode('utf-8'))
+            self._data_offset = _HEADER.size + index_size
+            self.meta: Dict[str, Any] = self._section('meta')
+        except BaseException:
+            self._file.close()
+            raise
+
+    @classmethod
+    def load(cls, analysis_path: Union[str, Path]) -> Optional['AnalysisSnapshot']:
+        """
+        Open the snapshot of an analysis output directory.
+
+        Args:
+            analysis_path: Output directory of `analyze`
+
+        Returns:
+            The snapshot, or None if the directory has no usable snapshot
+        """
+        path = Path(analysis_path) / SNAPSHOT_FILENAME
+        if not path.exists():
+            return None
+        try:
+            return cls(path)
+        except (OSError, ValueError, zlib.error) as e:
+            logger.warning(f"Ignoring unreadable analysis snapshot {path}: {e}")
+            return None
+
+    def close(self):
+        """Close the snapshot file."""
+        self._file.close()
+
+    def __enter__(self) -> 'AnalysisSnapshot':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def section(self, name: str) -> Any:
+        """
+        Return a section by name, e.g. one added with encode_snapshot(extra_sections=...).
+
+        Raises:
+            ValueError: If the snapshot has no such section
+        """
+        return self._section(name)
+
+    def _section(self, name: str) -> Any:
+        """Read and decode a section, once."""
+        if name in self._sections:
+            return self._sections[name]
+        if name not in self._index:
+            raise ValueError(f"Snapshot {self.path} has no '{name}' section")
+        offset, length = self._index[name]
+        with self._lock:
+            self._file.seek(self._data_offset + offset)
+            encoded = self._file.read(length)
+        data = json.loads(zlib.decompress(encoded).decode('utf-8'))
+        self._sections[name] = data
+        return data
+
+    @property
+    def project_type(self) -> ProjectType:
+        """Detected project type."""
+        return ProjectType(self.meta['project_type'])
+
+    @property
+    def group_names(self) -> List[str]:
+        """Functional group names, without loading the groups section."""
+        return list(self.meta['group_sizes'])
+
+    @property
+    def groups(self) -> Dict[str, List[str]]:
+        """Functional groups: group name -> file paths."""
+        return self._section('groups')
+
+    def group_files(self, group_name: str) -> List[str]:
+        """Files of one functional group (empty if the group does not exist)."""
+        return self.groups.get(group_name, [])
+
+    @property
+    def functionalities(self) -> List[FunctionalityDetection]:
+        """Detected functionalities with confidence and evidence."""
+        return _rows(self._section('functionalities'), FunctionalityDetection)
+
+    @property
+    def files(self) -> List[FileInfo]:
+        """Every analyzed file."""
+        return _rows(self._section('files'), FileInfo)
+
+    @property
+    def dependency_analysis(self) -> Dict[str, Any]:
+        """Dependency graph edges, cycles and importance scores."""
+        return self._section('dependencies')
+
+    def to_analysis(self) -> ProjectAnalysis:
+        """Rebuild the complete ProjectAnalysis (decodes every section)."""
+        meta = self.meta
+        return ProjectAnalysis(
+            project_name=meta['project_name'],
+            project_path=meta['project_path'],
+            project_type=self.project_type,
+            main_language=meta['main_language'],
+            file_count=meta['file_count'],
+            directory_count=meta['directory_count'],
+            total_size=meta['total_size'],
+            detected_functionalities=list(meta['detected_functionalities']),
+            functionality_details=self.functionalities,
+            important_files=list(meta['important_files']),
+            files=self.files,
+            groups=self.groups,
+            dependency_analysis=self.dependency_analysis,
+            detection_stats=meta['detection_stats'],
+            analysis_date=meta['analysis_date'],
+            analysis_duration=meta['analysis_duration'],
+            status=AnalysisStatus(meta['status'])
+        )
@@ -14,6 +14,9 @@ from pathlib import Path
 from typing import List, Dict, Any, Optional
 import json
 
+from ..core.snapshot import AnalysisSnapshot
+from ..utils.filenames import sanitize_filename
+
 
 class ImplementationPromptGenerator:
     """Generates prompts specifically for implementing each phase of suggestions"""
@@ -270,7 +273,7 @@ class ImplementationPromptGenerator:
             steps_section = "1. Begin implementation based on the phase description"
         
         # Get relevant project context
-        context_files = self.get_relevant_context_files()
+        context_files = self.get_relevant_context_files(suggestion_name)
         
         prompt_template = f"""# Implementation Prompt: {suggestion_name.title().replace('_', ' ')} - Phase {phase_number}
 
@@ -348,8 +351,33 @@ Please provide detailed, step-by-step guidance to implement this phase successfu
         
         return prompt_template
     
-    def get_relevant_context_files(self) -> str:
-        """Get list of relevant existing files for context"""
+    def get_relevant_context_files(self, suggestion_name: Optional[str] = None) -> str:
+        """Get list of relevant existing files for context
+        
+        Args:
+            suggestion_name: Suggestion whose functional group files should be listed
+            
+        Returns:
+            Markdown list of context files
+        """
+        # Prefer the analysis snapshot: it lists the actual files of the group
+        snapshot = AnalysisSnapshot.load(self.base_output_dir)
+        if snapshot is not None:
+            with snapshot:
+                meta = snapshot.meta
+                lines = [f"- Project: {meta['project_name']} ({meta['project_type']}, "
+                         f"{meta['main_language']}, {meta['file_count']} files)"]
+                group_files = []
+                if suggestion_name:
+                    for group_name in snapshot.group_names:
+                        if sanitize_filename(group_name) == suggestion_name:
+                            group_files = snapshot.group_files(group_name)
+                            break
+                lines.extend(f"- `{path}`" for path in group_files[:15])
+                if len(group_files) > 15:
+                    lines.append(f"- ... and {len(group_files) - 15} more files")
+                return "\n".join(lines)
+        
         # Try to get project structure information
         project_structure_file = self.base_output_dir / "analysis" / "project-structure.md"
         
@@ -14,6 +14,8 @@ from typing import Dict, Any, Optional
 import anthropic
 import openai
 
+from ..core.snapshot import AnalysisSnapshot
+
 
 class SuggestionGenerator:
     """Simple AI-powered suggestions generator"""
@@ -72,15 +74,26 @@ class SuggestionGenerator:
             'statistics': {}
         }
         
-        # Load groups data
-        groups_file = analysis_path / "groups.json"
-        if groups_file.exists():
-            with open(groups_file) as f:
-                groups_data = json.load(f)
-                context['files'] = groups_data.get('groups', {}).get(group_name, [])
-        
-        # Try to detect project type from files and structure
-        context['project_type'] = self._detect_project_type(analysis_path)
+        # Prefer the binary snapshot; fall back to the JSON/markdown outputs
+        snapshot = AnalysisSnapshot.load(analysis_path)
+        if snapshot is not None:
+            with snapshot:
+                context['files'] = snapshot.group_files(group_name)
+                context['project_type'] = snapshot.project_type.value
+                context['statistics'] = {
+                    'file_count': snapshot.meta['file_count'],
+                    'total_size': snapshot.meta['total_size'],
+                    'detected_functionalities': snapshot.meta['detected_functionalities'],
+                }
+        else:
+            groups_file = analysis_path / "groups.json"
+            if groups_file.exists():
+                with open(groups_file) as f:
+                    groups_data = json.load(f)
+                    context['files'] = groups_data.get('groups', {}).get(group_name, [])
+            
+            # Try to detect project type from files and structure
+            context['project_type'] = self._detect_project_type(analysis_path)
         context['main_language'] = self._detect_main_language(context['files'])
         
         # Load group-specific analysis if available
@@ -20,12 +20,30 @@ class ScanConfig:
         'build', 'dist', 'target', 'bin', 'obj',
         '.pytest_cache', '.coverage', 'htmlcov',
         '.next', '.nuxt', '.output',
+        'project-prompt-output',
     ])
     ignore_files: List[str] = field(default_factory=lambda: [
         '.DS_Store', 'Thumbs.db', '*.pyc', '*.pyo', '*.pyd',
         '*.so', '*.dylib', '*.dll', '*.exe', '*.bin',
         '*.cache', '*.log', '*.tmp', '*.temp',
     ])
+    # Functionality detection content budgets
+    content_file_budget_kb: int = 128
+    content_run_budget_mb: Optional[float] = None
+    stop_when_saturated: bool = False
+    use_detection_cache: bool = True
+    # Streaming analysis pipeline
+    pipeline_threads: bool = True
+    pipeline_queue_size: int = 256
+    # Dependency pass (its import sets also feed functionality detection)
+    analyze_dependencies: bool = True
+    # Import extraction processes (None: CPU count, 1: extract in-process)
+    import_workers: Optional[int] = None
+    # Reuse imports of unchanged files (~/.project-prompt/import-cache)
+    use_import_cache: bool = True
+    # SQLite store of analysis runs in the output directory (None keeps every run)
+    use_analysis_store: bool = True
+    max_stored_runs: Optional[int] = 20
 
 
 @dataclass
@@ -139,6 +157,7 @@ class ProjectAnalysis:
     groups: Dict[str, List[str]] = field(default_factory=dict)
     file_mappings: List[Any] = field(default_factory=list)  # Will be FileGroupMapping objects
     dependency_analysis: Dict[str, Any] = field(default_factory=dict)
+    detection_stats: Dict[str, Any] = field(default_factory=dict)
     
     # AI context
     ai_context: Optional[str] = None
@@ -317,7 +336,18 @@ def calculate_suggestion_priority(impact: str, effort: str, category: str) -> in
 
 
 def merge_project_analyses(analyses: List[ProjectAnalysis]) -> ProjectAnalysis:
-    """Merge multiple project analyses into one."""
+    """
+    Merge multiple project analyses into one.
+    
+    The first analysis is used as the base and updated in place. Counters
+    are summed; files, important files and group members are concatenated;
+    functionalities are deduplicated (keeping the highest confidence and all
+    evidence); dependency data is combined key by key (lists concatenated,
+    mappings updated, counts summed). Nothing is recomputed, so the cost is
+    linear in the size of the analyses. Scores that depend on the whole
+    project (confidences, importance, cycles) are recomputed by
+    sharding.merge_shards when merging shards of one project.
+    """
     if not analyses:
         raise ValueError("Cannot merge empty list of analyses")
     
@@ -326,6 +356,9 @@ def merge_project_analyses(analyses: List[ProjectAnalysis]) -> ProjectAnalysis:
     
     # Use first analysis as base
     merged = analyses[0]
+    functionalities = dict.fromkeys(merged.detected_functionalities)
+    important_files = dict.fromkeys(merged.important_files)
+    details = {detail.name: detail for detail in merged.functionality_details}
     
     # Merge data from other analyses
     for analysis in analyses[1:]:
@@ -333,12 +366,46 @@ def merge_project_analyses(analyses: List[ProjectAnalysis]) -> ProjectAnalysis:
         merged.directory_count += analysis.directory_count
         merged.total_size += analysis.total_size
         
-        # Merge functionalities (deduplicate)
-        all_funcs = set(merged.detected_functionalities + analysis.detected_functionalities)
-        merged.detected_functionalities = list(all_funcs)
+        # Merge functionalities and important files (deduplicate, keep order)
+        functionalities.update(dict.fromkeys(analysis.detected_functionalities))
+        important_files.update(dict.fromkeys(analysis.important_files))
+        for detail in analysis.functionality_details:
+            existing = details.get(detail.name)
+            if existing is None:
+                details[detail.name] = FunctionalityDetection(
+                    detail.name, detail.confidence, detail.description,
+                    list(detail.evidence_files), list(detail.patterns_matched)
+                )
+                continue
+            existing.confidence = max(existing.confidence, detail.confidence)
+            existing.evidence_files = list(dict.fromkeys(existing.evidence_files + detail.evidence_files))
+            existing.patterns_matched = list(dict.fromkeys(existing.patterns_matched + detail.patterns_matched))
+        
+        # Merge files and groups
+        merged.files.extend(analysis.files)
+        for group_name, files in analysis.groups.items():
+            merged.groups.setdefault(group_name, []).extend(files)
         
-        # Merge important files (deduplicate)
-        all_files = set(merged.important_files + analysis.important_files)
-        merged.important_files = list(all_files)
+        # Merge dependency data and detection statistics
+        _merge_values(merged.dependency_analysis, analysis.dependency_analysis)
+        _merge_values(merged.detection_stats, analysis.detection_stats)
     
+    merged.detected_functionalities = list(functionalities)
+    merged.important_files = list(important_files)
+    merged.functionality_details = list(details.values())
     return merged
+
+
+def _merge_values(target: Dict[str, Any], source: Dict[str, Any]):
+    """Combine dictionary values in place: sum numbers, extend lists, update mappings."""
+    for key, value in source.items():
+        current = target.get(key)
+        if current is None:
+            target[key] = list(value) if isinstance(value, list) else dict(value) if isinstance(value, dict) else value
+        elif isinstance(current, list) and isinstance(value, list):
+            current.extend(value)
+        elif isinstance(current, dict) and isinstance(value, dict):
+            current.update(value)
+        elif (isinstance(current, (int, float)) and isinstance(value, (int, float))
+              and not isinstance(current, bool)):
+            target[key] = current + value
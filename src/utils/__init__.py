@@ -4,7 +4,9 @@ Contains configuration management and helper utilities.
 """
 
 from .config import Config
+from .filenames import sanitize_filename
 
 __all__ = [
-    'Config'
+    'Config',
+    'sanitize_filename'
 ]
\ No newline at end of file
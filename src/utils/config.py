@@ -103,6 +103,12 @@ class Config:
             'node_modules', '.venv', 'venv', '.env'
         ]
     
+    @property
+    def detector_rule_files(self) -> list:
+        """Additional detector rule packs (YAML)"""
+        files = os.getenv('DETECTOR_RULE_FILES', '')
+        return [f.strip() for f in files.split(',') if f.strip()]
+    
     def validate(self) -> tuple[bool, list]:
         """Validate complete configuration"""
         errors = []
@@ -0,0 +1,19 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+File names derived from group names.
+
+Output files of a group (analysis, suggestions, prompts) are named after
+it; every writer and reader must use the same conversion to find them.
+"""
+
+import re
+
+
+def sanitize_filename(name: str) -> str:
+    """Convert a group name to the file name stem used for its outputs"""
+    # Replace spaces and special characters
+    sanitized = re.sub(r'[^\w\s-]', '', name)
+    sanitized = re.sub(r'[-\s]+', '-', sanitized)
+    return sanitized.lower().strip('-')
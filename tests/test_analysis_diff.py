@@ -0,0 +1,104 @@
+"""Tests for comparing two analyses."""
+
+import json
+
+from src.core.analysis_diff import AnalysisIndex, diff_analyses
+
+
+def make_index(label, files, groups=None, functionalities=None, edges=()):
+    return AnalysisIndex(
+        label=label, project_name='demo', project_type='python', main_language='Python',
+        analysis_date=None, files=files, file_groups=groups or {},
+        functionalities=functionalities or {}, edges=set(edges),
+    )
+
+
+def test_identical_analyses_have_no_changes():
+    index = make_index('a', {'a.py': (10, 'Python')}, {'a.py': ('core',)}, {'auth': 0.5}, [('a', 'b')])
+    diff = diff_analyses(index, index)
+    assert diff['files'] == {'added': [], 'removed': [], 'renamed': [], 'resized': []}
+    assert diff['groups'] == {'moved': [], 'sizes': {}}
+    assert diff['functionalities'] == {'added': [], 'removed': [], 'confidence_changes': []}
+    assert diff['dependencies'] == {'edges_added': 0, 'edges_removed': 0, 'new_cycles': [], 'resolved_cycles': []}
+    assert [entry['change'] for entry in diff['languages']] == [0.0]
+
+
+def test_file_changes_and_renames():
+    before = make_index('before', {
+        'src/old.py': (100, 'Python'),
+        'src/gone.py': (5, 'Python'),
+        'src/same.py': (7, 'Python'),
+        'src/grow.py': (1, 'Python'),
+    }, {'src/old.py': ('core',), 'src/same.py': ('core',)})
+    after = make_index('after', {
+        'lib/old.py': (100, 'Python'),
+        'src/new.js': (5, 'JavaScript'),
+        'src/same.py': (7, 'Python'),
+        'src/grow.py': (2, 'Python'),
+    }, {'lib/old.py': ('lib',), 'src/same.py': ('utils',)})
+
+    diff = diff_analyses(before, after)
+
+    # Same name and size on both sides is a rename; gone.py and new.js differ by name
+    assert diff['files'] == {
+        'added': ['src/new.js'],
+        'removed': ['src/gone.py'],
+        'renamed': [{'from': 'src/old.py', 'to': 'lib/old.py'}],
+        'resized': ['src/grow.py'],
+    }
+    assert diff['groups']['moved'] == [
+        {'path': 'src/same.py', 'from': ['core'], 'to': ['utils']},
+        {'path': 'lib/old.py', 'renamed_from': 'src/old.py', 'from': ['core'], 'to': ['lib']},
+    ]
+    assert diff['groups']['sizes'] == {
+        'core': {'before': 2, 'after': 0},
+        'lib': {'before': 0, 'after': 1},
+        'utils': {'before': 0, 'after': 1},
+    }
+    assert diff['before']['file_count'] == diff['after']['file_count'] == 4
+    json.dumps(diff)
+
+
+def test_ambiguous_renames_are_not_paired():
+    before = make_index('before', {'a/util.py': (3, 'Python'), 'b/util.py': (3, 'Python')})
+    after = make_index('after', {'c/util.py': (3, 'Python'), 'd/util.py': (3, 'Python')})
+    diff = diff_analyses(before, after)
+    assert diff['files']['renamed'] == []
+    assert diff['files']['added'] == ['c/util.py', 'd/util.py']
+    assert diff['files']['removed'] == ['a/util.py', 'b/util.py']
+
+
+def test_language_shift_is_sorted_by_change():
+    before = make_index('before', {'a.py': (1, 'Python'), 'b.py': (1, 'Python'),
+                                   'c.py': (1, 'Python'), 'd.js': (1, 'JavaScript')})
+    after = make_index('after', {'a.py': (1, 'Python'), 'd.js': (1, 'JavaScript'),
+                                 'e.ts': (1, 'TypeScript'), 'f.ts': (1, 'TypeScript')})
+    languages = diff_analyses(before, after)['languages']
+    assert languages == [
+        {'language': 'Python', 'before': 75.0, 'after': 25.0, 'change': -50.0},
+        {'language': 'TypeScript', 'before': 0.0, 'after': 50.0, 'change': 50.0},
+        {'language': 'JavaScript', 'before': 25.0, 'after': 25.0, 'change': 0.0},
+    ]
+
+
+def test_functionality_changes():
+    before = make_index('before', {}, functionalities={'auth': 0.4, 'database': 0.9, 'api': 0.5})
+    after = make_index('after', {}, functionalities={'auth': 0.7, 'database': 0.9, 'tests': 0.6})
+    functionalities = diff_analyses(before, after)['functionalities']
+    assert functionalities['added'] == ['tests']
+    assert functionalities['removed'] == ['api']
+    assert functionalities['confidence_changes'] == [
+        {'name': 'auth', 'before': 0.4, 'after': 0.7, 'change': 0.3},
+    ]
+
+
+def test_cycles_introduced_and_resolved():
+    before = make_index('before', {}, edges=[('a', 'b'), ('b', 'a'), ('c', 'd')])
+    after = make_index('after', {}, edges=[('a', 'b'), ('c', 'd'), ('d', 'e'), ('e', 'c')])
+    dependencies = diff_analyses(before, after)['dependencies']
+    assert dependencies == {
+        'edges_added': 2,
+        'edges_removed': 1,
+        'new_cycles': [['c', 'd', 'e']],
+        'resolved_cycles': [['a', 'b']],
+    }
@@ -0,0 +1,100 @@
+"""Tests for the SQLite analysis store."""
+
+import sqlite3
+
+import pytest
+
+from src.core.analysis_store import STORE_FILENAME, STORE_SCHEMA_VERSION, AnalysisStore
+from src.models.project import AnalysisStatus, FileInfo, FunctionalityDetection, ProjectAnalysis
+
+
+def make_analysis(project_path='/repo', label='a'):
+    files = [
+        FileInfo('src/auth.py', 'auth.py', '.py', 120, 'Python'),
+        FileInfo('src/models.py', 'models.py', '.py', 80, 'Python'),
+        FileInfo('web/app.js', 'app.js', '.js', 50, 'JavaScript'),
+    ]
+    return ProjectAnalysis(
+        project_name=label, project_path=project_path, main_language='Python',
+        file_count=len(files), files=files,
+        groups={'core': ['src/auth.py', 'src/models.py'], 'web': ['web/app.js'], 'auth': ['src/auth.py']},
+        functionality_details=[FunctionalityDetection('authentication', 0.8, 'Auth', ['src/auth.py']),
+                               FunctionalityDetection('database', 0.5, 'DB', ['src/models.py'])],
+        dependency_analysis={'edges': [['src/auth.py', 'src/models.py'], ['web/app.js', 'src/auth.py']]},
+        status=AnalysisStatus.COMPLETED,
+    )
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = AnalysisStore(tmp_path / STORE_FILENAME)
+    yield store
+    store.close()
+
+
+def test_saved_run_answers_queries(store):
+    run_id = store.save(make_analysis())
+
+    assert store.latest_run() == run_id
+    assert store.groups_of_file('src/auth.py') == ['auth', 'core']
+    assert store.group_files('core') == ['src/auth.py', 'src/models.py']
+    assert store.files_by_language('JavaScript') == ['web/app.js']
+    assert store.largest_groups(2) == [('core', 2), ('auth', 1)]
+    assert store.languages() == [('Python', 2, 200), ('JavaScript', 1, 50)]
+    assert store.functionalities() == [('authentication', 0.8), ('database', 0.5)]
+    assert store.dependents('src/auth.py') == ['web/app.js']
+    assert store.run()['file_count'] == 3
+
+
+def test_queries_default_to_the_latest_run(store):
+    first = store.save(make_analysis())
+    changed = make_analysis()
+    changed.groups = {'core': ['src/auth.py']}
+    second = store.save(changed)
+
+    assert store.group_files('core') == ['src/auth.py']
+    assert store.group_files('core', run_id=first) == ['src/auth.py', 'src/models.py']
+    assert [run['id'] for run in store.runs()] == [second, first]
+
+
+def test_prune_keeps_the_latest_runs_per_project(store):
+    for _ in range(5):
+        store.save(make_analysis('/repo'))
+    for _ in range(2):
+        store.save(make_analysis('/other'))
+
+    assert store.prune(keep=2) == 3
+
+    assert len(store.runs('/repo')) == 2
+    assert len(store.runs('/other')) == 2
+    # Rows of deleted runs go with them
+    run_ids = {run['id'] for run in store.runs()}
+    stored = {row[0] for row in store.conn.execute("SELECT DISTINCT run_id FROM files")}
+    assert stored == run_ids
+    assert store.conn.execute("SELECT COUNT(*) FROM files").fetchone()[0] == 4 * 3
+
+
+def test_prune_one_project(store):
+    for _ in range(3):
+        store.save(make_analysis('/repo'))
+        store.save(make_analysis('/other'))
+
+    assert store.prune(keep=1, project_path='/repo') == 2
+    assert (len(store.runs('/repo')), len(store.runs('/other'))) == (1, 3)
+
+
+def test_store_with_other_schema_is_rebuilt(tmp_path):
+    path = tmp_path / STORE_FILENAME
+    conn = sqlite3.connect(str(path))
+    conn.execute("CREATE TABLE runs (id INTEGER PRIMARY KEY, legacy TEXT)")
+    conn.execute(f"PRAGMA user_version = {STORE_SCHEMA_VERSION + 1}")
+    conn.commit()
+    conn.close()
+
+    with AnalysisStore(path) as store:
+        run_id = store.save(make_analysis())
+        assert store.latest_run() == run_id
+
+
+def test_load_without_store(tmp_path):
+    assert AnalysisStore.load(tmp_path) is None
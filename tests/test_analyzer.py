@@ -0,0 +1,14 @@
+"""Tests for ProjectAnalyzer."""
+
+from src.core.analyzer import ProjectAnalyzer
+from src.models.project import ScanConfig
+
+
+def test_max_files_limits_the_analysis(tmp_path):
+    for index in range(30):
+        (tmp_path / f"module{index}.py").write_text('x = 1\n')
+    analyzer = ProjectAnalyzer(ScanConfig(max_files=10, use_detection_cache=False, use_import_cache=False))
+
+    analysis, _ = analyzer.build_analysis(tmp_path)
+
+    assert analysis.file_count == len(analysis.files) == 10
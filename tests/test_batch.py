@@ -0,0 +1,82 @@
+"""Tests for batch analysis of many repositories."""
+
+import multiprocessing
+import os
+from pathlib import Path
+
+import pytest
+
+from src.core.analyzer import ProjectAnalyzer
+from src.core.batch import BatchAnalyzer, summarize_batch
+from src.models.project import ScanConfig
+
+
+@pytest.fixture
+def repositories(tmp_path):
+    paths = []
+    for name in ('api', 'web', 'tools'):
+        root = tmp_path / name
+        root.mkdir()
+        (root / 'auth.py').write_text('def login(password, token):\n    return token\n')
+        (root / 'README.md').write_text(f"# {name}\n")
+        paths.append(str(root))
+    return paths
+
+
+def _scan_config():
+    return ScanConfig(use_detection_cache=False, use_import_cache=False, use_analysis_store=False)
+
+
+@pytest.mark.parametrize('max_workers', [1, 2])
+def test_failing_repository_does_not_stop_the_batch(repositories, tmp_path, max_workers):
+    missing = str(tmp_path / 'missing')
+    analyzer = BatchAnalyzer(_scan_config(), max_workers=max_workers)
+
+    results = {result.path: result for result in analyzer.run(repositories + [missing], tmp_path / 'out')}
+
+    assert set(results) == set(repositories) | {missing}
+    assert not results[missing].ok
+    assert results[missing].error.startswith('ValueError')
+    for path in repositories:
+        assert results[path].ok
+        assert results[path].analysis.file_count == 2
+        assert (Path(results[path].output_dir) / 'groups.json').exists()
+
+    report = summarize_batch(list(results.values()))
+    assert (report['repositories'], report['succeeded'], report['failed']) == (4, 3, 1)
+    assert report['totals']['file_count'] == 6
+
+
+_build_analysis = ProjectAnalyzer.build_analysis
+
+
+def _build_or_crash(self, path, *args, **kwargs):
+    if Path(path).name == 'crash':
+        os._exit(1)
+    return _build_analysis(self, path, *args, **kwargs)
+
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != 'fork', reason='workers must inherit the patch')
+def test_worker_crash_restarts_the_pool(repositories, tmp_path, monkeypatch):
+    crash = tmp_path / 'crash'
+    crash.mkdir()
+    monkeypatch.setattr(ProjectAnalyzer, 'build_analysis', _build_or_crash)
+    analyzer = BatchAnalyzer(_scan_config(), max_workers=2)
+
+    results = {result.path: result for result in analyzer.run([str(crash)] + repositories, tmp_path / 'out')}
+
+    assert results[str(crash)].error == "Worker process crashed"
+    assert all(results[path].ok for path in repositories)
+
+
+def test_output_dirs_disambiguate_repeated_names(tmp_path):
+    first, second = tmp_path / 'a' / 'app', tmp_path / 'b' / 'app'
+    other = tmp_path / 'lib'
+    analyzer = BatchAnalyzer(_scan_config())
+
+    output_dirs = analyzer.output_dirs([str(first), str(second), str(other)], tmp_path / 'out')
+
+    assert output_dirs[str(other)] == str(tmp_path / 'out' / 'lib')
+    names = {Path(output_dirs[str(path)]).name for path in (first, second)}
+    assert len(names) == 2 and all(name.startswith('app-') for name in names)
+    assert analyzer.output_dirs([str(other)]) == {str(other): str(other / 'project-prompt-output')}
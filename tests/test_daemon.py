@@ -0,0 +1,53 @@
+"""Tests for the warm analysis service."""
+
+import pytest
+
+from src.core.daemon import AnalysisService
+
+
+@pytest.fixture
+def project(tmp_path):
+    root = tmp_path / 'project'
+    (root / 'src').mkdir(parents=True)
+    (root / 'src' / 'auth.py').write_text('def login(password):\n    return password\n')
+    (root / 'src' / 'models.py').write_text('class User:\n    pass\n')
+    return root
+
+
+def _analyze(service, root, **args):
+    return service.analyze(dict(args, path=str(root), output=str(root.parent / f"{root.name}-output"),
+                                no_cache=True, skip_dependencies=True))
+
+
+def test_unchanged_project_is_served_from_memory(project):
+    service = AnalysisService()
+
+    assert _analyze(service, project)['cached'] is False
+    assert _analyze(service, project)['cached'] is True
+
+
+def test_edited_rules_invalidate_cached_results(project, tmp_path):
+    rules = tmp_path / 'rules.yaml'
+    rules.write_text("functionalities:\n  widgets:\n    files: [widget]\n")
+    service = AnalysisService()
+
+    _analyze(service, project, rules=[str(rules)])
+    rules.write_text("functionalities:\n  widgets:\n    files: [src, models, auth]\n")
+    result = _analyze(service, project, rules=[str(rules)])
+
+    assert result['cached'] is False
+    assert 'widgets' in result['detected_functionalities']
+
+
+def test_caches_keep_most_recently_used_entries(tmp_path, project):
+    other = tmp_path / 'other'
+    (other / 'lib').mkdir(parents=True)
+    (other / 'lib' / 'db.py').write_text('SELECT = 1\n')
+    service = AnalysisService(max_analyzers=1, max_projects=1)
+
+    _analyze(service, project)
+    _analyze(service, other, content_budget=1)
+
+    assert len(service._analyzers) == 1
+    assert len(service._projects) == 1
+    assert _analyze(service, project)['cached'] is False
@@ -0,0 +1,157 @@
+"""Tests for dependency extraction and the dependency graph."""
+
+import random
+
+import pytest
+
+from src.core.dependency_analyzer import UnifiedDependencyAnalyzer
+from src.core.rule_packs import load_rules
+
+
+def _write_tree(root, sources):
+    for file_path, source in sources.items():
+        path = root / file_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(source)
+
+
+@pytest.fixture
+def analyzer(tmp_path):
+    analyzer = UnifiedDependencyAnalyzer(max_workers=1)
+    analyzer.root_path = str(tmp_path)
+    return analyzer
+
+
+def test_relative_imports_keep_their_level(tmp_path, analyzer):
+    _write_tree(tmp_path, {
+        'app/__init__.py': '',
+        'app/redis.py': '',
+        'app/views.py': 'from .redis import client\nfrom ..shared.util import f\nimport os\n',
+    })
+
+    assert analyzer.extract_imports('app/views.py') == {'.redis', '..shared.util', 'os'}
+
+
+def test_relative_imports_are_not_libraries(tmp_path, analyzer):
+    _write_tree(tmp_path, {
+        'app/__init__.py': '',
+        'app/redis.py': '',
+        'app/views.py': 'from .redis import client\n',
+    })
+    rules = load_rules(cache_dir=tmp_path / 'rule-cache')
+
+    imports = analyzer.extract_imports('app/views.py')
+
+    assert rules.import_matcher.match(imports) == {}
+    assert rules.import_matcher.match({'redis'}) == {'caching': ['redis']}
+
+
+def test_relative_imports_resolve_to_package_files(tmp_path, analyzer):
+    _write_tree(tmp_path, {
+        'app/__init__.py': '',
+        'app/redis.py': '',
+        'app/views.py': 'from .redis import client\n',
+    })
+
+    analyzer.analyze_dependencies(['app/__init__.py', 'app/redis.py', 'app/views.py'], root_path=str(tmp_path))
+
+    assert list(analyzer.graph.successors('app/views.py')) == ['app/redis.py']
+    assert analyzer.unresolved_imports == {}
+
+
+def _assert_same_analysis(result, reference):
+    assert set(result['graph'].nodes()) == set(reference['graph'].nodes())
+    assert set(result['graph'].edges()) == set(reference['graph'].edges())
+    assert sorted(map(sorted, result['cyclic_components'])) == sorted(map(sorted, reference['cyclic_components']))
+    assert result['unresolved_imports'] == reference['unresolved_imports']
+    for file_path, score in reference['importance_scores'].items():
+        assert result['importance_scores'][file_path] == pytest.approx(score, abs=1e-3)
+
+
+def test_update_dependencies_requires_previous_analysis(analyzer):
+    with pytest.raises(ValueError):
+        analyzer.update_dependencies(added=['a.py'])
+
+
+def test_update_dependencies_matches_full_analysis(tmp_path, analyzer):
+    _write_tree(tmp_path, {
+        'pkg/__init__.py': '',
+        'pkg/a.py': 'from .b import x\n',
+        'pkg/b.py': 'from .c import y\n',
+        'pkg/c.py': 'import os\n',
+        'web/app.js': "import api from './api'\n",
+        'web/api.js': "export const api = 1\n",
+    })
+    files = ['pkg/__init__.py', 'pkg/a.py', 'pkg/b.py', 'pkg/c.py', 'web/app.js', 'web/api.js']
+    analyzer.analyze_dependencies(files, root_path=str(tmp_path))
+    assert analyzer.cyclic_components == []
+
+    # Close the cycle a -> b -> c -> a, remove the JS module and add a new importer
+    _write_tree(tmp_path, {
+        'pkg/c.py': 'from . import a\nfrom .a import z\n',
+        'pkg/d.py': 'from .c import y\nimport pkg.b\n',
+    })
+    (tmp_path / 'web' / 'api.js').unlink()
+    files = ['pkg/__init__.py', 'pkg/a.py', 'pkg/b.py', 'pkg/c.py', 'pkg/d.py', 'web/app.js']
+
+    result = analyzer.update_dependencies(added=['pkg/d.py'], removed=['web/api.js'], modified=['pkg/c.py'])
+
+    reference = UnifiedDependencyAnalyzer(max_workers=1).analyze_dependencies(files, root_path=str(tmp_path))
+    _assert_same_analysis(result, reference)
+    assert sorted(map(sorted, result['cyclic_components'])) == [['pkg/a.py', 'pkg/b.py', 'pkg/c.py']]
+    assert result['unresolved_imports'] == {'web/app.js': {'./api'}}
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_random_updates_match_full_analysis(tmp_path, seed):
+    rng = random.Random(seed)
+    modules = ['a', 'b', 'c', 'util', 'core']
+    directories = ['', 'pkg', 'pkg/sub', 'web']
+
+    def random_file():
+        directory = rng.choice(directories)
+        extension = rng.choice(['.py', '.js'])
+        return (f"{directory}/" if directory else '') + rng.choice(modules) + extension
+
+    def write(file_path):
+        lines = []
+        for _ in range(rng.randint(0, 3)):
+            module = rng.choice(modules)
+            if file_path.endswith('.py'):
+                lines.append(rng.choice([f"import {module}", f"from .{module} import x", f"from ..{module} import y"]))
+            else:
+                lines.append(rng.choice([f"import x from './{module}'", f"const y = require('../{module}')"]))
+        _write_tree(tmp_path, {file_path: '\n'.join(lines) + '\n'})
+
+    files = sorted({random_file() for _ in range(15)})
+    for file_path in files:
+        write(file_path)
+    analyzer = UnifiedDependencyAnalyzer(max_workers=1)
+    analyzer.analyze_dependencies(files, root_path=str(tmp_path))
+
+    for _ in range(3):
+        live = set(files)
+        added, removed, modified = [], [], []
+        for _ in range(rng.randint(1, 4)):
+            choice = rng.random()
+            if choice < 0.3 and live:
+                file_path = rng.choice(sorted(live))
+                live.discard(file_path)
+                removed.append(file_path)
+                (tmp_path / file_path).unlink()
+            elif choice < 0.6:
+                file_path = random_file()
+                if file_path not in live:
+                    live.add(file_path)
+                    added.append(file_path)
+                    write(file_path)
+            elif live:
+                file_path = rng.choice(sorted(live))
+                modified.append(file_path)
+                write(file_path)
+        files = sorted(live)
+
+        result = analyzer.update_dependencies(added, removed, [path for path in modified if path in live])
+
+        reference = UnifiedDependencyAnalyzer(max_workers=1).analyze_dependencies(files, root_path=str(tmp_path))
+        _assert_same_analysis(result, reference)
@@ -0,0 +1,114 @@
+"""Tests for the per-file detection cache."""
+
+import os
+
+import pytest
+
+from src.core.detection_cache import DetectionCache
+from src.core.detector import FunctionalityDetector, KeywordMatcher, SIMPLE_PATTERNS, scan_file_content
+
+SOURCES = {
+    'auth.py': 'def login(password):\n    return token\n',
+    'models.py': 'class User:\n    schema = "users"  # database table\n',
+    'notes.txt': 'nothing to see here\n',
+}
+
+
+@pytest.fixture
+def project(tmp_path):
+    root = tmp_path / 'project'
+    root.mkdir()
+    for name, content in SOURCES.items():
+        (root / name).write_text(content)
+    return root
+
+
+def _cache(project, tmp_path, fingerprint='rules'):
+    return DetectionCache(project, fingerprint, cache_dir=tmp_path / 'cache')
+
+
+def _store(cache, project, name):
+    cache.store(name, scan_file_content(str(project / name), KeywordMatcher(SIMPLE_PATTERNS)))
+
+
+def _touch(path, seconds=10):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + seconds * 10 ** 9))
+
+
+def test_unchanged_file_is_a_hit(project, tmp_path):
+    cache = _cache(project, tmp_path)
+    _store(cache, project, 'auth.py')
+    cache.save()
+
+    reloaded = _cache(project, tmp_path)
+    keywords, size = reloaded.lookup('auth.py', str(project / 'auth.py'))
+
+    assert set(keywords) == {'login', 'password', 'token'}
+    assert size == len(SOURCES['auth.py'])
+    assert (reloaded.hits, reloaded.misses) == (1, 0)
+
+
+def test_touched_file_with_same_content_is_a_hit(project, tmp_path):
+    cache = _cache(project, tmp_path)
+    _store(cache, project, 'auth.py')
+    cache.save()
+    _touch(project / 'auth.py')
+
+    reloaded = _cache(project, tmp_path)
+
+    assert reloaded.lookup('auth.py', str(project / 'auth.py')) is not None
+
+
+def test_changed_content_invalidates_the_entry(project, tmp_path):
+    cache = _cache(project, tmp_path)
+    _store(cache, project, 'auth.py')
+    cache.save()
+    path = project / 'auth.py'
+    path.write_text(SOURCES['auth.py'].replace('login', 'logon'))
+    _touch(path)
+
+    reloaded = _cache(project, tmp_path)
+
+    assert reloaded.lookup('auth.py', str(path)) is None
+    assert reloaded.misses == 1
+
+
+def test_other_rules_discard_the_cache(project, tmp_path):
+    cache = _cache(project, tmp_path)
+    _store(cache, project, 'auth.py')
+    cache.save()
+
+    assert _cache(project, tmp_path, fingerprint='other rules').entries == {}
+
+
+def test_save_keeps_only_entries_used_in_the_run(project, tmp_path):
+    cache = _cache(project, tmp_path)
+    _store(cache, project, 'auth.py')
+    _store(cache, project, 'models.py')
+    cache.save()
+
+    second = _cache(project, tmp_path)
+    second.lookup('auth.py', str(project / 'auth.py'))
+    second.save()
+
+    assert set(_cache(project, tmp_path).entries) == {'auth.py'}
+
+
+def test_detection_with_cache_matches_detection_without(project, tmp_path):
+    detector = FunctionalityDetector(workers=1)
+    file_paths = sorted(SOURCES)
+
+    def summary(detections):
+        return [(detection.name, detection.confidence, detection.evidence_files) for detection in detections]
+
+    expected = summary(detector.detect_functionalities(file_paths, str(project)))
+    cache = _cache(project, tmp_path)
+    first = summary(detector.detect_functionalities(file_paths, str(project), cache=cache))
+    cache.save()
+    cache = _cache(project, tmp_path)
+    second = summary(detector.detect_functionalities(file_paths, str(project), cache=cache))
+
+    assert expected and first == second == expected
+    assert detector.scan_stats['files_cached'] == len(file_paths)
+    assert detector.scan_stats['files_scanned'] == 0
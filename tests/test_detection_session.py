@@ -0,0 +1,59 @@
+"""Tests for streaming functionality detection."""
+
+import random
+
+import pytest
+
+from src.core.detector import FunctionalityDetector
+
+WORDS = ['login', 'jwt', 'password', 'select', 'render', 'pytest', 'celery', 'hello', 'world']
+
+
+@pytest.fixture
+def project(tmp_path):
+    rng = random.Random(7)
+    file_paths = []
+    for index in range(300):
+        directory = rng.choice(['src', 'src/api', 'lib', 'docs', 'tests'])
+        file_path = f"{directory}/f{index}.{rng.choice(['py', 'js', 'md'])}"
+        path = tmp_path / file_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(' '.join(rng.choices(WORDS, k=rng.randint(1, 200))))
+        file_paths.append(file_path)
+    return tmp_path, file_paths
+
+
+def _detect(project, **options):
+    root, file_paths = project
+    detector = FunctionalityDetector(**options)
+    detections = detector.detect_functionalities(file_paths, str(root))
+    return [(d.name, d.confidence, d.patterns_matched) for d in detections], detector.scan_stats
+
+
+@pytest.mark.parametrize('options', [
+    {},
+    {'run_byte_budget': 20000},
+    {'stop_when_saturated': True},
+])
+def test_process_pool_matches_in_process_scan(project, options):
+    in_process = _detect(project, workers=1, **options)
+    pooled = _detect(project, workers=2, chunk_size=16, parallel_min_files=1, **options)
+
+    assert pooled == in_process
+
+
+def test_run_byte_budget_skips_remaining_files(project):
+    _, stats = _detect(project, workers=1, run_byte_budget=20000)
+
+    assert stats['stop_reason'] == 'run_byte_budget'
+    assert stats['files_skipped'] > 0
+    assert stats['files_scanned'] + stats['files_skipped'] == 300
+
+
+def test_imports_replace_content_scanning(tmp_path):
+    (tmp_path / 'app.py').write_text('login password jwt')
+    detector = FunctionalityDetector(workers=1)
+
+    detector.detect_functionalities(['app.py'], str(tmp_path), file_imports={'app.py': ['os']})
+
+    assert detector.scan_stats['files_scanned'] == 0
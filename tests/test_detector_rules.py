@@ -0,0 +1,126 @@
+"""Tests for the detector matchers and rule pack file patterns."""
+
+import random
+import re
+
+import pytest
+
+from src.core import detector
+from src.core.detector import SIMPLE_PATTERNS, FunctionalityDetector, KeywordMatcher, PathMatcher, scan_file_content
+from src.core.rule_packs import load_rules
+
+
+@pytest.fixture
+def rules(tmp_path):
+    return load_rules(cache_dir=tmp_path / 'rule-cache')
+
+
+def _write_tree(root, file_paths):
+    for file_path in file_paths:
+        path = root / file_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text('x')
+
+
+def test_markup_and_config_files_are_not_machine_learning(rules, tmp_path):
+    file_paths = ['templates/a.html', 'templates/b.html', 'config.yaml', 'docs/x.xml']
+    _write_tree(tmp_path / 'project', file_paths)
+    detector = FunctionalityDetector(rules=rules, workers=1)
+
+    detections = detector.detect_functionalities(file_paths, str(tmp_path / 'project'))
+
+    assert 'machine_learning' not in [detection.name for detection in detections]
+
+
+def test_segment_patterns_match_whole_segments(rules):
+    match = rules.path_matcher.match
+
+    assert match('src/ml/model.py')['machine_learning'] == ['/ml/']
+    assert match('ml.py')['machine_learning'] == ['/ml/']
+    assert 'machine_learning' not in match('templates/page.html')
+    assert 'machine_learning' not in match('constraints.txt')
+    assert 'cli' not in match('src/client.py')
+    assert 'search' not in match('src/index.js')
+
+
+def test_extension_patterns_match_extension_only(rules):
+    match = rules.path_matcher.match
+
+    assert '*.tf' in match('deploy/main.tf')['infrastructure']
+    assert 'infrastructure' not in match('x.tfvars')
+    assert 'infrastructure' not in match('src/tf_utils.py')
+
+
+def test_substring_patterns_match_anywhere():
+    matcher = PathMatcher({'payments': {'files': ['pay', 'payment']}})
+
+    assert matcher.match('src/payments/api.py') == {'payments': ['pay', 'payment']}
+    assert matcher.match('src/paypal.py') == {'payments': ['pay']}
+
+
+WORDS = ['authenticate', 'auth', 'author', 'login', 'Token', 'tokens', 'database', 'query', 'it', 'item',
+         'spec', 'special', 'api', 'rapid', 'REST', 'restore', 'view', 'preview', 'config', 'x', '_auth', 'auth_']
+
+
+def _per_keyword(content):
+    hits = {}
+    for func_name, patterns in SIMPLE_PATTERNS.items():
+        matched = [keyword for keyword in patterns['keywords']
+                   if re.search(r'\b' + re.escape(keyword) + r'\b', content, re.IGNORECASE)]
+        if matched:
+            hits[func_name] = matched
+    return hits
+
+
+def _per_pattern(path):
+    hits = {}
+    for func_name, patterns in SIMPLE_PATTERNS.items():
+        matched = [pattern for pattern in patterns['files'] if pattern in path]
+        if matched:
+            hits[func_name] = matched
+    return hits
+
+
+def _random_text(rng, words=200):
+    separators = [' ', '\n', '.', '(', '-', '']
+    return ''.join(rng.choice(WORDS) + rng.choice(separators) for _ in range(words))
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_keyword_matcher_matches_per_keyword_search(seed):
+    rng = random.Random(seed)
+    matcher = KeywordMatcher(SIMPLE_PATTERNS)
+    for _ in range(20):
+        content = _random_text(rng, rng.randrange(1, 60))
+        assert matcher.match(content) == _per_keyword(content)
+
+
+def test_keyword_matcher_respects_word_boundaries():
+    matcher = KeywordMatcher(SIMPLE_PATTERNS)
+
+    assert matcher.match('authentication author item') == {}
+    assert matcher.match('auth.login(Token)') == {'authentication': ['login', 'auth', 'token']}
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_chunked_scan_matches_whole_content(seed, tmp_path, monkeypatch):
+    monkeypatch.setattr(detector, 'CONTENT_READ_SIZE', 7)
+    rng = random.Random(seed)
+    matcher = KeywordMatcher(SIMPLE_PATTERNS)
+    path = tmp_path / 'source.py'
+    for _ in range(10):
+        content = _random_text(rng, 40)
+        path.write_text(content)
+        assert scan_file_content(str(path), matcher).hits == _per_keyword(content)
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_path_matcher_matches_per_pattern_search(seed):
+    rng = random.Random(seed)
+    matcher = PathMatcher(SIMPLE_PATTERNS)
+    parts = ['src', 'api', 'auth', 'user', 'models', 'db', 'components', 'ui', 'tests', 'spec', 'docker',
+             'settings', 'services', 'routes', 'views', 'pages', 'misc', 'lib']
+    extensions = ['.py', '.js', '.env', '.tsx', '']
+    for _ in range(50):
+        path = '/'.join(rng.choice(parts) for _ in range(rng.randrange(1, 5))) + rng.choice(extensions)
+        assert matcher.match(path) == _per_pattern(path)
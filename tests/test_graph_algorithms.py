@@ -0,0 +1,168 @@
+"""Tests for the array-backed graph algorithms."""
+
+import random
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from src.core.graph_algorithms import (
+    IndexedGraph,
+    cyclic_components,
+    degree_centrality,
+    pagerank,
+    strongly_connected_components,
+    update_cyclic_components,
+)
+
+
+def _random_edges(seed, nodes=30, edges=45):
+    rng = random.Random(seed)
+    names = [f"n{index}" for index in range(nodes)]
+    return [(rng.choice(names), rng.choice(names)) for _ in range(edges)]
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_indexed_graph_matches_networkx_after_changes(seed):
+    edges = list(dict.fromkeys(_random_edges(seed)))
+    graph = IndexedGraph(edges, ['isolated'])
+    reference = nx.DiGraph(edges)
+    reference.add_node('isolated')
+    # Query predecessors before the changes so the reverse adjacency must be rebuilt
+    assert graph.predecessors('isolated') == []
+    graph.remove_nodes(['n1', 'n2'])
+    reference.remove_nodes_from(['n1', 'n2'])
+    graph.set_successors('n3', ['n4', 'new'])
+    reference.remove_edges_from(list(reference.out_edges('n3')))
+    reference.add_edges_from([('n3', 'n4'), ('n3', 'new')])
+
+    assert set(graph) == set(reference.nodes())
+    assert set(graph.edges()) == set(reference.edges())
+    assert graph.number_of_edges() == reference.number_of_edges()
+    for node in graph:
+        assert sorted(graph.successors(node)) == sorted(reference.successors(node))
+        assert sorted(graph.predecessors(node)) == sorted(reference.predecessors(node))
+    converted = graph.to_networkx()
+    assert set(converted.nodes()) == set(reference.nodes())
+    assert set(converted.edges()) == set(reference.edges())
+
+
+def test_strongly_connected_components_small_graph():
+    # 0 <-> 1, 2 -> 3 -> 4 -> 2, 4 -> 5, 5 alone
+    adjacency = [[1], [0], [3], [4], [2, 5], []]
+
+    components = strongly_connected_components(adjacency)
+
+    assert sorted(sorted(component) for component in components) == [[0, 1], [2, 3, 4], [5]]
+
+
+def test_cyclic_components_skip_acyclic_nodes_and_self_loops():
+    edges = [('a', 'b'), ('b', 'a'), ('b', 'c'), ('c', 'c'), ('d', 'e')]
+
+    assert cyclic_components(edges) == {frozenset({'a', 'b'})}
+
+
+def test_long_chain_does_not_overflow_recursion():
+    edges = [(f"n{index}", f"n{index + 1}") for index in range(20000)] + [('n20000', 'n0')]
+
+    assert len(cyclic_components(edges)) == 1
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_cyclic_components_match_networkx(seed):
+    edges = _random_edges(seed)
+    graph = nx.DiGraph(edges)
+    expected = {frozenset(component) for component in nx.strongly_connected_components(graph)
+                if len(component) > 1}
+
+    assert cyclic_components(edges) == expected
+
+
+def test_shortest_cycle_within_component():
+    # Cycle a -> b -> c -> d -> a with the chord c -> a
+    graph = IndexedGraph([('a', 'b'), ('b', 'c'), ('c', 'd'), ('d', 'a'), ('c', 'a')])
+    component = graph.cyclic_components()[0]
+
+    cycle = [graph.names[node] for node in graph.shortest_cycle(component)]
+
+    assert cycle == ['a', 'b', 'c']
+
+
+def _exact_pagerank(graph, alpha=0.85):
+    """Stationary distribution of the PageRank random walk, solved directly."""
+    count = len(graph)
+    walk = np.zeros((count, count))
+    for source, targets in enumerate(graph.adjacency):
+        for target in targets:
+            walk[target, source] += alpha / len(targets)
+        if not targets:
+            walk[:, source] += alpha / count
+    walk += (1.0 - alpha) / count
+    system = np.vstack([np.eye(count) - walk, np.ones(count)])
+    rhs = np.zeros(count + 1)
+    rhs[-1] = 1.0
+    return np.linalg.lstsq(system, rhs, rcond=None)[0]
+
+
+@pytest.mark.parametrize('edges', [
+    [('a', 'b'), ('b', 'c'), ('c', 'a')],
+    [('a', 'b'), ('a', 'c'), ('b', 'c'), ('d', 'c')],
+    [('a', 'b'), ('a', 'b'), ('b', 'a')],
+    _random_edges(7),
+])
+def test_pagerank_matches_exact_solution(edges):
+    graph = IndexedGraph(edges, ['isolated'])
+
+    scores = pagerank(*graph.to_csr())
+
+    assert scores is not None and scores.sum() == pytest.approx(1.0)
+    assert scores == pytest.approx(_exact_pagerank(graph), abs=1e-4)
+
+
+def test_pagerank_warm_start_converges_to_same_scores():
+    edges = _random_edges(3)
+    graph = IndexedGraph(edges)
+    indptr, indices = graph.to_csr()
+    cold = pagerank(indptr, indices)
+
+    warm = pagerank(indptr, indices, start=cold)
+
+    assert warm == pytest.approx(cold, abs=1e-4)
+
+
+def test_pagerank_of_empty_graph():
+    assert len(pagerank(*IndexedGraph([]).to_csr())) == 0
+
+
+def test_degree_centrality_matches_networkx():
+    edges = [('a', 'b'), ('a', 'c'), ('b', 'c'), ('d', 'c')]
+    graph = IndexedGraph(edges)
+    nx_graph = nx.DiGraph(edges)
+
+    in_degree, out_degree = degree_centrality(*graph.to_csr())
+
+    for name, node in graph.ids.items():
+        assert in_degree[node] == pytest.approx(nx.in_degree_centrality(nx_graph)[name])
+        assert out_degree[node] == pytest.approx(nx.out_degree_centrality(nx_graph)[name])
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_update_cyclic_components_matches_full_recomputation(seed):
+    rng = random.Random(seed)
+    graph = nx.DiGraph(_random_edges(seed, nodes=15, edges=25))
+    before = cyclic_components(graph.edges())
+    component_of = {node: component for component in before for node in component}
+
+    removed_nodes = set(rng.sample(sorted(graph), 2))
+    remaining = [edge for edge in graph.edges() if not removed_nodes & set(edge)]
+    removed_edges = rng.sample(remaining, 3)
+    graph.remove_nodes_from(removed_nodes)
+    graph.remove_edges_from(removed_edges)
+    nodes = sorted(graph)
+    added_edges = [(rng.choice(nodes), rng.choice(nodes)) for _ in range(4)]
+    graph.add_edges_from(added_edges)
+
+    stale, fresh = update_cyclic_components(graph.successors, graph.predecessors, component_of,
+                                            removed_nodes, removed_edges, added_edges)
+
+    assert (before - stale) | fresh == cyclic_components(graph.edges())
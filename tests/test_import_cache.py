@@ -0,0 +1,126 @@
+"""Tests for the persistent import cache."""
+
+import os
+
+import pytest
+
+from src.core.dependency_analyzer import IMPORT_EXTRACTOR_VERSION, UnifiedDependencyAnalyzer
+from src.core.import_cache import ImportCache, _entry_size
+
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    return tmp_path / 'cache'
+
+
+def _write(path, content):
+    path.write_text(content)
+    return str(path)
+
+
+def _store(cache, path, imports):
+    found, key = cache.lookup(path)
+    assert found is None
+    cache.store(path, key, imports)
+
+
+def _touch(path, seconds=10):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + seconds * 10 ** 9))
+
+
+def test_saved_imports_are_found_again(tmp_path, cache_dir):
+    path = _write(tmp_path / 'a.py', 'import os\n')
+    cache = ImportCache(1, cache_dir)
+    _store(cache, path, {'os'})
+    cache.save()
+
+    reloaded = ImportCache(1, cache_dir)
+    imports, _ = reloaded.lookup(path)
+
+    assert imports == frozenset({'os'})
+    assert (reloaded.hits, reloaded.misses) == (1, 0)
+
+
+def test_entries_are_keyed_by_content(tmp_path, cache_dir):
+    path = _write(tmp_path / 'a.py', 'import os\n')
+    cache = ImportCache(1, cache_dir)
+    _store(cache, path, {'os'})
+    cache.save()
+    copy = _write(tmp_path / 'copy.py', 'import os\n')
+    _touch(path)
+
+    reloaded = ImportCache(1, cache_dir)
+
+    assert reloaded.lookup(copy)[0] == frozenset({'os'})
+    assert reloaded.lookup(path)[0] == frozenset({'os'})
+    _write(tmp_path / 'a.py', 'import re\n')
+    assert reloaded.lookup(path)[0] is None
+
+
+def test_other_extractor_versions_are_ignored(tmp_path, cache_dir):
+    path = _write(tmp_path / 'a.py', 'import os\n')
+    cache = ImportCache(1, cache_dir)
+    _store(cache, path, {'os'})
+    cache.save()
+
+    assert ImportCache(2, cache_dir).lookup(path)[0] is None
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, cache_dir):
+    paths = [_write(tmp_path / f"{name}.py", f"import {name}\n") for name in 'abcd']
+    max_bytes = 3 * _entry_size(frozenset({'a'}))
+    cache = ImportCache(1, cache_dir, max_bytes=max_bytes)
+    for path, name in zip(paths[:3], 'abc'):
+        _store(cache, path, {name})
+    cache.save()
+
+    cache = ImportCache(1, cache_dir, max_bytes=max_bytes)
+    assert cache.lookup(paths[0])[0] == frozenset({'a'})
+    _store(cache, paths[3], {'d'})
+    cache.save()
+
+    reloaded = ImportCache(1, cache_dir, max_bytes=max_bytes)
+    assert [reloaded.lookup(path)[0] for path in paths] == [
+        frozenset({'a'}), None, frozenset({'c'}), frozenset({'d'})
+    ]
+    # The stat index only keeps paths of remaining entries
+    assert os.path.abspath(paths[1]) not in reloaded.stats
+
+
+def test_saves_of_concurrent_runs_are_merged(tmp_path, cache_dir):
+    first_path = _write(tmp_path / 'a.py', 'import os\n')
+    second_path = _write(tmp_path / 'b.py', 'import re\n')
+    first, second = ImportCache(1, cache_dir), ImportCache(1, cache_dir)
+    _store(first, first_path, {'os'})
+    _store(second, second_path, {'re'})
+
+    first.save()
+    second.save()
+
+    reloaded = ImportCache(1, cache_dir)
+    assert reloaded.lookup(first_path)[0] == frozenset({'os'})
+    assert reloaded.lookup(second_path)[0] == frozenset({'re'})
+
+
+def test_dependency_analyzer_reuses_cached_imports(tmp_path, cache_dir):
+    project = tmp_path / 'project'
+    project.mkdir()
+    _write(project / 'app.py', 'import models\nfrom os import path\n')
+    _write(project / 'models.py', 'import sqlalchemy\n')
+    files = ['app.py', 'models.py']
+
+    def analyze():
+        analyzer = UnifiedDependencyAnalyzer(max_workers=1,
+                                             import_cache=ImportCache(IMPORT_EXTRACTOR_VERSION, cache_dir))
+        result = analyzer.analyze_dependencies(files, root_path=str(project))
+        analyzer.import_cache.save()
+        return analyzer, result
+
+    first, first_result = analyze()
+    second, second_result = analyze()
+
+    assert first.import_cache.hits == 0
+    assert second.import_cache.hits == len(files)
+    assert second_result['file_imports'] == first_result['file_imports']
+    assert set(second_result['graph'].edges()) == {('app.py', 'models.py')}
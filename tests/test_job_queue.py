@@ -0,0 +1,67 @@
+"""Tests for the persistent job queue and its worker pool."""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from src.core.job_queue import FAILED, QUEUED, RUNNING, JobQueue, JobWorkerPool
+
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = JobQueue(tmp_path / 'jobs.db')
+    yield queue
+    queue.close()
+
+
+def _dead_pid():
+    process = subprocess.Popen([sys.executable, '-c', 'pass'])
+    process.wait()
+    return process.pid
+
+
+def test_claim_records_pool(queue):
+    job_id = queue.submit({'path': '.'})
+
+    job = queue.claim(worker_pid=123, pool_pid=456)
+
+    assert job['id'] == job_id and job['status'] == RUNNING
+    assert [job['id'] for job in queue.running(456)] == [job_id]
+    assert queue.running(789) == []
+
+
+def test_pool_ignores_jobs_of_other_pools(queue):
+    other_pool = os.getppid()
+    job_id = queue.submit({'path': '.'})
+    queue.claim(worker_pid=123, pool_pid=other_pool)
+    pool = JobWorkerPool(queue)
+
+    pool._check_workers()
+
+    assert queue.get(job_id)['status'] == RUNNING
+
+
+def test_pool_fails_its_jobs_without_a_worker(queue):
+    pool = JobWorkerPool(queue)
+    job_id = queue.submit({'path': '.'})
+    queue.claim(worker_pid=_dead_pid(), pool_pid=pool.pid)
+
+    pool._check_workers()
+
+    job = queue.get(job_id)
+    assert job['status'] == FAILED
+    assert job['error'] == "Worker process died"
+
+
+def test_requeue_running_keeps_jobs_of_live_pools(queue):
+    live_job = queue.submit({'path': 'live'})
+    queue.claim(worker_pid=1, pool_pid=os.getppid())
+    orphan_job = queue.submit({'path': 'orphan'})
+    queue.claim(worker_pid=2, pool_pid=_dead_pid())
+
+    assert queue.requeue_running() == 1
+
+    assert queue.get(live_job)['status'] == RUNNING
+    assert queue.get(orphan_job)['status'] == QUEUED
@@ -0,0 +1,85 @@
+"""Tests for the HTTP front end of the job queue."""
+
+import http.client
+import json
+import threading
+
+import pytest
+
+from src.core.job_queue import JobQueue
+from src.core.job_server import MAX_BODY_SIZE, JobServer
+
+
+@pytest.fixture
+def server(tmp_path):
+    queue = JobQueue(tmp_path / 'jobs.db')
+    rule_file = tmp_path / 'team.yaml'
+    rule_file.write_text('functionalities: {}\n')
+    server = JobServer('127.0.0.1', 0, queue, workers=1, output_root=tmp_path / 'outputs',
+                       rule_files=[rule_file])
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    queue.close()
+
+
+def _post(server, body, headers=None):
+    connection = http.client.HTTPConnection(*server.server_address, timeout=10)
+    connection.request('POST', '/jobs', body=body, headers=headers or {})
+    response = connection.getresponse()
+    payload = json.loads(response.read() or b'{}')
+    connection.close()
+    return response.status, payload
+
+
+def _submit(server, params):
+    return _post(server, json.dumps(params).encode())
+
+
+def test_output_is_resolved_under_the_output_root(server, tmp_path):
+    status, job = _submit(server, {'path': str(tmp_path), 'output': 'api'})
+
+    assert status == 202
+    assert job['params']['output'] == str((tmp_path / 'outputs' / 'api').resolve())
+
+
+def test_default_output_is_under_the_output_root(server, tmp_path):
+    status, job = _submit(server, {'path': str(tmp_path)})
+
+    assert status == 202
+    assert job['params']['output'].startswith(str((tmp_path / 'outputs').resolve()) + '/')
+
+
+@pytest.mark.parametrize('output', ['../escape', '/etc', 'a/../../escape', ''])
+def test_output_outside_the_output_root_is_refused(server, tmp_path, output):
+    status, payload = _submit(server, {'path': str(tmp_path), 'output': output})
+
+    assert status == 400
+    assert server.queue.list() == []
+
+
+def test_only_allowed_rule_packs_are_accepted(server, tmp_path):
+    other = tmp_path / 'other.yaml'
+    other.write_text('functionalities: {}\n')
+
+    assert _submit(server, {'path': str(tmp_path), 'rules': [str(other)]})[0] == 400
+    assert _submit(server, {'path': str(tmp_path), 'rules': 'team.yaml'})[0] == 400
+    status, job = _submit(server, {'path': str(tmp_path), 'rules': [str(tmp_path / 'team.yaml')]})
+    assert status == 202
+    assert job['params']['rules'] == [str((tmp_path / 'team.yaml').resolve())]
+
+
+@pytest.mark.parametrize('length', ['abc', '-1', '1.5'])
+def test_invalid_content_length_is_refused(server, length):
+    status, payload = _post(server, b'{}', {'Content-Length': length})
+
+    assert status == 400
+    assert payload == {'error': 'Invalid Content-Length'}
+
+
+def test_large_body_is_refused(server, tmp_path):
+    status, _ = _post(server, b' ' * (MAX_BODY_SIZE + 1))
+
+    assert status == 413
@@ -0,0 +1,63 @@
+"""Tests for the JavaScript/TypeScript import lexer."""
+
+import pytest
+
+from src.core.js_imports import extract_js_imports, looks_minified
+
+
+@pytest.mark.parametrize('source, expected', [
+    ("import x, { y } from 'a'", {'a'}),
+    ("import type { T } from 'a'", {'a'}),
+    ("import 'a'", {'a'}),
+    ("export { y } from 'a'", {'a'}),
+    ("export * as ns from 'a'", {'a'}),
+    ("export * from \"a\"", {'a'}),
+    ("const m = import('a')", {'a'}),
+    ("const m = await import(`a`)", {'a'}),
+    ("const a = require('a')", {'a'}),
+    ("import x = require('a')", {'a'}),
+    ("import {\n  x,\n  y,\n} from './multi'", {'./multi'}),
+])
+def test_captured_forms(source, expected):
+    assert extract_js_imports(source) == expected
+
+
+@pytest.mark.parametrize('source', [
+    "// import 'a'",
+    "/* import 'a' */",
+    "const s = \"import 'a'\"",
+    "const s = 'require(\"a\")'",
+    "const t = `import 'a'`",
+    "const r = /import 'a'/",
+    "const dynamic = require(name)",
+    "const x = obj.require('a')",
+    "export const value = 1",
+])
+def test_ignored_forms(source):
+    assert extract_js_imports(source) == set()
+
+
+def test_keywords_after_strings_and_comments_are_code():
+    assert extract_js_imports("'import' ; require('d')") == {'d'}
+    assert extract_js_imports("/* x */ import 'c'") == {'c'}
+
+
+def test_template_expressions_are_followed():
+    assert extract_js_imports("const s = `${require('b')}`") == {'b'}
+    assert extract_js_imports("const s = `a ${`b ${require('c')}`} d`; import 'e'") == {'c', 'e'}
+
+
+def test_division_is_not_a_regex():
+    source = "const half = total / 2; const q = a / b; import './after-div'"
+    assert extract_js_imports(source) == {'./after-div'}
+
+
+def test_unclosed_string_ends_at_line_end():
+    source = "<p>don't stop</p>\nimport './after-jsx'\n"
+    assert extract_js_imports(source) == {'./after-jsx'}
+
+
+def test_looks_minified():
+    assert looks_minified('x' * 5000)
+    assert looks_minified(('a' * 300 + '\n') * 10)
+    assert not looks_minified("import a from 'a'\n" * 200)
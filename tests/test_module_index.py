@@ -0,0 +1,91 @@
+"""Tests for module index import resolution."""
+
+import pytest
+
+from src.core.module_index import ModuleIndex
+
+FILES = [
+    'main.py',
+    'pkg/__init__.py',
+    'pkg/mod.py',
+    'pkg/sub/__init__.py',
+    'pkg/sub/helpers.py',
+    'src/mylib/__init__.py',
+    'src/mylib/core.py',
+    'tests/test_core.py',
+    'web/app.ts',
+    'web/components/index.tsx',
+    'web/components/Button.jsx',
+    'web/lib/api.js',
+]
+
+
+@pytest.fixture
+def index():
+    return ModuleIndex(FILES)
+
+
+@pytest.mark.parametrize('import_name, source, expected', [
+    ('pkg', 'main.py', 'pkg/__init__.py'),
+    ('pkg.mod', 'main.py', 'pkg/mod.py'),
+    ('pkg.mod.SomeClass', 'main.py', 'pkg/mod.py'),
+    ('pkg.sub.helpers', 'main.py', 'pkg/sub/helpers.py'),
+    ('.mod', 'pkg/sub/__init__.py', None),
+    ('.helpers', 'pkg/sub/__init__.py', 'pkg/sub/helpers.py'),
+    ('..mod', 'pkg/sub/helpers.py', 'pkg/mod.py'),
+    ('.', 'pkg/mod.py', 'pkg/__init__.py'),
+    ('helpers', 'pkg/sub/__init__.py', 'pkg/sub/helpers.py'),
+    ('mylib.core', 'tests/test_core.py', 'src/mylib/core.py'),
+    ('os.path', 'main.py', None),
+    ('./components', 'web/app.ts', 'web/components/index.tsx'),
+    ('./components/Button', 'web/app.ts', 'web/components/Button.jsx'),
+    ('../lib/api', 'web/components/Button.jsx', 'web/lib/api.js'),
+    ('../../outside', 'web/app.ts', None),
+    ('@/lib/api', 'web/app.ts', 'web/lib/api.js'),
+    ('react', 'web/app.ts', None),
+    ('./app', 'main.py', None),
+])
+def test_resolve(index, import_name, source, expected):
+    assert index.resolve(import_name, source) == expected
+
+
+def test_imports_stay_within_language_family(index):
+    assert index.resolve('app', 'main.py') is None
+    assert index.resolve('pkg/mod', 'web/app.ts') is None
+
+
+def test_add_and_remove_report_module_name(index):
+    assert index.add('pkg/extra.py') == 'extra'
+    assert index.add('README.md') is None
+    assert index.remove('pkg/sub/__init__.py') == 'sub'
+    assert index.remove('missing.py') is None
+    assert 'pkg/extra.py' in index and 'pkg/sub/__init__.py' not in index
+
+
+def test_removed_files_no_longer_resolve(index):
+    index.remove('pkg/mod.py')
+
+    assert index.resolve('pkg.mod', 'main.py') == 'pkg/__init__.py'
+    assert index.resolve('..mod', 'pkg/sub/helpers.py') is None
+
+
+def test_ambiguous_suffix_prefers_shortest_path_after_removal():
+    index = ModuleIndex(['a/b/util.py', 'c/util.py', 'main.py'])
+    assert index.resolve('util', 'main.py') == 'c/util.py'
+
+    index.remove('c/util.py')
+
+    assert index.resolve('util', 'main.py') == 'a/b/util.py'
+
+
+def test_incremental_index_matches_rebuilt_index(index):
+    index.remove('pkg/sub/helpers.py')
+    index.add('pkg/helpers.py')
+    index.remove('web/components/index.tsx')
+    rebuilt = ModuleIndex([path for path in FILES
+                           if path not in ('pkg/sub/helpers.py', 'web/components/index.tsx')]
+                          + ['pkg/helpers.py'])
+
+    for import_name, source in [('helpers', 'pkg/sub/__init__.py'), ('pkg.helpers', 'main.py'),
+                                ('.helpers', 'pkg/mod.py'), ('./components', 'web/app.ts')]:
+        assert index.resolve(import_name, source) == rebuilt.resolve(import_name, source)
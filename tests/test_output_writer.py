@@ -0,0 +1,27 @@
+"""Tests for atomic output writes."""
+
+import os
+
+from src.core.output_writer import write_atomic
+
+
+def test_new_file_gets_plain_write_permissions(tmp_path):
+    plain = tmp_path / 'plain.txt'
+    plain.write_bytes(b'x')
+
+    write_atomic(tmp_path / 'out.txt', b'data')
+
+    assert (tmp_path / 'out.txt').read_bytes() == b'data'
+    assert os.stat(tmp_path / 'out.txt').st_mode & 0o777 == os.stat(plain).st_mode & 0o777
+
+
+def test_existing_file_keeps_permissions(tmp_path):
+    path = tmp_path / 'out.txt'
+    path.write_bytes(b'old')
+    os.chmod(path, 0o600)
+
+    write_atomic(path, b'new')
+
+    assert path.read_bytes() == b'new'
+    assert os.stat(path).st_mode & 0o777 == 0o600
+    assert os.listdir(tmp_path) == ['out.txt']
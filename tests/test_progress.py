@@ -0,0 +1,94 @@
+"""Tests for analysis progress events."""
+
+import pytest
+
+from src.core import progress as progress_module
+from src.core.analyzer import ProjectAnalyzer
+from src.core.progress import ProgressTracker
+from src.models.project import ScanConfig
+
+
+class Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(progress_module, 'time', clock)
+    return clock
+
+
+def test_events_are_throttled(clock):
+    events = []
+    tracker = ProgressTracker(events.append, interval=1.0)
+
+    tracker.stage('scan', total=10)
+    clock.now += 0.5
+    tracker.advance(2, size=200)
+    clock.now += 0.5
+    tracker.advance(3, size=300)
+    clock.now += 1.0
+    tracker.finish()
+
+    assert [(event['done'], event['finished']) for event in events] == [(0, False), (5, False), (5, True)]
+    running = events[1]
+    assert running['rate'] == pytest.approx(5.0)
+    assert running['byte_rate'] == pytest.approx(500.0)
+    assert running['eta'] == pytest.approx(1.0)
+    assert events[-1]['total'] == 5 and events[-1]['eta'] is None
+
+
+def test_total_is_raised_when_exceeded(clock):
+    events = []
+    tracker = ProgressTracker(events.append, interval=0.0)
+
+    tracker.stage('scan', total=2)
+    clock.now += 1.0
+    tracker.advance(3)
+
+    assert events[-1]['total'] == 3
+    assert events[-1]['eta'] == 0.0
+
+
+def test_new_stage_finishes_the_current_one(clock):
+    events = []
+    tracker = ProgressTracker(events.append)
+
+    tracker.stage('count')
+    tracker.stage('scan', total=4, unit='files')
+
+    assert [(event['stage'], event['finished']) for event in events] == [
+        ('count', False), ('count', True), ('scan', False)
+    ]
+
+
+def test_without_callback_nothing_is_tracked():
+    tracker = ProgressTracker()
+
+    tracker.stage('scan')
+    tracker.advance(5)
+    tracker.finish()
+
+    assert tracker.stage_name is None and tracker.done == 0
+
+
+def test_analysis_reports_every_stage(tmp_path):
+    for index in range(5):
+        (tmp_path / f"module{index}.py").write_text('import os\n')
+    events = []
+    analyzer = ProjectAnalyzer(ScanConfig(use_detection_cache=False, use_import_cache=False,
+                                          use_analysis_store=False, import_workers=1))
+
+    analyzer.analyze_project(tmp_path, tmp_path / 'out', progress_callback=events.append)
+
+    finished = [event for event in events if event['finished']]
+    stages = [event['stage'] for event in finished]
+    assert stages[:2] == ['count', 'scan'] and 'write' in stages
+    assert len(stages) == len(set(stages))
+    scan = next(event for event in finished if event['stage'] == 'scan')
+    assert scan['done'] == scan['total'] == 5
@@ -0,0 +1,45 @@
+"""Tests for hit matrix scoring."""
+
+import numpy as np
+
+from src.core.scoring import HitMatrix
+
+
+def _matrix(files):
+    matrix = HitMatrix(['auth', 'db'])
+    for file_path, hits in files:
+        matrix.add_file(file_path, matrix.feature_ids(hits, 'file', 1.0))
+    return matrix
+
+
+AUTH_FILES = [
+    ('src/auth/login.py', {'auth': ['auth', 'login']}),
+    ('src/auth/tokens.py', {'auth': ['auth']}),
+    ('src/api/session.py', {'auth': ['login']}),
+]
+
+
+def test_unrelated_directories_do_not_change_confidence():
+    small = _matrix(AUTH_FILES).score()
+    unrelated = [(f"pkg{index}/module{index}.py", {}) for index in range(50)]
+    unrelated += [(f"db{index}/models.py", {'db': ['model']}) for index in range(20)]
+    large = _matrix(AUTH_FILES + unrelated).score()
+
+    assert np.isclose(large.confidence[0], small.confidence[0])
+    assert large.raw[0] == small.raw[0]
+
+
+def test_confidence_grows_with_evidence():
+    weak = _matrix(AUTH_FILES[:1]).score()
+    strong = _matrix(AUTH_FILES).score()
+
+    assert 0 < weak.confidence[0] < strong.confidence[0] < 1
+    assert weak.confidence[1] == 0
+
+
+def test_extended_matrices_score_like_one_matrix():
+    whole = _matrix(AUTH_FILES + [('lib/db.py', {'db': ['db']})])
+    merged = _matrix(AUTH_FILES[:2])
+    merged.extend(_matrix(AUTH_FILES[2:] + [('lib/db.py', {'db': ['db']})]))
+
+    assert np.allclose(merged.score().confidence, whole.score().confidence)
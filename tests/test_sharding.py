@@ -0,0 +1,97 @@
+"""Tests for sharded monorepo analysis."""
+
+from pathlib import Path
+
+import pytest
+
+from src.core.analyzer import ProjectAnalyzer
+from src.core.sharding import ShardedAnalyzer, analyze_shard, find_shards, load_shards, merge_shards, write_shard
+from src.models.project import ScanConfig
+
+MONOREPO = {
+    'README.md': '# Monorepo\n',
+    'scripts/deploy.py': 'import services.api.auth\n',
+    'services/api/pyproject.toml': '[project]\nname = "api"\n',
+    'services/api/auth.py': 'import services.api.models\n\ndef login(password, token):\n    return token\n',
+    'services/api/models.py': 'import services.api.auth\n\nclass User:\n    schema = "users"\n',
+    'services/api/tests/test_auth.py': 'import pytest\nimport services.api.auth\n',
+    'web/package.json': '{"name": "web"}\n',
+    'web/src/app.js': "import React from 'react'\nimport { fetchUser } from './api'\n",
+    'web/src/api.js': "export async function fetchUser() { return fetch('/api/user') }\n",
+    'web/src/components/Login.jsx': "import { useState } from 'react'\nexport const Login = () => null\n",
+}
+
+
+@pytest.fixture
+def monorepo(tmp_path):
+    for file_path, content in MONOREPO.items():
+        path = tmp_path / file_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    return tmp_path
+
+
+def _scan_config(**options):
+    return ScanConfig(use_detection_cache=False, use_import_cache=False, use_analysis_store=False,
+                      import_workers=1, **options)
+
+
+def _summary(analysis):
+    dependencies = analysis.dependency_analysis
+    return {
+        'files': sorted(file_info.path for file_info in analysis.files),
+        'groups': {name: sorted(files) for name, files in analysis.groups.items()},
+        'functionalities': [(detection.name, detection.confidence)
+                            for detection in analysis.functionality_details],
+        'edges': sorted(map(tuple, dependencies['edges'])),
+        'cyclic_components': sorted(map(sorted, dependencies['cyclic_components'])),
+        'importance_scores': {path: round(score, 4) for path, score in dependencies['importance_scores'].items()},
+        'project_type': analysis.project_type,
+        'main_language': analysis.main_language,
+    }
+
+
+def test_find_shards(monorepo):
+    assert find_shards(monorepo) == ['.', 'services/api', 'web']
+
+
+def test_merged_shards_equal_full_scan(monorepo):
+    full, _ = ProjectAnalyzer(scan_config=_scan_config()).build_analysis(Path(monorepo))
+
+    sharded, _ = ShardedAnalyzer(scan_config=_scan_config(), max_workers=1).build_analysis(Path(monorepo))
+
+    assert _summary(sharded) == _summary(full)
+    # Imports between shards are resolved by the merge
+    assert ('scripts/deploy.py', 'services/api/auth.py') in _summary(sharded)['edges']
+    assert _summary(sharded)['cyclic_components'] == [['services/api/auth.py', 'services/api/models.py']]
+
+
+def test_shards_round_trip_through_shard_directory(monorepo, tmp_path_factory):
+    shard_dir = tmp_path_factory.mktemp('shards')
+    analyzer = ProjectAnalyzer(scan_config=_scan_config())
+    layout = find_shards(monorepo)
+    for shard in reversed(layout):
+        write_shard(analyze_shard(analyzer, monorepo, shard, layout), shard_dir)
+
+    merged = merge_shards(load_shards(shard_dir), analyzer)
+
+    full, _ = ProjectAnalyzer(scan_config=_scan_config()).build_analysis(Path(monorepo))
+    assert _summary(merged) == _summary(full)
+
+
+def test_merge_rejects_missing_shards(monorepo):
+    analyzer = ProjectAnalyzer(scan_config=_scan_config())
+    layout = find_shards(monorepo)
+
+    with pytest.raises(ValueError, match='Missing shard results'):
+        merge_shards([analyze_shard(analyzer, monorepo, layout[0], layout)], analyzer)
+
+
+def test_max_files_applies_per_shard(monorepo):
+    analyzer = ProjectAnalyzer(scan_config=_scan_config(max_files=2))
+    layout = find_shards(monorepo)
+
+    results = [analyze_shard(analyzer, monorepo, shard, layout) for shard in layout]
+
+    assert [len(result.analysis.files) for result in results] == [2, 2, 2]
+    assert len(merge_shards(results, analyzer).files) == 6
@@ -0,0 +1,76 @@
+"""Tests for the binary analysis snapshot."""
+
+import pytest
+
+from src.core.analyzer import ProjectAnalyzer
+from src.core.snapshot import (
+    SNAPSHOT_FILENAME,
+    AnalysisSnapshot,
+    encode_snapshot,
+    write_snapshot,
+)
+from src.models.project import ScanConfig
+
+PROJECT = {
+    'auth.py': 'import models\n\ndef login(password, token):\n    return token\n',
+    'models.py': 'import auth\n\nclass User:\n    schema = "users"\n',
+    'web/app.js': "import React from 'react'\nexport const App = () => null\n",
+    'README.md': '# Demo\n',
+}
+
+
+@pytest.fixture
+def analysis(tmp_path):
+    root = tmp_path / 'project'
+    for file_path, content in PROJECT.items():
+        path = root / file_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    scan_config = ScanConfig(use_detection_cache=False, use_import_cache=False, use_analysis_store=False,
+                             import_workers=1)
+    analysis, _ = ProjectAnalyzer(scan_config=scan_config).build_analysis(root)
+    return analysis
+
+
+def test_round_trip_rebuilds_the_analysis(analysis, tmp_path):
+    path = tmp_path / SNAPSHOT_FILENAME
+    write_snapshot(analysis, path)
+
+    with AnalysisSnapshot(path) as snapshot:
+        assert snapshot.to_analysis() == analysis
+
+
+def test_sections_are_decoded_on_first_access(analysis, tmp_path):
+    path = tmp_path / SNAPSHOT_FILENAME
+    write_snapshot(analysis, path)
+
+    with AnalysisSnapshot(path) as snapshot:
+        assert set(snapshot._sections) == {'meta'}
+        assert snapshot.group_names == list(analysis.groups)
+        assert set(snapshot._sections) == {'meta'}
+        assert snapshot.groups == analysis.groups
+        assert set(snapshot._sections) == {'meta', 'groups'}
+
+
+def test_extra_sections(analysis, tmp_path):
+    path = tmp_path / SNAPSHOT_FILENAME
+    path.write_bytes(encode_snapshot(analysis, {'shard': {'name': 'web'}}))
+
+    with AnalysisSnapshot(path) as snapshot:
+        assert snapshot.section('shard') == {'name': 'web'}
+        with pytest.raises(ValueError):
+            snapshot.section('missing')
+
+
+def test_load_ignores_missing_and_invalid_snapshots(analysis, tmp_path):
+    assert AnalysisSnapshot.load(tmp_path) is None
+
+    (tmp_path / SNAPSHOT_FILENAME).write_bytes(b'not a snapshot at all')
+    assert AnalysisSnapshot.load(tmp_path) is None
+
+    data = bytearray(encode_snapshot(analysis))
+    data[6] += 1  # format version
+    (tmp_path / SNAPSHOT_FILENAME).write_bytes(bytes(data))
+    with pytest.raises(ValueError, match='Unsupported snapshot version'):
+        AnalysisSnapshot(tmp_path / SNAPSHOT_FILENAME)
+    assert AnalysisSnapshot.load(tmp_path) is None